@@ -0,0 +1,97 @@
+"""
+Approximate nearest neighbors
+=============================
+
+Shows the trade-off between recall and cost of the approximate nearest
+neighbors search.
+"""
+
+# License: MIT
+
+import skfda
+from skfda.ml.clustering import (NearestNeighbors,
+                                 ApproximateNearestNeighbors)
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+##############################################################################
+#
+# The exact search of neighbors needs to compute the distances between the
+# query and every stored curve. The
+# :class:`~skfda.ml.clustering.ApproximateNearestNeighbors` estimator
+# summarizes each curve with a low-dimensional sketch, its principal
+# component scores or its projections onto random functions, and indexes
+# the sketches with hash tables. Only a shortlist of candidates sharing a
+# bucket with the query is re-ranked with the exact functional metric.
+#
+# We generate a database of sinusoidal curves and a set of query curves.
+
+X = skfda.datasets.make_sinusoidal_process(n_samples=5000, error_std=.05,
+                                           random_state=0)
+X_query = skfda.datasets.make_sinusoidal_process(n_samples=100,
+                                                 error_std=.05,
+                                                 random_state=1)
+
+X_query.plot()
+
+##############################################################################
+#
+# The exact neighbors are computed by brute force, to be used as the
+# reference of the approximate search. The brute force search computes
+# the distances from each query to the 5000 curves.
+
+n_neighbors = 5
+
+exact = NearestNeighbors(n_neighbors=n_neighbors, algorithm='brute').fit(X)
+_, exact_index = exact.kneighbors(X_query)
+
+##############################################################################
+#
+# The recall is the fraction of the true neighbors found by the approximate
+# search. It increases with the number of candidates re-ranked with the
+# exact metric, whose distances are the most expensive part of each query
+# with large databases or expensive metrics. Other parameters, as the
+# number of hash tables, the width of the buckets or the dimension of the
+# sketches, also trade recall for query time.
+
+
+def recall(index, exact_index):
+    return np.mean([len(np.intersect1d(i, j)) / len(j)
+                    for i, j in zip(index, exact_index)])
+
+
+n_candidates_values = [5, 10, 20, 50, 100]
+
+fig, ax = plt.subplots()
+
+for projection in ('fpca', 'random'):
+    recalls = []
+
+    for n_candidates in n_candidates_values:
+        neigh = ApproximateNearestNeighbors(n_neighbors=n_neighbors,
+                                            projection=projection,
+                                            n_candidates=n_candidates,
+                                            random_state=0).fit(X)
+
+        _, index = neigh.kneighbors(X_query)
+        recalls.append(recall(index, exact_index))
+
+        n_distances = neigh.n_distance_evaluations_ / len(X_query)
+        print(f"{projection}, {n_candidates} candidates: "
+              f"recall {recalls[-1]:.2f}, "
+              f"{n_distances:.0f} distances per query")
+
+    ax.plot(n_candidates_values, recalls, marker='o', label=projection)
+
+ax.set_xscale('log')
+ax.set_xlabel('Number of candidates')
+ax.set_ylabel('Recall')
+ax.legend()
+
+##############################################################################
+#
+# The principal components capture most of the variability of these curves
+# with few dimensions, so their sketches select better candidates than the
+# random projections.
@@ -0,0 +1,85 @@
+"""
+Mini-batch K-Means
+==================
+
+Compares the inertia and the time of the K-Means clustering with the
+mini-batch variant.
+"""
+
+# License: MIT
+
+import time
+
+import skfda
+from skfda.ml.clustering import KMeans, MiniBatchKMeans
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+##############################################################################
+#
+# The :class:`~skfda.ml.clustering.MiniBatchKMeans` estimator updates the
+# centroids of the clusters using small random batches of samples, instead
+# of all the samples in each iteration as
+# :class:`~skfda.ml.clustering.KMeans`. It can also be trained with a stream
+# of batches, as curves arriving continuously, using its method
+# ``partial_fit``.
+#
+# We generate a large dataset of curves with a mode in eight different
+# locations.
+
+n_samples = 50000
+
+random_state = np.random.RandomState(0)
+modes_location = random_state.permutation(
+    np.repeat(np.linspace(-.8, .8, 8), n_samples // 8)
+    + random_state.normal(0, .05, size=n_samples))
+
+X = skfda.datasets.make_multimodal_samples(n_samples=n_samples,
+                                           modes_location=modes_location,
+                                           noise=.05, random_state=0)
+
+X[:20].plot()
+
+##############################################################################
+#
+# The inertia, the sum of the squared distances of the samples to their
+# closest centroid, measures the quality of the clustering. We compare it
+# and the time of the fit for the K-Means algorithm and for the mini-batch
+# variant with several sizes of the batches, using the same initialization.
+
+results = {}
+
+for seed in range(3):
+    estimators = {'KMeans': KMeans(n_clusters=8, init='k-means++',
+                                   random_state=seed)}
+    for batch_size in (100, 1000):
+        estimators[f'MiniBatchKMeans ({batch_size})'] = MiniBatchKMeans(
+            n_clusters=8, init='k-means++', batch_size=batch_size,
+            random_state=seed)
+
+    for name, estimator in estimators.items():
+        start = time.perf_counter()
+        estimator.fit(X)
+        elapsed = time.perf_counter() - start
+
+        results.setdefault(name, []).append((elapsed, estimator.inertia_))
+
+fig, ax = plt.subplots()
+
+for name, values in results.items():
+    elapsed, inertia = np.array(values).T
+    ax.scatter(elapsed, inertia, label=name)
+    print(f"{name}: {np.mean(elapsed):.2f} s, "
+          f"inertia {np.mean(inertia):.1f}")
+
+ax.set_xlabel('Time (s)')
+ax.set_ylabel('Inertia')
+ax.legend()
+
+##############################################################################
+#
+# The mini-batch variant reaches an inertia similar to the one of the
+# K-Means algorithm in a fraction of the time, as each update only uses a
+# few samples.
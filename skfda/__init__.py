@@ -29,16 +29,22 @@ and the following classes:
 """
 import errno as _errno
 
+from ._utils import _lazy_submodules
 from .representation import FData
 from .representation import FDataBasis
 from .representation import FDataGrid
-from .representation._functional_data import concatenate
+from .representation._functional_data import concatenate, group_reduce
 
-from . import representation, datasets, preprocessing, exploratory, misc, ml, \
-    inference
+from . import representation
 
 import os as _os
 
+# The rest of the subpackages (and their dependencies) are only imported
+# when they are first used
+__getattr__, __dir__ = _lazy_submodules(
+    __name__,
+    ["datasets", "preprocessing", "exploratory", "misc", "ml", "inference"])
+
 try:
     with open(_os.path.join(_os.path.dirname(__file__),
                             '..', 'VERSION'), 'r') as version_file:
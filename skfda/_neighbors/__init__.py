@@ -6,9 +6,17 @@ Includes the following classes:
  - NearestCentroid
  - KNeighborsRegressor
  - RadiusNeighborsRegressor
+ - VPTree
+ - LowerBoundIndex
+ - ApproximateNearestNeighbors
+ - FunctionalNeighborsGraph
 
 """
 from .unsupervised import NearestNeighbors
 from .regression import KNeighborsRegressor, RadiusNeighborsRegressor
 from .classification import (KNeighborsClassifier, RadiusNeighborsClassifier,
                              NearestCentroid)
+from .vptree import VPTree
+from .lower_bound import LowerBoundIndex
+from .approximate import ApproximateNearestNeighbors
+from .graph import FunctionalNeighborsGraph
@@ -0,0 +1,213 @@
+"""Common functionality of the indexes for the search of neighbors."""
+
+from sklearn.utils.validation import check_is_fitted
+
+import numpy as np
+import scipy.sparse
+
+
+class _MetricIndex():
+    """Base class of the indexes for the search of neighbors with a metric.
+
+    Subclasses store the indexed samples in ``_fit_X`` and implement
+    ``_search``, which finds the neighbors of a single query sample and
+    returns their distances, their indexes and the number of distances
+    computed. Subclasses that need a representation of the queries
+    computed once for all of them override ``_prepare_queries``, and
+    receive the row of each query as the ``embedding`` argument of
+    ``_search``. The indexes count the distances computed in
+    ``n_distance_evaluations_``, and the distances between queries and
+    indexed samples that were never computed in ``n_pruned_distances_``.
+
+    """
+
+    def _prepare_queries(self, X):
+        """Query samples and their representation used by the search.
+
+        Args:
+            X (FData or None): Query samples, or ``None`` to query the
+                indexed samples.
+
+        Returns:
+            (tuple): The query samples and an array with the
+            representation of each of them, or ``None``.
+
+        """
+        return (self._fit_X if X is None else X), None
+
+    def _distances(self, X, indexes, query):
+        """Distances between a single query sample and the samples of X."""
+        metric_params = self.metric_params or {}
+
+        if len(indexes) == 0:
+            return np.empty(0)
+
+        return np.asarray(self.metric(
+            query[np.zeros(len(indexes), dtype=int)], X[indexes],
+            **metric_params)).ravel()
+
+    def _query(self, X, **kwargs):
+        """Search the neighbors of several samples, in parallel."""
+        from joblib import Parallel, delayed, effective_n_jobs
+
+        check_is_fitted(self, '_fit_X')
+
+        query_is_train = X is None
+        X, embeddings = self._prepare_queries(X)
+
+        def search(i):
+            exclude = i if query_is_train else None
+
+            if embeddings is None:
+                return self._search(X[[i]], exclude=exclude, **kwargs)
+
+            return self._search(X[[i]], exclude=exclude,
+                                embedding=embeddings[i], **kwargs)
+
+        def search_batch(batch):
+            return [search(i) for i in batch]
+
+        batches = np.array_split(np.arange(len(X)),
+                                 min(effective_n_jobs(self.n_jobs),
+                                     max(len(X), 1)))
+
+        if len(batches) == 1:
+            results = [search_batch(batches[0])]
+        else:
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(search_batch)(batch) for batch in batches)
+
+        results = [r for batch in results for r in batch]
+
+        n_evaluations = sum(r[2] for r in results)
+        n_candidates = len(X) * (len(self._fit_X) - query_is_train)
+
+        self.n_distance_evaluations_ += n_evaluations
+        self.n_pruned_distances_ += n_candidates - n_evaluations
+
+        return [r[0] for r in results], [r[1] for r in results]
+
+    def kneighbors(self, X=None, n_neighbors=5, return_distance=True):
+        """Find the K-neighbors of the samples.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            n_neighbors (int): Number of neighbors to get.
+            return_distance (boolean, optional): If False, distances will
+                not be returned. Defaults to True.
+
+        Returns:
+            (tuple): Arrays with shape (n_queries, n_neighbors) with the
+            distances to the neighbors, only present if
+            return_distance=True, and their indexes, sorted by distance.
+
+        """
+        n_fit = len(self._fit_X) - (X is None)
+        if n_neighbors > n_fit:
+            raise ValueError(f"Expected n_neighbors <= n_samples, "
+                             f"but n_samples = {n_fit}, "
+                             f"n_neighbors = {n_neighbors}")
+
+        distances, indexes = self._query(X, n_neighbors=n_neighbors)
+
+        distances = np.array(distances).reshape(-1, n_neighbors)
+        indexes = np.array(indexes).reshape(-1, n_neighbors)
+
+        return (distances, indexes) if return_distance else indexes
+
+    def radius_neighbors(self, X=None, radius=1., return_distance=True):
+        """Find the neighbors within a given radius of the samples.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            radius (float): Limiting distance of neighbors to return.
+            return_distance (boolean, optional): If False, distances will
+                not be returned. Defaults to True.
+
+        Returns:
+            (tuple): Arrays of objects with the distances to the neighbors
+            of each query, only present if return_distance=True, and their
+            indexes, sorted by distance.
+
+        """
+        distances, indexes = self._query(X, radius=radius)
+
+        def to_object_array(arrays):
+            result = np.empty(len(arrays), dtype=object)
+            result[:] = arrays
+            return result
+
+        indexes = to_object_array(indexes)
+
+        if return_distance:
+            return to_object_array(distances), indexes
+
+        return indexes
+
+    def kneighbors_graph(self, X=None, n_neighbors=5, mode='connectivity'):
+        """Compute the graph of K-neighbors of the samples.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            n_neighbors (int): Number of neighbors of each sample.
+            mode ('connectivity' or 'distance', optional): Type of returned
+                matrix: 'connectivity' will return the connectivity matrix
+                with ones and zeros, in 'distance' the edges are distance
+                between points, stored explicitly even if they are zero.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Sparse matrix with shape
+            (n_queries, n_samples_fit).
+
+        """
+        distances, indexes = self.kneighbors(X, n_neighbors=n_neighbors)
+
+        return self._graph(distances, indexes, mode)
+
+    def radius_neighbors_graph(self, X=None, radius=1.,
+                               mode='connectivity'):
+        """Compute the graph of neighbors within a radius of the samples.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            radius (float): Limiting distance of neighbors.
+            mode ('connectivity' or 'distance', optional): Type of returned
+                matrix: 'connectivity' will return the connectivity matrix
+                with ones and zeros, in 'distance' the edges are distance
+                between points, stored explicitly even if they are zero.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Sparse matrix with shape
+            (n_queries, n_samples_fit).
+
+        """
+        distances, indexes = self.radius_neighbors(X, radius=radius)
+
+        return self._graph(distances, indexes, mode)
+
+    def _graph(self, distances, indexes, mode):
+
+        if mode not in ('connectivity', 'distance'):
+            raise ValueError(f"Unsupported mode, must be one of "
+                             f"'connectivity' or 'distance' but got {mode} "
+                             f"instead")
+
+        indptr = np.concatenate(([0], np.cumsum([len(i) for i in indexes])))
+        indexes = np.concatenate(list(indexes) + [np.empty(0, dtype=int)])
+
+        if mode == 'distance':
+            data = np.concatenate(list(distances) + [np.empty(0)])
+        else:
+            data = np.ones(len(indexes))
+
+        return scipy.sparse.csr_matrix(
+            (data, indexes, indptr),
+            shape=(len(indptr) - 1, len(self._fit_X)))
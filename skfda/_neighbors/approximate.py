@@ -0,0 +1,337 @@
+"""Approximate nearest neighbors search using sketches of the functions."""
+
+from sklearn.base import BaseEstimator
+from sklearn.utils import check_random_state
+
+import numpy as np
+
+from .. import FDataBasis
+from ..misc.metrics import lp_distance
+from ._index import _MetricIndex
+from .base import _l2_factor, _to_multivariate, _weigh
+
+
+class ApproximateNearestNeighbors(BaseEstimator, _MetricIndex):
+    r"""Approximate nearest neighbors search for large functional datasets.
+
+    Each function is summarized by a sketch, a vector with its scores in a
+    fitted :class:`~skfda.preprocessing.dim_reduction.projection.FPCA` or
+    its projections onto random functions. The sketches are indexed with
+    ``n_tables`` hash tables of locality sensitive hashing, which quantise
+    ``n_hashes`` random projections of the sketch in buckets of width
+    ``bucket_width``.
+
+    A query retrieves the samples sharing a bucket with it in any table,
+    and the ``n_candidates`` of them whose sketches are closer to the sketch
+    of the query are re-ranked using the exact functional metric. More
+    tables, wider buckets and more candidates increase the recall at the
+    cost of the query time.
+
+    Args:
+        n_neighbors (int, optional): Number of neighbors to use by default
+            for :meth:`kneighbors` queries. Defaults to 5.
+        radius (float, optional): Range of parameter space to use by default
+            for :meth:`radius_neighbors` queries. Defaults to 1.
+        projection ({'fpca', 'random'}, optional): Functions onto which the
+            data is projected to compute the sketches: the principal
+            components of the data or random functions. Defaults to 'fpca'.
+        n_components (int, optional): Dimension of the sketches. Defaults
+            to 10.
+        n_tables (int, optional): Number of hash tables. Defaults to 10.
+        n_hashes (int, optional): Number of quantised projections of the
+            sketch combined in the key of each table. Defaults to 4.
+        bucket_width (float, optional): Width of the buckets in which the
+            projections are quantised, relative to their standard deviation
+            in the training data. Defaults to 1.
+        n_candidates (int, optional): Maximum number of candidates of each
+            query whose exact distance is computed. Defaults to 50.
+        metric (callable, optional): Functional metric used to re-rank the
+            candidates. Defaults to :func:`~skfda.misc.metrics.lp_distance`.
+        metric_params (dict, optional): Additional keyword arguments for the
+            metric function.
+        n_jobs (int or None, optional): The number of parallel jobs to run
+            for the queries. ``None`` means 1 unless in a
+            :obj:`joblib.parallel_backend` context. ``-1`` means using all
+            processors.
+        random_state (int, RandomState instance or None, optional): Seed
+            of the random projections.
+
+    Attributes:
+        n_distance_evaluations_ (int): Number of exact distances computed
+            since the index was fitted.
+        n_pruned_distances_ (int): Number of distances between the queries
+            and the indexed samples that were not computed.
+
+    Examples:
+
+        >>> from skfda.datasets import make_multimodal_samples
+        >>> from skfda.misc.metrics import lp_distance, pairwise_distance
+        >>> from skfda.ml.clustering import ApproximateNearestNeighbors
+        >>> fd = make_multimodal_samples(n_samples=500, random_state=0)
+        >>> neigh = ApproximateNearestNeighbors(n_neighbors=3,
+        ...                                     random_state=0).fit(fd)
+        >>> distances, index = neigh.kneighbors(fd[:20])
+
+        The neighbors are found computing few exact distances, and most of
+        them are the true neighbors.
+
+        >>> neigh.n_distance_evaluations_ < 20 * 50
+        True
+        >>> exact = pairwise_distance(lp_distance)(fd[:20], fd)
+        >>> true_index = np.argsort(exact, axis=1)[:, :3]
+        >>> recall = np.mean([len(np.intersect1d(i, j)) / 3
+        ...                   for i, j in zip(index, true_index)])
+        >>> recall > 0.9
+        True
+
+    """
+
+    def __init__(self, n_neighbors=5, radius=1., *, projection='fpca',
+                 n_components=10, n_tables=10, n_hashes=4, bucket_width=1.,
+                 n_candidates=50, metric=lp_distance, metric_params=None,
+                 n_jobs=None, random_state=None):
+        self.n_neighbors = n_neighbors
+        self.radius = radius
+        self.projection = projection
+        self.n_components = n_components
+        self.n_tables = n_tables
+        self.n_hashes = n_hashes
+        self.bucket_width = bucket_width
+        self.n_candidates = n_candidates
+        self.metric = metric
+        self.metric_params = metric_params
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _to_fit_representation(self, X):
+        """Convert the data to the representation used in the fit."""
+        if isinstance(self._fit_X, FDataBasis):
+            if not isinstance(X, FDataBasis) or X.basis != self._fit_X.basis:
+                X = X.to_basis(self._fit_X.basis)
+        elif isinstance(X, FDataBasis):
+            X = X.to_grid(self._fit_X.grid_points)
+
+        return X
+
+    def _sketch(self, X):
+        """Low-dimensional sketch of the functions."""
+        if self.projection == 'fpca':
+            return self._fpca.transform(X)
+
+        return _weigh(_to_multivariate(X), self._factor
+                      ) @ self._random_functions
+
+    def _keys(self, sketches):
+        """Keys of the samples in each hash table."""
+        projections = np.einsum('ij,tjk->tik', sketches, self._projections)
+
+        codes = np.floor(
+            (projections + self._offsets[:, np.newaxis])
+            / self._widths[:, np.newaxis]).astype(np.int64)
+
+        # The codes of each table are combined in a single integer key,
+        # wrapping around on overflow
+        return np.einsum('tik,tk->ti', codes, self._multipliers)
+
+    def fit(self, X, y=None):
+        """Compute the sketches of the training data and index them.
+
+        Args:
+            X (FDataGrid or FDataBasis): Training data.
+            y: Ignored.
+
+        Returns:
+            self
+
+        """
+        if self.projection not in ('fpca', 'random'):
+            raise ValueError(f"Unknown projection {self.projection}, must "
+                             f"be one of 'fpca' or 'random'")
+
+        random_state = check_random_state(self.random_state)
+
+        self._fit_X = X
+
+        if self.projection == 'fpca':
+            from ..preprocessing.dim_reduction.projection import FPCA
+
+            self._fpca = FPCA(n_components=self.n_components).fit(X)
+        else:
+            # Random functions with coordinates of unit variance in an
+            # orthonormal basis of the space of the data
+            self._factor = _l2_factor(X)
+            if self._factor is None:
+                self._factor = _l2_factor(X, rule='trapezoid')
+            n_features = len(self._factor)
+
+            self._random_functions = random_state.normal(
+                size=(n_features, self.n_components))
+
+        self._sketches = self._sketch(X)
+
+        self._projections = random_state.normal(
+            size=(self.n_tables, self._sketches.shape[1], self.n_hashes))
+        self._widths = self.bucket_width * np.std(
+            np.einsum('ij,tjk->tik', self._sketches, self._projections),
+            axis=1)
+        self._widths[self._widths == 0] = 1
+        self._offsets = random_state.uniform(size=self._widths.shape
+                                             ) * self._widths
+        self._multipliers = random_state.randint(
+            1, np.iinfo(np.int64).max, size=(self.n_tables, self.n_hashes),
+            dtype=np.int64)
+
+        keys = self._keys(self._sketches)
+        self._order = np.argsort(keys, axis=1, kind='stable')
+        self._sorted_keys = np.take_along_axis(keys, self._order, axis=1)
+
+        self.n_distance_evaluations_ = 0
+        self.n_pruned_distances_ = 0
+
+        return self
+
+    def _candidates(self, sketch, exclude=None):
+        """Indexes of the samples sharing a bucket with the query."""
+        keys = self._keys(sketch)[:, 0]
+
+        candidates = [
+            order[np.searchsorted(sorted_keys, key, side='left'):
+                  np.searchsorted(sorted_keys, key, side='right')]
+            for key, sorted_keys, order in zip(
+                keys, self._sorted_keys, self._order)]
+
+        candidates = np.unique(np.concatenate(candidates))
+
+        return candidates[candidates != exclude]
+
+    def _prepare_queries(self, X):
+        """Convert and sketch all the queries at once."""
+        if X is None:
+            return self._fit_X, self._sketches
+
+        X = self._to_fit_representation(X)
+
+        return X, self._sketch(X)
+
+    def _search(self, query, n_neighbors=None, radius=None, exclude=None,
+                embedding=None):
+        """Search the approximate neighbors of a single sample.
+
+        The sketch of the query is passed as ``embedding``.
+
+        """
+        sketch = embedding[np.newaxis]
+        candidates = self._candidates(sketch, exclude=exclude)
+
+        if n_neighbors is not None and len(candidates) < n_neighbors:
+            # Not enough samples share a bucket with the query, so the
+            # nearest sketches are used
+            candidates = np.arange(len(self._fit_X))
+            candidates = candidates[candidates != exclude]
+
+        n_candidates = max(self.n_candidates, n_neighbors or 0)
+        if len(candidates) > n_candidates:
+            sketch_distances = np.linalg.norm(
+                self._sketches[candidates] - sketch, axis=1)
+            candidates = candidates[np.argpartition(
+                sketch_distances, n_candidates - 1)[:n_candidates]]
+
+        distances = self._distances(self._fit_X, candidates, query)
+
+        order = np.lexsort((candidates, distances))
+        if n_neighbors is not None:
+            order = order[:n_neighbors]
+        else:
+            order = order[distances[order] <= radius]
+
+        return distances[order], candidates[order], len(candidates)
+
+    def kneighbors(self, X=None, n_neighbors=None, return_distance=True):
+        """Find the approximate K-neighbors of the samples.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            n_neighbors (int): Number of neighbors to get. Defaults to the
+                value passed to the constructor.
+            return_distance (boolean, optional): If False, distances will
+                not be returned. Defaults to True.
+
+        Returns:
+            (tuple): Arrays with shape (n_queries, n_neighbors) with the
+            distances to the neighbors, only present if
+            return_distance=True, and their indexes, sorted by distance.
+
+        """
+        return super().kneighbors(X, n_neighbors=n_neighbors or
+                                  self.n_neighbors,
+                                  return_distance=return_distance)
+
+    def radius_neighbors(self, X=None, radius=None, return_distance=True):
+        """Find the approximate neighbors within a radius of the samples.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            radius (float): Limiting distance of neighbors to return.
+                Defaults to the value passed to the constructor.
+            return_distance (boolean, optional): If False, distances will
+                not be returned. Defaults to True.
+
+        Returns:
+            (tuple): Arrays of objects with the distances to the neighbors
+            of each query, only present if return_distance=True, and their
+            indexes, sorted by distance.
+
+        """
+        return super().radius_neighbors(
+            X, radius=self.radius if radius is None else radius,
+            return_distance=return_distance)
+
+    def kneighbors_graph(self, X=None, n_neighbors=None,
+                         mode='connectivity'):
+        """Compute the graph of approximate K-neighbors of the samples.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            n_neighbors (int): Number of neighbors of each sample. Defaults
+                to the value passed to the constructor.
+            mode ('connectivity' or 'distance', optional): Type of returned
+                matrix: 'connectivity' will return the connectivity matrix
+                with ones and zeros, in 'distance' the edges are distance
+                between points.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Sparse matrix with shape
+            (n_queries, n_samples_fit).
+
+        """
+        return super().kneighbors_graph(
+            X, n_neighbors=n_neighbors or self.n_neighbors, mode=mode)
+
+    def radius_neighbors_graph(self, X=None, radius=None,
+                               mode='connectivity'):
+        """Compute the graph of approximate neighbors within a radius.
+
+        Args:
+            X (FData, optional): Query samples. If not provided, the
+                neighbors of each indexed sample are returned, not
+                considering the sample its own neighbor.
+            radius (float): Limiting distance of neighbors. Defaults to the
+                value passed to the constructor.
+            mode ('connectivity' or 'distance', optional): Type of returned
+                matrix: 'connectivity' will return the connectivity matrix
+                with ones and zeros, in 'distance' the edges are distance
+                between points.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Sparse matrix with shape
+            (n_queries, n_samples_fit).
+
+        """
+        return super().radius_neighbors_graph(
+            X, radius=self.radius if radius is None else radius, mode=mode)
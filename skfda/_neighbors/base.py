@@ -7,24 +7,34 @@ from sklearn.base import RegressorMixin
 from sklearn.utils.validation import check_is_fitted as sklearn_check_is_fitted
 
 import numpy as np
+import scipy.integrate
+import scipy.sparse
 
-from .. import FDataGrid, FData
-from ..misc.metrics import lp_distance
+from .. import FDataGrid, FDataBasis, FData
+from ..misc.metrics import lp_distance, _metric_bounds
+from .graph import FunctionalNeighborsGraph
+from .lower_bound import LowerBoundIndex
+from .vptree import VPTree
 
 
-def _to_multivariate(fdatagrid):
+def _to_multivariate(fdata):
     r"""Returns the data matrix of a fdatagrid in flatten form compatible with
     sklearn.
 
     Args:
-        fdatagrid (:class:`FDataGrid`): Grid to be converted to matrix
+        fdata (:class:`FDataGrid` or :class:`FDataBasis`): Functional data
+            to be converted to matrix.
 
     Returns:
         (np.array): Numpy array with size (n_samples, points), where
-            points = prod([len(d) for d in fdatagrid.grid_points]
+            points = prod([len(d) for d in fdatagrid.grid_points], or the
+            coefficients matrix in the case of a :class:`FDataBasis`.
 
     """
-    return fdatagrid.data_matrix.reshape(fdatagrid.n_samples, -1)
+    if isinstance(fdata, FDataBasis):
+        return fdata.coefficients
+
+    return fdata.data_matrix.reshape(fdata.n_samples, -1)
 
 
 def _from_multivariate(data_matrix, grid_points, shape, **kwargs):
@@ -44,6 +54,47 @@ def _from_multivariate(data_matrix, grid_points, shape, **kwargs):
     return FDataGrid(data_matrix.reshape(shape), grid_points, **kwargs)
 
 
+def _l2_quadrature_weights(grid_points, rule='simpson'):
+    r"""Weights of the quadrature used for the L2 distance of FDataGrid.
+
+    The :math:`L_2` distance between functions discretized in the same grid
+    is computed with the Simpson rule, so it is a weighted euclidean
+    distance between the flattened data matrices.
+
+    Args:
+        grid_points (array_like): List with sample points for each dimension.
+        rule (str, optional): Quadrature rule, 'simpson' or 'trapezoid'.
+            The weights of the trapezoidal rule are never negative.
+
+    Returns:
+        (np.array): Weight of each point of the grid, flattened, or ``None``
+        if some weight is negative and the distance cannot be expressed as a
+        weighted euclidean distance.
+
+    Examples:
+
+        >>> import numpy as np
+        >>> from skfda._neighbors.base import _l2_quadrature_weights
+        >>> _l2_quadrature_weights([np.linspace(0, 1, 5)]).round(3)
+        array([ 0.083,  0.333,  0.167,  0.333,  0.083])
+        >>> _l2_quadrature_weights([np.linspace(0, 1, 5)],
+        ...                        rule='trapezoid').round(3)
+        array([ 0.125,  0.25 ,  0.25 ,  0.25 ,  0.125])
+
+    """
+    integrate = (scipy.integrate.trapz if rule == 'trapezoid'
+                 else scipy.integrate.simps)
+    weights = np.ones(())
+
+    for axis in grid_points:
+        axis_weights = integrate(np.eye(len(axis)), x=axis, axis=0)
+        weights = np.multiply.outer(weights, axis_weights)
+
+    weights = weights.ravel()
+
+    return weights if np.all(weights >= 0) else None
+
+
 def _to_multivariate_metric(metric, grid_points):
     r"""Transform a metric between FDatagrid in a sklearn compatible one.
 
@@ -93,6 +144,84 @@ def _to_multivariate_metric(metric, grid_points):
     return multivariate_metric
 
 
+def _basis_to_multivariate_metric(metric, basis):
+    r"""Transform a metric between FDataBasis in a sklearn compatible one.
+
+    Args:
+        metric (pyfunc): Metric of the module `mics.metrics`. Must accept
+            two FDataBasis and return a float representing the distance.
+        basis (Basis): Basis of the FDataBasis.
+
+    Returns:
+        (pyfunc): sklearn vector metric, receiving the coefficients.
+
+    """
+    def multivariate_metric(x, y, _check=False, **kwargs):
+
+        return metric(FDataBasis(basis, x), FDataBasis(basis, y),
+                      _check=_check, **kwargs)
+
+    return multivariate_metric
+
+
+def _gram_factor(basis):
+    r"""Factor :math:`L` of the Gram matrix :math:`G = LL^T` of a basis.
+
+    The :math:`L_2` distance between two functions with coefficients
+    :math:`c_1` and :math:`c_2` is the euclidean distance between
+    :math:`L^T c_1` and :math:`L^T c_2`.
+
+    Examples:
+
+        >>> import numpy as np
+        >>> from skfda.representation.basis import Monomial
+        >>> from skfda._neighbors.base import _gram_factor
+        >>> basis = Monomial(n_basis=3)
+        >>> factor = _gram_factor(basis)
+        >>> np.allclose(factor @ factor.T, basis.gram_matrix())
+        True
+
+    """
+    gram_matrix = basis.gram_matrix()
+
+    try:
+        return np.linalg.cholesky(gram_matrix)
+    except np.linalg.LinAlgError:
+        # The Gram matrix is only positive semidefinite
+        w, v = np.linalg.eigh(gram_matrix)
+        return v * np.sqrt(np.maximum(w, 0))
+
+
+def _l2_factor(fdata, rule='simpson'):
+    """Factor of the :math:`L_2` distance between flattened samples.
+
+    The :math:`L_2` distance between the samples is the euclidean distance
+    between their flattened data multiplied by the square roots of the
+    quadrature weights of the grid, or between their coefficients multiplied
+    by a factor of the Gram matrix of the basis. It is ``None`` if some
+    weight of the grid is negative, which can only happen with the default
+    Simpson rule.
+
+    """
+    if isinstance(fdata, FDataBasis):
+        return _gram_factor(fdata.basis)
+
+    weights = _l2_quadrature_weights(fdata.grid_points, rule=rule)
+
+    if weights is None:
+        return None
+
+    return np.repeat(np.sqrt(weights), fdata.dim_codomain)
+
+
+def _weigh(X, factor):
+    """Flattened data in which the :math:`L_2` distance is the euclidean."""
+    if factor.ndim == 2:
+        return X @ factor
+
+    return X * factor
+
+
 class NeighborsBase(ABC, BaseEstimator):
     """Base class for nearest neighbors estimators."""
 
@@ -121,14 +250,182 @@ class NeighborsBase(ABC, BaseEstimator):
         """
         sklearn_check_is_fitted(self, ['estimator_'])
 
+    def _fit_metric(self, X):
+        """Store the representation of the training data and return the
+        metric to be used by the sklearn estimator.
+
+        The :math:`L_2` distance is computed using the native euclidean
+        metric of sklearn, after scaling the data by the square root of the
+        quadrature weights, or multiplying the coefficients by a factor of
+        the Gram matrix in the case of a :class:`FDataBasis`. This allows
+        sklearn to use its tree structures.
+
+        """
+        self._factor = None
+        self._index = None
+
+        if isinstance(X, FDataBasis):
+            self._basis = X.basis
+            self._grid_points = None
+            self._shape = X.coefficients.shape[1:]
+        else:
+            self._basis = None
+            self._grid_points = X.grid_points
+            self._shape = X.data_matrix.shape[1:]
+
+        if self.multivariate_metric:
+            return self.metric
+
+        # Constructs sklearn metric to manage vector
+        if self.metric == 'l2' or self.metric is lp_distance:
+            if self.metric_params is None:
+                self._factor = _l2_factor(X)
+
+                if self._factor is not None:
+                    return 'euclidean'
+
+            metric = lp_distance
+        else:
+            metric = self.metric
+
+        if self._basis is not None:
+            return _basis_to_multivariate_metric(metric, self._basis)
+
+        return _to_multivariate_metric(metric, self._grid_points)
+
+    def _uses_index(self, X=None):
+        """Whether the neighbors are searched with an index of this module.
+
+        This is the case if the training data is a
+        :class:`FunctionalNeighborsGraph`, if algorithm='vp_tree', or if the
+        metric has cheap bounds that allow to prune its evaluations, as the
+        elastic metrics.
+
+        """
+        if isinstance(X, FunctionalNeighborsGraph):
+            return True
+
+        if self.metric == 'precomputed':
+            return False
+
+        if self.algorithm == 'vp_tree':
+            return True
+
+        return (not self.multivariate_metric
+                and self.algorithm in ('auto', 'brute')
+                and _metric_bounds(self.metric) is not None)
+
+    def _fit_index(self, X):
+        """Build the index used to search the neighbors.
+
+        The index is the graph passed as training data, if any, a metric
+        tree if algorithm='vp_tree', or a search pruned with the bounds of
+        the metric otherwise. The sklearn estimator receives sparse graphs
+        with the distances to the neighbors found using the index, as
+        precomputed distances.
+
+        Returns:
+            (tuple): The sklearn estimator, and the sparse graph of the
+            training data to fit it.
+
+        """
+        if isinstance(X, FunctionalNeighborsGraph):
+            sklearn_check_is_fitted(X, ['graph_'])
+
+            # The distances of the graph are reused, so they must be those
+            # of the metric of the estimator. The algorithm is ignored.
+            def normalize(metric):
+                return lp_distance if metric == 'l2' else metric
+
+            if (self.multivariate_metric
+                    or normalize(X.metric) != normalize(self.metric)
+                    or (X.metric_params or {}) != (self.metric_params or {})):
+                raise ValueError("The metric and metric_params of the "
+                                 "graph must be those of the estimator")
+
+            index = X
+            X = index._fit_X
+        elif self.multivariate_metric:
+            raise ValueError("The algorithm 'vp_tree' requires a functional "
+                             "metric")
+        else:
+            metric = lp_distance if self.metric == 'l2' else self.metric
+
+            if self.algorithm == 'vp_tree':
+                index = VPTree(metric, metric_params=self.metric_params,
+                               leaf_size=self.leaf_size, n_jobs=self.n_jobs)
+            else:
+                lower_bound, upper_bound = _metric_bounds(metric)
+                index = LowerBoundIndex(metric,
+                                        lower_bound=lower_bound,
+                                        upper_bound=upper_bound,
+                                        metric_params=self.metric_params,
+                                        n_jobs=self.n_jobs)
+
+            index.fit(X)
+
+        self._fit_metric(X)
+        self._factor = None
+        self._basis = None
+        self._index = index
+
+        estimator = self._init_estimator('precomputed')
+        estimator.set_params(metric_params=None)
+
+        # Each training sample is included in its own neighbors
+        return estimator, self._index_graph(X, n_extra=1)
+
+    def _sklearn_algorithm(self):
+        """Algorithm of the sklearn estimator."""
+        # The graphs computed with the index are searched by brute force
+        if self._uses_index() or self._metric_index() is not None:
+            return 'brute'
+
+        return self.algorithm
+
+    def _metric_index(self):
+        """Return the index used to search the neighbors, if any."""
+        if self.metric == 'precomputed':
+            return None
+
+        return getattr(self, "_index", None)
+
+    def _index_graph(self, X, n_extra=0):
+        """Sparse graph with the distances to the neighbors of X."""
+        if isinstance(self, KNeighborsMixin):
+            n_neighbors = min(self.n_neighbors + n_extra,
+                              len(self._index._fit_X))
+            return self._index.kneighbors_graph(X, n_neighbors,
+                                                mode='distance')
+
+        return self._index.radius_neighbors_graph(X, self.radius,
+                                                  mode='distance')
+
     def _transform_to_multivariate(self, X):
         """Transform the input data to array form. If the metric is
         precomputed it is not transformed.
 
+        The data is converted to the representation used in the fit.
+
         """
+        if X is not None and self._metric_index() is not None:
+            return self._index_graph(X)
+
         if X is not None and self.metric != 'precomputed':
+            basis = getattr(self, "_basis", None)
+
+            if basis is not None:
+                if not isinstance(X, FDataBasis) or X.basis != basis:
+                    X = X.to_basis(basis)
+            elif isinstance(X, FDataBasis):
+                X = X.to_grid(self._grid_points)
+
             X = _to_multivariate(X)
 
+            factor = getattr(self, "_factor", None)
+            if factor is not None:
+                X = _weigh(X, factor)
+
         return X
 
 
@@ -139,9 +436,11 @@ class NeighborsMixin:
         """Fit the model using X as training data and y as target values.
 
         Args:
-            X (:class:`FDataGrid`, array_matrix): Training data. FDataGrid
-                with the training data or array matrix with shape
-                [n_samples, n_samples] if metric='precomputed'.
+            X (:class:`FDataGrid`, :class:`FDataBasis`, array_matrix):
+                Training data. FDataGrid or FDataBasis with the training data,
+                fitted :class:`FunctionalNeighborsGraph` of the training data
+                with the metric of the estimator or array matrix with shape [n_samples, n_samples] if
+                metric='precomputed'.
             y (array-like or sparse matrix): Target values of
                 shape = [n_samples] or [n_samples, n_outputs].
                 In the case of unsupervised search, this parameter is ignored.
@@ -155,21 +454,11 @@ class NeighborsMixin:
         if self.metric == 'precomputed':
             self.estimator_ = self._init_estimator(self.metric)
             self.estimator_.fit(X, y)
+        elif self._uses_index(X):
+            self.estimator_, graph = self._fit_index(X)
+            self.estimator_.fit(graph, y)
         else:
-            self._grid_points = X.grid_points
-            self._shape = X.data_matrix.shape[1:]
-
-            if not self.multivariate_metric:
-                # Constructs sklearn metric to manage vector
-                if self.metric == 'l2':
-                    metric = lp_distance
-                else:
-                    metric = self.metric
-
-                sklearn_metric = _to_multivariate_metric(metric,
-                                                         self._grid_points)
-            else:
-                sklearn_metric = self.metric
+            sklearn_metric = self._fit_metric(X)
 
             self.estimator_ = self._init_estimator(sklearn_metric)
             self.estimator_.fit(self._transform_to_multivariate(X), y)
@@ -234,6 +523,13 @@ class KNeighborsMixin:
 
         """
         self._check_is_fitted()
+
+        index = self._metric_index()
+        if index is not None:
+            return index.kneighbors(
+                X, n_neighbors=n_neighbors or self.n_neighbors,
+                return_distance=return_distance)
+
         X = self._transform_to_multivariate(X)
 
         return self.estimator_.kneighbors(X, n_neighbors, return_distance)
@@ -292,6 +588,11 @@ class KNeighborsMixin:
         """
         self._check_is_fitted()
 
+        index = self._metric_index()
+        if index is not None:
+            return index.kneighbors_graph(
+                X, n_neighbors=n_neighbors or self.n_neighbors, mode=mode)
+
         X = self._transform_to_multivariate(X)
 
         return self.estimator_.kneighbors_graph(X, n_neighbors, mode)
@@ -371,6 +672,12 @@ class RadiusNeighborsMixin:
         """
         self._check_is_fitted()
 
+        index = self._metric_index()
+        if index is not None:
+            return index.radius_neighbors(
+                X, radius=self.radius if radius is None else radius,
+                return_distance=return_distance)
+
         X = self._transform_to_multivariate(X)
 
         return self.estimator_.radius_neighbors(
@@ -402,6 +709,12 @@ class RadiusNeighborsMixin:
         """
         self._check_is_fitted()
 
+        index = self._metric_index()
+        if index is not None:
+            return index.radius_neighbors_graph(
+                X, radius=self.radius if radius is None else radius,
+                mode=mode)
+
         X = self._transform_to_multivariate(X)
 
         return self.estimator_.radius_neighbors_graph(X=X, radius=radius,
@@ -456,9 +769,11 @@ class NeighborsRegressorMixin(NeighborsMixin, RegressorMixin):
         """Fit the model using X as training data and y as responses.
 
         Args:
-            X (:class:`FDataGrid`, array_matrix): Training data. FDataGrid
-                with the training data or array matrix with shape
-                [n_samples, n_samples] if metric='precomputed'.
+            X (:class:`FDataGrid`, :class:`FDataBasis`, array_matrix):
+                Training data. FDataGrid or FDataBasis with the training data,
+                fitted :class:`FunctionalNeighborsGraph` of the training data
+                with the metric of the estimator or array matrix with shape [n_samples, n_samples] if
+                metric='precomputed'.
             Y (:class:`FData` or array_like): Training data. FData
                 with the training respones (functional response case)
                 or array matrix with length `n_samples` in the multivariate
@@ -478,13 +793,18 @@ class NeighborsRegressorMixin(NeighborsMixin, RegressorMixin):
         """Fit the model using X as training data.
 
         Args:
-            X (:class:`FDataGrid`, array_matrix): Training data. FDataGrid
-                with the training data or array matrix with shape
-                [n_samples, n_samples] if metric='precomputed'.
+            X (:class:`FDataGrid`, :class:`FDataBasis`, array_matrix):
+                Training data. FDataGrid or FDataBasis with the training data,
+                fitted :class:`FunctionalNeighborsGraph` of the training data
+                with the metric of the estimator or array matrix with shape [n_samples, n_samples] if
+                metric='precomputed'.
 
 
         """
-        if len(X) != y.n_samples:
+        n_samples = (X.n_samples_fit_
+                     if isinstance(X, FunctionalNeighborsGraph) else len(X))
+
+        if n_samples != y.n_samples:
             raise ValueError("The response and dependent variable must "
                              "contain the same number of samples,")
 
@@ -492,21 +812,11 @@ class NeighborsRegressorMixin(NeighborsMixin, RegressorMixin):
         if self.metric == 'precomputed':
             self.estimator_ = self._init_estimator(self.metric)
             self.estimator_.fit(X)
+        elif self._uses_index(X):
+            self.estimator_, graph = self._fit_index(X)
+            self.estimator_.fit(graph)
         else:
-            self._grid_points = X.grid_points
-            self._shape = X.data_matrix.shape[1:]
-
-            if not self.multivariate_metric:
-
-                if self.metric == 'l2':
-                    metric = lp_distance
-                else:
-                    metric = self.metric
-
-                sklearn_metric = _to_multivariate_metric(metric,
-                                                         self._grid_points)
-            else:
-                sklearn_metric = self.metric
+            sklearn_metric = self._fit_metric(X)
 
             self.estimator_ = self._init_estimator(sklearn_metric)
             self.estimator_.fit(self._transform_to_multivariate(X))
@@ -612,7 +922,7 @@ class NeighborsRegressorMixin(NeighborsMixin, RegressorMixin):
 
             return _NearestNeighbors(
                 n_neighbors=self.n_neighbors, radius=self.radius,
-                algorithm=self.algorithm, leaf_size=self.leaf_size,
+                algorithm=self._sklearn_algorithm(), leaf_size=self.leaf_size,
                 metric=sklearn_metric, metric_params=self.metric_params,
                 n_jobs=self.n_jobs)
         else:
@@ -636,6 +946,46 @@ class NeighborsRegressorMixin(NeighborsMixin, RegressorMixin):
 
         distances, neighbors = self._query(X)
 
+        if self.regressor != 'mean':
+            return self._local_predict(distances, neighbors)
+
+        weight_matrix = self._weight_matrix(distances, neighbors)
+
+        if isinstance(self._y, FDataBasis):
+            values = self._y.coefficients
+        else:
+            values = self._y.data_matrix
+
+        # The weighted means are computed in one sparse-dense product
+        pred_values = weight_matrix @ values.reshape(len(values), -1)
+        pred_values = pred_values.reshape(
+            (len(pred_values),) + values.shape[1:])
+
+        outliers = np.diff(weight_matrix.indptr) == 0
+        if np.any(outliers):
+            outlier_response = self._outlier_response(neighbors)
+
+            if isinstance(self._y, FDataBasis):
+                pred_values[outliers] = outlier_response.coefficients
+            else:
+                pred_values[outliers] = outlier_response.data_matrix
+
+        sample_names = (None,) * len(pred_values)
+
+        if isinstance(self._y, FDataBasis):
+            return self._y.copy(coefficients=pred_values,
+                                sample_names=sample_names)
+
+        return self._y.copy(data_matrix=pred_values,
+                            sample_names=sample_names)
+
+    def _local_predict(self, distances, neighbors):
+        """Predict functional responses with a custom regressor.
+
+        The regressor is applied to the responses of the neighbors of each
+        test sample.
+
+        """
         if len(neighbors[0]) == 0:
             pred = self._outlier_response(neighbors)
         else:
@@ -652,6 +1002,48 @@ class NeighborsRegressorMixin(NeighborsMixin, RegressorMixin):
 
         return pred
 
+    def _weight_matrix(self, distances, neighbors):
+        """Sparse matrix with the weights of the mean of the responses.
+
+        Each row contains the weights of the training responses in the
+        prediction of a test sample, normalized to sum one, and it is empty
+        if the sample has no neighbors.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Matrix with shape (n_test, n_train).
+
+        """
+        n_neighbors = np.array([len(n) for n in neighbors])
+        indptr = np.concatenate(([0], np.cumsum(n_neighbors)))
+        indexes = np.concatenate(
+            [np.asarray(n, dtype=int) for n in neighbors]
+            + [np.empty(0, dtype=int)])
+        distances_flat = np.concatenate(
+            [np.asarray(d, dtype=float) for d in distances] + [np.empty(0)])
+        rows = np.repeat(np.arange(len(neighbors)), n_neighbors)
+
+        if self.weights == 'uniform':
+            weights = np.ones(len(indexes))
+        elif self.weights == 'distance':
+            # If some neighbors are at distance zero, they share all the
+            # weight
+            zero = distances_flat == 0
+            has_zero = np.bincount(rows[zero], minlength=len(neighbors)) > 0
+            with np.errstate(divide='ignore'):
+                weights = np.where(has_zero[rows], zero.astype(float),
+                                   1 / distances_flat)
+        else:
+            weights = np.concatenate(
+                [np.asarray(self.weights(d), dtype=float)
+                 for d in distances] + [np.empty(0)])
+
+        sums = np.bincount(rows, weights=weights, minlength=len(neighbors))
+        weights = weights / sums[rows]
+
+        return scipy.sparse.csr_matrix(
+            (weights, indexes, indptr),
+            shape=(len(neighbors), len(self._y)))
+
     def _outlier_response(self, neighbors):
         """Response in case of no neighbors"""
 
@@ -6,10 +6,16 @@ from sklearn.preprocessing import LabelEncoder
 from sklearn.utils.multiclass import check_classification_targets
 from sklearn.utils.validation import check_is_fitted as sklearn_check_is_fitted
 
+import numpy as np
+
+from .. import FDataBasis, concatenate
 from ..exploratory.stats import mean as l2_mean
-from ..misc.metrics import lp_distance, pairwise_distance
+from ..misc.metrics import lp_distance, pairwise_distance, _metric_bounds
+from ..representation import group_reduce
 from .base import (NeighborsBase, NeighborsMixin, KNeighborsMixin,
-                   NeighborsClassifierMixin, RadiusNeighborsMixin)
+                   NeighborsClassifierMixin, RadiusNeighborsMixin,
+                   _l2_factor, _to_multivariate, _weigh)
+from .lower_bound import LowerBoundIndex
 
 
 class KNeighborsClassifier(NeighborsBase, NeighborsMixin, KNeighborsMixin,
@@ -32,11 +38,15 @@ class KNeighborsClassifier(NeighborsBase, NeighborsMixin, KNeighborsMixin,
           array of distances, and returns an array of the same shape
           containing the weights.
 
-    algorithm : {'auto', 'ball_tree', 'brute'}, optional
+    algorithm : {'auto', 'ball_tree', 'brute', 'vp_tree'}, optional
         Algorithm used to compute the nearest neighbors:
 
         - 'ball_tree' will use :class:`sklearn.neighbors.BallTree`.
-        - 'brute' will use a brute-force search.
+        - 'brute' will use a brute-force search. With the elastic metrics
+          the search uses a :class:`~skfda._neighbors.LowerBoundIndex`,
+          which skips alignments using bounds of the metric.
+        - 'vp_tree' will use a :class:`~skfda._neighbors.VPTree` built
+          with the functional metric.
         - 'auto' will attempt to decide the most appropriate algorithm based on
           the values passed to :meth:`fit` method.
 
@@ -145,7 +155,7 @@ class KNeighborsClassifier(NeighborsBase, NeighborsMixin, KNeighborsMixin,
 
         return _KNeighborsClassifier(
             n_neighbors=self.n_neighbors, weights=self.weights,
-            algorithm=self.algorithm, leaf_size=self.leaf_size,
+            algorithm=self._sklearn_algorithm(), leaf_size=self.leaf_size,
             metric=sklearn_metric, metric_params=self.metric_params,
             n_jobs=self.n_jobs)
 
@@ -193,11 +203,15 @@ class RadiusNeighborsClassifier(NeighborsBase, NeighborsMixin,
           containing the weights.
 
         Uniform weights are used by default.
-    algorithm : {'auto', 'ball_tree', 'brute'}, optional
+    algorithm : {'auto', 'ball_tree', 'brute', 'vp_tree'}, optional
         Algorithm used to compute the nearest neighbors:
 
         - 'ball_tree' will use :class:`sklearn.neighbors.BallTree`.
-        - 'brute' will use a brute-force search.
+        - 'brute' will use a brute-force search. With the elastic metrics
+          the search uses a :class:`~skfda._neighbors.LowerBoundIndex`,
+          which skips alignments using bounds of the metric.
+        - 'vp_tree' will use a :class:`~skfda._neighbors.VPTree` built
+          with the functional metric.
         - 'auto' will attempt to decide the most appropriate algorithm
           based on the values passed to :meth:`fit` method.
 
@@ -298,7 +312,7 @@ class RadiusNeighborsClassifier(NeighborsBase, NeighborsMixin,
 
         return _RadiusNeighborsClassifier(
             radius=self.radius, weights=self.weights,
-            algorithm=self.algorithm, leaf_size=self.leaf_size,
+            algorithm=self._sklearn_algorithm(), leaf_size=self.leaf_size,
             metric=sklearn_metric, metric_params=self.metric_params,
             outlier_label=self.outlier_label, n_jobs=self.n_jobs)
 
@@ -399,15 +413,56 @@ class NearestCentroid(BaseEstimator, ClassifierMixin):
             raise ValueError(f'The number of classes has to be greater than'
                              f' one; got {n_classes} class')
 
-        self.centroids_ = mean(X[y_ind == 0])
-
-        for cur_class in range(1, n_classes):
-            center_mask = y_ind == cur_class
-            centroid = mean(X[center_mask])
-            self.centroids_ = self.centroids_.concatenate(centroid)
+        if mean is l2_mean:
+            # The means of all the classes are computed at once
+            self.centroids_ = group_reduce(X, y_ind, 'mean',
+                                           n_groups=n_classes)
+        else:
+            # The samples of each class are contiguous once sorted
+            order = np.argsort(y_ind, kind='stable')
+            bounds = np.cumsum(np.bincount(y_ind, minlength=n_classes))
+
+            self.centroids_ = concatenate([
+                mean(X[order[start:stop]]) for start, stop
+                in zip(np.concatenate(([0], bounds[:-1])), bounds)])
+
+        # The L2 distances to the centroids are computed with a matrix
+        # product, caching the norms of the centroids
+        self._l2_factor = None
+        if self.metric in ('l2', lp_distance):
+            self._l2_factor = _l2_factor(self.centroids_)
+
+        if self._l2_factor is not None:
+            self._l2_centroids = _weigh(
+                _to_multivariate(self.centroids_), self._l2_factor)
+            self._l2_centroid_norms = np.einsum(
+                'ij,ij->i', self._l2_centroids, self._l2_centroids)
+
+        # The nearest centroid is searched pruning the evaluations of
+        # expensive metrics, if possible
+        bounds = _metric_bounds(self.metric)
+
+        if bounds is None:
+            self._index = None
+        else:
+            self._index = LowerBoundIndex(
+                self.metric, lower_bound=bounds[0],
+                upper_bound=bounds[1]).fit(self.centroids_)
 
         return self
 
+    def _same_representation(self, X):
+        """Check if X is discretized as the centroids."""
+        if isinstance(self.centroids_, FDataBasis):
+            return (isinstance(X, FDataBasis)
+                    and X.basis == self.centroids_.basis)
+
+        return (not isinstance(X, FDataBasis)
+                and X.data_matrix.shape[1:] == (
+                    self.centroids_.data_matrix.shape[1:])
+                and all(np.array_equal(a, b) for a, b in zip(
+                    X.grid_points, self.centroids_.grid_points)))
+
     def predict(self, X):
         """Predict the class labels for the provided data.
 
@@ -422,5 +477,19 @@ class NearestCentroid(BaseEstimator, ClassifierMixin):
         """
         sklearn_check_is_fitted(self, 'centroids_')
 
+        if self._index is not None:
+            nearest = self._index.kneighbors(X, n_neighbors=1,
+                                             return_distance=False)
+            return self.classes_[nearest[:, 0]]
+
+        if self._l2_factor is not None and self._same_representation(X):
+            # The norms of the samples do not change the nearest centroid
+            squared_distances = (
+                self._l2_centroid_norms
+                - 2 * _weigh(_to_multivariate(X), self._l2_factor)
+                @ self._l2_centroids.T)
+
+            return self.classes_[squared_distances.argmin(axis=1)]
+
         return self.classes_[self._pairwise_distance(
             X, self.centroids_).argmin(axis=1)]
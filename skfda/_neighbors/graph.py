@@ -0,0 +1,351 @@
+"""Reusable graph of the neighbors of a functional dataset."""
+
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+import numpy as np
+import scipy.sparse
+
+from ._index import _MetricIndex
+
+
+def _sort_graph_rows(graph):
+    """Sort the entries of each row of a sparse graph by distance."""
+    graph = scipy.sparse.csr_matrix(graph)
+    rows = np.repeat(np.arange(graph.shape[0]), np.diff(graph.indptr))
+    order = np.lexsort((graph.indices, graph.data, rows))
+
+    return scipy.sparse.csr_matrix(
+        (graph.data[order], graph.indices[order], graph.indptr),
+        shape=graph.shape)
+
+
+def _add_self_loops(graph):
+    """Include each sample in its own neighbors, at distance zero."""
+    n_samples = graph.shape[0]
+    indptr = graph.indptr + np.arange(n_samples + 1)
+
+    first = indptr[:-1]
+    others = np.ones(indptr[-1], dtype=bool)
+    others[first] = False
+
+    indices = np.empty(indptr[-1], dtype=graph.indices.dtype)
+    indices[first] = np.arange(n_samples)
+    indices[others] = graph.indices
+
+    data = np.zeros(indptr[-1], dtype=graph.data.dtype)
+    data[others] = graph.data
+
+    return scipy.sparse.csr_matrix((data, indices, indptr),
+                                   shape=graph.shape)
+
+
+class FunctionalNeighborsGraph(BaseEstimator, TransformerMixin,
+                               _MetricIndex):
+    r"""Graph of the neighbors of a functional dataset, reusable across
+    estimators.
+
+    Stores the sparse graph with the distances between each training sample
+    and its ``n_neighbors`` nearest neighbors, or its neighbors within a
+    ``radius``. Fitted neighbors estimators, as
+    :class:`~skfda.ml.classification.KNeighborsClassifier`,
+    :class:`~skfda.ml.regression.KNeighborsRegressor` or
+    :class:`~skfda._neighbors.outlier.LocalOutlierFactor`, accept the
+    graph in place of the training data, and search the neighbors of the
+    training samples in it instead of computing the distances again. Thus,
+    a sweep over the number of neighbors of an estimator builds the graph
+    once, with the largest number of neighbors. The metric and
+    metric_params of the graph must be those of the estimator, whose
+    algorithm is not used.
+
+    The neighbors of new samples are searched with a
+    :class:`~skfda.ml.clustering.NearestNeighbors` estimator fitted with
+    the training data. The sparse graphs returned by :meth:`transform`
+    can be passed to the prediction methods of the estimators, to reuse
+    also the distances of the test samples.
+
+    Args:
+        n_neighbors (int, optional): Number of neighbors of the graph.
+            Defaults to 5.
+        radius (float, optional): If given, the graph stores the neighbors
+            within this radius instead of a fixed number of neighbors.
+        algorithm (string, optional): Algorithm used to compute the
+            nearest neighbors, as in
+            :class:`~skfda.ml.clustering.NearestNeighbors`.
+        leaf_size (int, optional): Leaf size passed to the tree
+            algorithms. Defaults to 30.
+        metric (string or callable, optional): Metric to use for the
+            distance computation, as in
+            :class:`~skfda.ml.clustering.NearestNeighbors`. Defaults to
+            'l2'.
+        metric_params (dict, optional): Additional keyword arguments for the
+            metric function.
+        n_jobs (int or None, optional): The number of parallel jobs to run
+            for the neighbors search.
+        multivariate_metric (boolean, optional): Indicates if the metric
+            used is a sklearn distance between vectors (see
+            :class:`~sklearn.neighbors.DistanceMetric`) or a functional
+            metric of the module :mod:`skfda.misc.metrics`. Defaults to
+            False.
+
+    Attributes:
+        graph_ (scipy.sparse.csr_matrix): Graph with shape
+            (n_samples_fit, n_samples_fit) with the distances from each
+            training sample to its neighbors, sorted by distance, not
+            including the sample itself.
+        nearest_neighbors_ (NearestNeighbors): Estimator fitted with the
+            training data, used to search the neighbors not stored in the
+            graph.
+        n_samples_fit_ (int): Number of training samples.
+
+    Examples:
+
+        >>> from skfda.datasets import make_sinusoidal_process
+        >>> from skfda.ml.classification import KNeighborsClassifier
+        >>> from skfda.ml.clustering import FunctionalNeighborsGraph
+        >>> fd = make_sinusoidal_process(n_samples=40, random_state=0)
+        >>> y = np.arange(40) % 2
+
+        The graph is built once with the largest number of neighbors, and
+        used to fit estimators with fewer neighbors.
+
+        >>> graph = FunctionalNeighborsGraph(n_neighbors=7).fit(fd)
+        >>> graph.graph_.shape
+        (40, 40)
+        >>> for n_neighbors in (3, 5, 7):
+        ...     knn = KNeighborsClassifier(n_neighbors=n_neighbors)
+        ...     knn = knn.fit(graph, y)
+
+        The neighbors of the training samples are read from the graph.
+
+        >>> knn.kneighbors(n_neighbors=3, return_distance=False).shape
+        (40, 3)
+
+    """
+
+    def __init__(self, n_neighbors=5, radius=None, *, algorithm='auto',
+                 leaf_size=30, metric='l2', metric_params=None, n_jobs=None,
+                 multivariate_metric=False):
+        self.n_neighbors = n_neighbors
+        self.radius = radius
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.metric = metric
+        self.metric_params = metric_params
+        self.n_jobs = n_jobs
+        self.multivariate_metric = multivariate_metric
+
+    def fit(self, X, y=None):
+        """Compute the graph of neighbors of the training data.
+
+        Args:
+            X (FDataGrid or FDataBasis): Training data.
+            y: Ignored.
+
+        Returns:
+            self
+
+        """
+        from .unsupervised import NearestNeighbors
+
+        self.nearest_neighbors_ = NearestNeighbors(
+            n_neighbors=self.n_neighbors,
+            radius=1. if self.radius is None else self.radius,
+            algorithm=self.algorithm, leaf_size=self.leaf_size,
+            metric=self.metric, metric_params=self.metric_params,
+            n_jobs=self.n_jobs, multivariate_metric=self.multivariate_metric)
+        self.nearest_neighbors_.fit(X)
+
+        if self.radius is None:
+            graph = self.nearest_neighbors_.kneighbors_graph(mode='distance')
+        else:
+            graph = self.nearest_neighbors_.radius_neighbors_graph(
+                mode='distance')
+
+        self._fit_X = X
+        self.n_samples_fit_ = len(X)
+        self.graph_ = _sort_graph_rows(graph)
+
+        return self
+
+    def _stored_graph(self, X):
+        """Graph with the neighbors of X, if they are already known.
+
+        The neighbors of the training samples are stored, and a sparse
+        matrix is a graph of neighbors computed previously.
+
+        """
+        if X is None:
+            return self.graph_
+
+        if X is self._fit_X:
+            return _add_self_loops(self.graph_)
+
+        if scipy.sparse.issparse(X):
+            return _sort_graph_rows(X)
+
+        return None
+
+    def kneighbors(self, X=None, n_neighbors=None, return_distance=True):
+        """Find the K-neighbors of the samples.
+
+        The neighbors are read from the graph if it contains enough
+        neighbors of each query sample, and searched otherwise.
+
+        Args:
+            X (FData or sparse matrix, optional): Query samples, or sparse
+                graph with their distances to the training samples, as
+                returned by :meth:`transform`. If not provided, the
+                neighbors of each training sample are returned, not
+                considering the sample its own neighbor.
+            n_neighbors (int): Number of neighbors to get. Defaults to the
+                value passed to the constructor.
+            return_distance (boolean, optional): If False, distances will
+                not be returned. Defaults to True.
+
+        Returns:
+            (tuple): Arrays with shape (n_queries, n_neighbors) with the
+            distances to the neighbors, only present if
+            return_distance=True, and their indexes, sorted by distance.
+
+        """
+        check_is_fitted(self, 'graph_')
+
+        n_neighbors = n_neighbors or self.n_neighbors
+        graph = self._stored_graph(X)
+
+        if graph is not None and np.all(np.diff(graph.indptr) >= n_neighbors):
+            positions = graph.indptr[:-1, np.newaxis] + np.arange(n_neighbors)
+            distances = graph.data[positions]
+            indexes = graph.indices[positions]
+
+            return (distances, indexes) if return_distance else indexes
+
+        if scipy.sparse.issparse(X):
+            raise ValueError(f"The graph does not contain {n_neighbors} "
+                             f"neighbors of each sample")
+
+        return self.nearest_neighbors_.kneighbors(
+            X, n_neighbors=n_neighbors, return_distance=return_distance)
+
+    def radius_neighbors(self, X=None, radius=None, return_distance=True):
+        """Find the neighbors within a given radius of the samples.
+
+        The neighbors are read from the graph if it was built with a larger
+        radius, and searched otherwise.
+
+        Args:
+            X (FData or sparse matrix, optional): Query samples, or sparse
+                graph with their distances to the training samples, as
+                returned by :meth:`transform`. If not provided, the
+                neighbors of each training sample are returned, not
+                considering the sample its own neighbor.
+            radius (float): Limiting distance of neighbors to return.
+                Defaults to the value passed to the constructor.
+            return_distance (boolean, optional): If False, distances will
+                not be returned. Defaults to True.
+
+        Returns:
+            (tuple): Arrays of objects with the distances to the neighbors
+            of each query, only present if return_distance=True, and their
+            indexes, sorted by distance.
+
+        """
+        check_is_fitted(self, 'graph_')
+
+        if radius is None:
+            radius = self.radius
+
+        graph = None
+        if scipy.sparse.issparse(X) or (self.radius is not None
+                                        and radius <= self.radius):
+            graph = self._stored_graph(X)
+
+        if graph is None:
+            return self.nearest_neighbors_.radius_neighbors(
+                X, radius=radius, return_distance=return_distance)
+
+        keep = graph.data <= radius
+        rows = np.repeat(np.arange(graph.shape[0]), np.diff(graph.indptr))
+        splits = np.cumsum(np.bincount(rows[keep],
+                                       minlength=graph.shape[0]))[:-1]
+
+        def to_object_array(values):
+            result = np.empty(graph.shape[0], dtype=object)
+            result[:] = np.split(values[keep], splits)
+            return result
+
+        indexes = to_object_array(graph.indices)
+
+        if return_distance:
+            return to_object_array(graph.data), indexes
+
+        return indexes
+
+    def kneighbors_graph(self, X=None, n_neighbors=None,
+                         mode='connectivity'):
+        """Compute the graph of K-neighbors of the samples.
+
+        Args:
+            X (FData or sparse matrix, optional): Query samples, or sparse
+                graph with their distances to the training samples. If not
+                provided, the neighbors of each training sample are
+                returned, not considering the sample its own neighbor.
+            n_neighbors (int): Number of neighbors of each sample. Defaults
+                to the value passed to the constructor.
+            mode ('connectivity' or 'distance', optional): Type of returned
+                matrix: 'connectivity' will return the connectivity matrix
+                with ones and zeros, in 'distance' the edges are distance
+                between points, stored explicitly even if they are zero.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Sparse matrix with shape
+            (n_queries, n_samples_fit).
+
+        """
+        return super().kneighbors_graph(
+            X, n_neighbors=n_neighbors or self.n_neighbors, mode=mode)
+
+    def radius_neighbors_graph(self, X=None, radius=None,
+                               mode='connectivity'):
+        """Compute the graph of neighbors within a radius of the samples.
+
+        Args:
+            X (FData or sparse matrix, optional): Query samples, or sparse
+                graph with their distances to the training samples. If not
+                provided, the neighbors of each training sample are
+                returned, not considering the sample its own neighbor.
+            radius (float): Limiting distance of neighbors. Defaults to the
+                value passed to the constructor.
+            mode ('connectivity' or 'distance', optional): Type of returned
+                matrix: 'connectivity' will return the connectivity matrix
+                with ones and zeros, in 'distance' the edges are distance
+                between points, stored explicitly even if they are zero.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Sparse matrix with shape
+            (n_queries, n_samples_fit).
+
+        """
+        return super().radius_neighbors_graph(
+            X, radius=self.radius if radius is None else radius, mode=mode)
+
+    def transform(self, X):
+        """Compute the graph of neighbors of the samples.
+
+        The graph can be passed to the prediction methods of the estimators
+        fitted with this object, which read the neighbors from it.
+
+        Args:
+            X (FData): Query samples. If X is the training data, each
+                sample is included in its own neighbors.
+
+        Returns:
+            (scipy.sparse.csr_matrix): Sparse matrix with shape
+            (n_queries, n_samples_fit) with the distances to the neighbors.
+
+        """
+        if self.radius is None:
+            return self.kneighbors_graph(X, mode='distance')
+
+        return self.radius_neighbors_graph(X, mode='distance')
@@ -0,0 +1,160 @@
+"""Nearest neighbors search pruned with lower bounds of the metric."""
+
+import heapq
+
+import numpy as np
+
+from ._index import _MetricIndex
+
+
+class LowerBoundIndex(_MetricIndex):
+    r"""Index pruning the evaluations of an expensive metric.
+
+    Index for the search of neighbors with a metric whose evaluation is
+    expensive, such as the elastic distances, which need to align the
+    functions. For each query, the candidates are examined in increasing
+    order of a cheap lower bound of their distances, and the exact distance
+    is only computed while the bound does not exceed the distance to the
+    current :math:`k`-th neighbor (or the radius of the search). The
+    search radius of the :math:`k`-neighbors queries is initialized with a
+    cheap upper bound of the metric, if available.
+
+    Args:
+        metric (callable): Distance between functional data objects, with the
+            signature of the functions of the module :mod:`skfda.misc.metrics`.
+            It must compute the distances between the samples of two objects
+            of the same length elementwise.
+        lower_bound (callable): Function with signature
+            ``lower_bound(fdata, **metric_params)`` returning an array with
+            one row per sample, such that the euclidean distance between
+            two rows is a lower bound of the metric.
+        upper_bound (callable, optional): Upper bound of the metric, with
+            the signature of the metric.
+        metric_params (dict, optional): Additional keyword arguments for the
+            metric function and its bounds.
+        n_jobs (int or None, optional): The number of parallel jobs to run
+            for the queries. ``None`` means 1 unless in a
+            :obj:`joblib.parallel_backend` context. ``-1`` means using all
+            processors.
+
+    Attributes:
+        n_distance_evaluations_ (int): Number of exact distances computed
+            since the index was built.
+        n_pruned_distances_ (int): Number of distances between the queries
+            and the indexed samples that were not computed.
+
+    Examples:
+
+        >>> from skfda.datasets import make_sinusoidal_process
+        >>> from skfda.misc.metrics import amplitude_distance, _metric_bounds
+        >>> from skfda._neighbors import LowerBoundIndex
+        >>> fd = make_sinusoidal_process(n_samples=30, amplitude_std=1,
+        ...                              error_std=0, random_state=0)
+        >>> lower_bound, upper_bound = _metric_bounds(amplitude_distance)
+        >>> index = LowerBoundIndex(amplitude_distance,
+        ...                         lower_bound=lower_bound,
+        ...                         upper_bound=upper_bound).fit(fd[2:])
+        >>> distances, neighbors = index.kneighbors(fd[:2], n_neighbors=1)
+
+        The neighbors are the same as those found by brute force, but
+        computing less alignments.
+
+        >>> index.n_pruned_distances_ > 0
+        True
+
+    """
+
+    def __init__(self, metric, *, lower_bound, upper_bound=None,
+                 metric_params=None, n_jobs=None):
+        self.metric = metric
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.metric_params = metric_params
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y=None):
+        """Compute the lower bound embedding of the indexed samples.
+
+        Args:
+            X (FData): Samples to index.
+            y: Ignored.
+
+        Returns:
+            self
+
+        """
+        metric_params = self.metric_params or {}
+
+        self._fit_X = X
+        self._embedding = self.lower_bound(X, **metric_params)
+        self.n_distance_evaluations_ = 0
+        self.n_pruned_distances_ = 0
+
+        return self
+
+    def _search(self, query, n_neighbors=None, radius=None, exclude=None):
+        """Search the neighbors of a single sample.
+
+        If ``n_neighbors`` is given, the closest neighbors are returned,
+        otherwise the ones at distance less or equal than ``radius``.
+
+        """
+        X = self._fit_X
+        metric_params = self.metric_params or {}
+        n_evaluations = 0
+
+        candidates = np.arange(len(X))
+        if exclude is not None:
+            candidates = np.delete(candidates, exclude)
+
+        lower_bounds = np.linalg.norm(
+            self._embedding[candidates]
+            - self.lower_bound(query, **metric_params), axis=1)
+
+        if radius is not None:
+            bound = radius
+        elif self.upper_bound is not None and len(candidates) > n_neighbors:
+            upper_bounds = self.upper_bound(
+                query[np.zeros(len(candidates), dtype=int)], X[candidates],
+                **metric_params)
+            bound = np.partition(upper_bounds, n_neighbors - 1)[
+                n_neighbors - 1]
+        else:
+            bound = np.inf
+
+        order = np.argsort(lower_bounds, kind='stable')
+        order = order[lower_bounds[order] <= bound]
+
+        # Max-heap of the current neighbors (-distance, -index)
+        heap = []
+
+        # The distances are computed in batches of the size of the heap
+        batch_size = n_neighbors if radius is None else max(len(order), 1)
+
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            batch = batch[lower_bounds[batch] <= bound]
+
+            if len(batch) == 0:
+                break
+
+            distances = self._distances(X, candidates[batch], query)
+            n_evaluations += len(batch)
+
+            for d, index in zip(distances, candidates[batch]):
+                if radius is not None and d > radius:
+                    continue
+                item = (-d, -index)
+                if n_neighbors is None or len(heap) < n_neighbors:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+            if n_neighbors is not None and len(heap) == n_neighbors:
+                bound = min(bound, -heap[0][0])
+
+        result = sorted((-d, -i) for d, i in heap)
+        distances = np.array([d for d, _ in result])
+        indexes = np.array([i for _, i in result], dtype=int)
+
+        return distances, indexes, n_evaluations
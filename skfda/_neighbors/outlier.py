@@ -2,9 +2,7 @@
 
 from sklearn.base import OutlierMixin
 
-from ..misc.metrics import lp_distance
-from .base import (NeighborsBase, NeighborsMixin, KNeighborsMixin,
-                   _to_multivariate_metric)
+from .base import NeighborsBase, NeighborsMixin, KNeighborsMixin
 
 
 class LocalOutlierFactor(NeighborsBase, NeighborsMixin, KNeighborsMixin,
@@ -33,12 +31,16 @@ class LocalOutlierFactor(NeighborsBase, NeighborsMixin, KNeighborsMixin,
         Number of neighbors to use by default for :meth:`kneighbors` queries.
         If n_neighbors is larger than the number of samples provided,
         all samples will be used.
-    algorithm : {'auto', 'ball_tree', 'kd_tree', 'brute'}, optional
+    algorithm : {'auto', 'ball_tree', 'kd_tree', 'brute', 'vp_tree'}, optional
         Algorithm used to compute the nearest neighbors:
 
         - 'ball_tree' will use :class:`BallTree`
         - 'kd_tree' will use :class:`KDTree`
-        - 'brute' will use a brute-force search.
+        - 'brute' will use a brute-force search. With the elastic metrics
+          the search uses a :class:`~skfda._neighbors.LowerBoundIndex`,
+          which skips alignments using bounds of the metric.
+        - 'vp_tree' will use a :class:`~skfda._neighbors.VPTree` built
+          with the functional metric.
         - 'auto' will attempt to decide the most appropriate algorithm
           based on the values passed to :meth:`fit` method.
 
@@ -194,7 +196,7 @@ class LocalOutlierFactor(NeighborsBase, NeighborsMixin, KNeighborsMixin,
         from sklearn.neighbors import LocalOutlierFactor as _LocalOutlierFactor
 
         return _LocalOutlierFactor(
-            n_neighbors=self.n_neighbors, algorithm=self.algorithm,
+            n_neighbors=self.n_neighbors, algorithm=self._sklearn_algorithm(),
             leaf_size=self.leaf_size, metric=sklearn_metric,
             metric_params=self.metric_params, contamination=self.contamination,
             novelty=self.novelty, n_jobs=self.n_jobs)
@@ -276,20 +278,11 @@ class LocalOutlierFactor(NeighborsBase, NeighborsMixin, KNeighborsMixin,
         if self.metric == 'precomputed':
             self.estimator_ = self._init_estimator(self.metric)
             res = self.estimator_.fit_predict(X, y)
+        elif self._uses_index(X):
+            self.estimator_, graph = self._fit_index(X)
+            res = self.estimator_.fit_predict(graph, y)
         else:
-            self._grid_points = X.grid_points
-            self._shape = X.data_matrix.shape[1:]
-
-            if not self.multivariate_metric:
-                # Constructs sklearn metric to manage vector
-                if self.metric == 'l2':
-                    metric = lp_distance
-                else:
-                    metric = self.metric
-                sklearn_metric = _to_multivariate_metric(metric,
-                                                         self._grid_points)
-            else:
-                sklearn_metric = self.metric
+            sklearn_metric = self._fit_metric(X)
 
             self.estimator_ = self._init_estimator(sklearn_metric)
             X_multivariate = self._transform_to_multivariate(X)
@@ -34,11 +34,15 @@ class KNeighborsRegressor(NeighborsBase, NeighborsRegressorMixin,
         Function to perform the local regression in the functional response
         case. By default used the mean. Can the neighbors of a test sample,
         and if weights != 'uniform' an array of weights as second parameter.
-    algorithm : {'auto', 'ball_tree', 'brute'}, optional
+    algorithm : {'auto', 'ball_tree', 'brute', 'vp_tree'}, optional
         Algorithm used to compute the nearest neighbors:
 
         - 'ball_tree' will use :class:`sklearn.neighbors.BallTree`.
-        - 'brute' will use a brute-force search.
+        - 'brute' will use a brute-force search. With the elastic metrics
+          the search uses a :class:`~skfda._neighbors.LowerBoundIndex`,
+          which skips alignments using bounds of the metric.
+        - 'vp_tree' will use a :class:`~skfda._neighbors.VPTree` built
+          with the functional metric.
         - 'auto' will attempt to decide the most appropriate algorithm based on
           the values passed to :meth:`fit` method.
 
@@ -159,7 +163,7 @@ class KNeighborsRegressor(NeighborsBase, NeighborsRegressorMixin,
 
         return _KNeighborsRegressor(
             n_neighbors=self.n_neighbors, weights=self.weights,
-            algorithm=self.algorithm, leaf_size=self.leaf_size,
+            algorithm=self._sklearn_algorithm(), leaf_size=self.leaf_size,
             metric=sklearn_metric, metric_params=self.metric_params,
             n_jobs=self.n_jobs)
 
@@ -200,11 +204,15 @@ class RadiusNeighborsRegressor(NeighborsBase, NeighborsRegressorMixin,
         Function to perform the local regression in the functional response
         case. By default used the mean. Can the neighbors of a test sample,
         and if weights != 'uniform' an array of weights as second parameter.
-    algorithm : {'auto', 'ball_tree', 'brute'}, optional
+    algorithm : {'auto', 'ball_tree', 'brute', 'vp_tree'}, optional
         Algorithm used to compute the nearest neighbors:
 
         - 'ball_tree' will use :class:`sklearn.neighbors.BallTree`.
-        - 'brute' will use a brute-force search.
+        - 'brute' will use a brute-force search. With the elastic metrics
+          the search uses a :class:`~skfda._neighbors.LowerBoundIndex`,
+          which skips alignments using bounds of the metric.
+        - 'vp_tree' will use a :class:`~skfda._neighbors.VPTree` built
+          with the functional metric.
         - 'auto' will attempt to decide the most appropriate algorithm
           based on the values passed to :meth:`fit` method.
 
@@ -324,7 +332,7 @@ class RadiusNeighborsRegressor(NeighborsBase, NeighborsRegressorMixin,
 
         return _RadiusNeighborsRegressor(
             radius=self.radius, weights=self.weights,
-            algorithm=self.algorithm, leaf_size=self.leaf_size,
+            algorithm=self._sklearn_algorithm(), leaf_size=self.leaf_size,
             metric=sklearn_metric, metric_params=self.metric_params,
             n_jobs=self.n_jobs)
 
@@ -15,11 +15,15 @@ class NearestNeighbors(NeighborsBase, NeighborsMixin, KNeighborsMixin,
     radius : float, optional (default = 1.0)
         Range of parameter space to use by default for :meth:`radius_neighbors`
         queries.
-    algorithm : {'auto', 'ball_tree', 'brute'}, optional
+    algorithm : {'auto', 'ball_tree', 'brute', 'vp_tree'}, optional
         Algorithm used to compute the nearest neighbors:
 
         - 'ball_tree' will use :class:`sklearn.neighbors.BallTree`.
-        - 'brute' will use a brute-force search.
+        - 'brute' will use a brute-force search. With the elastic metrics
+          the search uses a :class:`~skfda._neighbors.LowerBoundIndex`,
+          which skips alignments using bounds of the metric.
+        - 'vp_tree' will use a :class:`~skfda._neighbors.VPTree` built
+          with the functional metric.
         - 'auto' will attempt to decide the most appropriate algorithm based on
           the values passed to :meth:`fit` method.
 
@@ -128,6 +132,6 @@ class NearestNeighbors(NeighborsBase, NeighborsMixin, KNeighborsMixin,
 
         return _NearestNeighbors(
             n_neighbors=self.n_neighbors, radius=self.radius,
-            algorithm=self.algorithm, leaf_size=self.leaf_size,
+            algorithm=self._sklearn_algorithm(), leaf_size=self.leaf_size,
             metric=sklearn_metric, metric_params=self.metric_params,
             n_jobs=self.n_jobs)
@@ -0,0 +1,207 @@
+"""Vantage-point tree for nearest neighbors search with any metric."""
+
+import heapq
+
+from sklearn.utils import check_random_state
+
+import numpy as np
+
+from ._index import _MetricIndex
+
+
+class VPTree(_MetricIndex):
+    r"""Vantage-point tree for nearest neighbors search.
+
+    Index for the search of neighbors with an arbitrary metric, which only
+    requires the triangle inequality. Each node of the tree selects a
+    vantage point :math:`v` and splits the remaining samples in those inside
+    the ball of radius :math:`\mu` (the median of their distances to
+    :math:`v`) and those outside. During a query for a sample :math:`q`, a
+    subtree is discarded without computing distances when the triangle
+    inequality guarantees that all its samples are farther than the
+    current search radius:
+
+    .. math::
+        d(q, x) \geq d(q, v) - \mu \quad \text{inside the ball}, \qquad
+        d(q, x) > \mu - d(q, v) \quad \text{outside the ball}.
+
+    Args:
+        metric (callable): Distance between functional data objects, with the
+            signature of the functions of the module :mod:`skfda.misc.metrics`.
+            It must compute the distances between the samples of two objects
+            of the same length elementwise.
+        metric_params (dict, optional): Additional keyword arguments for the
+            metric function.
+        leaf_size (int, optional): Maximum number of samples in a leaf, whose
+            distances to the query are computed in one call to the metric.
+            Defaults to 30.
+        n_jobs (int or None, optional): The number of parallel jobs to run
+            for the queries. ``None`` means 1 unless in a
+            :obj:`joblib.parallel_backend` context. ``-1`` means using all
+            processors.
+        random_state (int, RandomState instance or None, optional): Seed
+            used to choose the vantage points.
+
+    Attributes:
+        n_distance_evaluations_ (int): Number of distances computed since
+            the tree was built, including those needed for the construction.
+        n_pruned_distances_ (int): Number of distances between the queries
+            and the indexed samples that were not computed.
+
+    Examples:
+
+        >>> from skfda.datasets import make_sinusoidal_process
+        >>> from skfda.misc.metrics import lp_distance
+        >>> from skfda._neighbors import VPTree
+        >>> fd = make_sinusoidal_process(n_samples=100, random_state=0)
+        >>> tree = VPTree(lp_distance, leaf_size=5, random_state=0).fit(fd)
+
+        The neighbors are the same as those found by brute force, but
+        computing less distances.
+
+        >>> n_evaluations = tree.n_distance_evaluations_
+        >>> distances, index = tree.kneighbors(fd[:2], n_neighbors=3)
+        >>> index
+        array([[ 0, 27,  8],
+               [ 1, 90, 64]])
+        >>> tree.n_distance_evaluations_ - n_evaluations < 2 * len(fd)
+        True
+
+    """
+
+    def __init__(self, metric, *, metric_params=None, leaf_size=30,
+                 n_jobs=None, random_state=None):
+        self.metric = metric
+        self.metric_params = metric_params
+        self.leaf_size = leaf_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        """Build the tree.
+
+        Args:
+            X (FData): Samples to index.
+            y: Ignored.
+
+        Returns:
+            self
+
+        """
+        if self.leaf_size < 1:
+            raise ValueError("leaf_size must be greater or equal than 1")
+
+        random_state = check_random_state(self.random_state)
+
+        self._fit_X = X
+        self.n_distance_evaluations_ = 0
+        self.n_pruned_distances_ = 0
+
+        # Each node is stored as (vantage point, threshold, inside, outside)
+        # in the internal nodes and (-1, leaf samples, None, None) in leaves
+        self._nodes = []
+
+        stack = [(np.arange(len(X)), None, None)]
+
+        while stack:
+            indexes, parent, side = stack.pop()
+            node = len(self._nodes)
+
+            if parent is not None:
+                self._nodes[parent][side] = node
+
+            if len(indexes) <= self.leaf_size:
+                self._nodes.append([-1, indexes, None, None])
+                continue
+
+            vantage_pos = random_state.randint(len(indexes))
+            vantage = indexes[vantage_pos]
+            rest = np.delete(indexes, vantage_pos)
+
+            distances = self._distances(X, rest, X[[vantage]])
+            self.n_distance_evaluations_ += len(rest)
+
+            threshold = np.median(distances)
+            inside = distances <= threshold
+
+            if np.all(inside):
+                # All samples at the same distance: no useful split
+                self._nodes.append([-1, indexes, None, None])
+                continue
+
+            self._nodes.append([vantage, threshold, None, None])
+            stack.append((rest[~inside], node, 3))
+            stack.append((rest[inside], node, 2))
+
+        return self
+
+    def _search(self, query, n_neighbors=None, radius=None, exclude=None):
+        """Search the neighbors of a single sample.
+
+        If ``n_neighbors`` is given, the closest neighbors are returned,
+        otherwise the ones at distance less or equal than ``radius``.
+
+        """
+        X = self._fit_X
+        n_evaluations = 0
+
+        # Max-heap of the current neighbors (-distance, -index)
+        heap = []
+        bound = np.inf if radius is None else radius
+
+        def add(distance, index):
+            if index == exclude or distance > bound:
+                return
+            item = (-distance, -index)
+            if n_neighbors is None or len(heap) < n_neighbors:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        # Stack of (node, lower bound of the distances to its samples)
+        stack = [(0, 0.)]
+
+        while stack:
+            node, lower_bound = stack.pop()
+
+            if lower_bound > bound:
+                continue
+
+            vantage, threshold, inside, outside = self._nodes[node]
+
+            if vantage < 0:
+                leaf = threshold[threshold != exclude]
+                distances = self._distances(X, leaf, query)
+                n_evaluations += len(distances)
+
+                for d, index in zip(distances, leaf):
+                    add(d, index)
+            else:
+                if vantage == exclude:
+                    # The query is the vantage point itself
+                    d = 0.
+                else:
+                    d = self._distances(X, [vantage], query)[0]
+                    n_evaluations += 1
+
+                    add(d, vantage)
+
+                inside_bound = max(d - threshold, 0)
+                outside_bound = max(threshold - d, 0)
+
+                # The nearest subtree is explored first
+                if inside_bound <= outside_bound:
+                    stack.append((outside, outside_bound))
+                    stack.append((inside, inside_bound))
+                else:
+                    stack.append((inside, inside_bound))
+                    stack.append((outside, outside_bound))
+
+            if n_neighbors is not None and len(heap) == n_neighbors:
+                bound = -heap[0][0]
+
+        result = sorted((-d, -i) for d, i in heap)
+        distances = np.array([d for d, _ in result])
+        indexes = np.array([i for _, i in result], dtype=int)
+
+        return distances, indexes, n_evaluations
@@ -1,10 +1,13 @@
 from . import constants
 
+from ._lazy import _lazy_submodules
+
 from ._utils import (_tuple_of_arrays, _cartesian_product,
                      _check_estimator, _int_to_real,
                      _to_grid, check_is_univariate,
                      _same_domain, _to_array_maybe_ragged,
                      _reshape_eval_points,
-                     _evaluate_grid, nquad_vec,
+                     _evaluate_grid, nquad_gauss,
+                     _group_reduce,
                      _FDataCallable, _pairwise_commutative,
                      _domain_range, _check_array_key)
@@ -0,0 +1,41 @@
+"""Lazy import of submodules."""
+
+import importlib
+import sys
+
+
+def _lazy_submodules(package_name, submodules):
+    """
+    Import the submodules of a package the first time they are accessed.
+
+    This returns the module level ``__getattr__`` and ``__dir__`` functions
+    defined in PEP 562, that must be assigned in the ``__init__.py`` of the
+    package. In Python versions without PEP 562 support, the submodules
+    are imported eagerly instead.
+
+    Args:
+        package_name (str): Name of the package, usually ``__name__``.
+        submodules (iterable of str): Names of the submodules to import
+            lazily.
+
+    Returns:
+        (tuple): Tuple with the functions ``__getattr__`` and ``__dir__``.
+
+    """
+    submodules = frozenset(submodules)
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module(f"{package_name}.{name}")
+
+        raise AttributeError(
+            f"module {package_name!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | submodules)
+
+    if sys.version_info < (3, 7):
+        for name in sorted(submodules):
+            importlib.import_module(f"{package_name}.{name}")
+
+    return __getattr__, __dir__
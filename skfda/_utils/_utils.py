@@ -1,9 +1,9 @@
 """Module with generic methods"""
 
 from builtins import getattr
-import functools
 import numbers
 import types
+import warnings
 
 from pandas.api.indexers import check_array_indexer
 import scipy.integrate
@@ -367,20 +367,154 @@ def _evaluate_grid(axes, *, evaluate_method,
     return res
 
 
-def nquad_vec(func, ranges):
+def _gauss_legendre_cells(cells, orders):
+    """
+    Tensor-product Gauss-Legendre nodes and weights in a set of boxes.
+
+    Args:
+        cells (np.ndarray): Array with shape ``n_cells x dim x 2`` with the
+            bounds of each box.
+        orders (sequence of int): Number of nodes in each dimension.
+
+    Returns:
+        (tuple): Tuple with the nodes, with shape
+        ``n_cells x n_nodes x dim``, and the weights, with shape
+        ``n_cells x n_nodes``.
+
+    """
+    n_cells, dim = cells.shape[:2]
+    half_width = (cells[..., 1] - cells[..., 0]) / 2
+    center = (cells[..., 1] + cells[..., 0]) / 2
 
-    initial_depth = len(ranges) - 1
+    axes = []
+    weights = np.ones((n_cells, 1))
+
+    for i, order in enumerate(orders):
+        nodes_1d, weights_1d = np.polynomial.legendre.leggauss(order)
+
+        axes.append(center[:, i, np.newaxis]
+                    + half_width[:, i, np.newaxis] * nodes_1d)
+        weights = (weights[..., np.newaxis]
+                   * half_width[:, i, np.newaxis, np.newaxis]
+                   * weights_1d).reshape(n_cells, -1)
+
+    nodes = np.stack(np.broadcast_arrays(*[
+        a.reshape((n_cells,) + (1,) * i + (-1,) + (1,) * (dim - i - 1))
+        for i, a in enumerate(axes)]), axis=-1).reshape(n_cells, -1, dim)
+
+    return nodes, weights
+
+
+def nquad_gauss(func, ranges, *, order=10, epsabs=1e-200, epsrel=1e-8,
+                limit=1000):
+    """
+    Integrate a vectorized function over a box with Gauss-Legendre rules.
 
-    def integrate(*args, depth):
+    The integral in each box is computed with a tensor-product
+    Gauss-Legendre rule of the given order. Its error along each dimension
+    is estimated comparing it with the rule that uses half the nodes in that
+    dimension. The boxes whose error exceeds their share of the tolerance
+    are split in halves along the dimension with the largest error, and
+    integrated again. In each iteration the function is evaluated only once,
+    at the nodes of all the boxes being refined.
 
-        if depth == 0:
-            f = functools.partial(func, *args)
+    Args:
+        func (callable): Function to integrate. It receives an array of
+            points with shape ``n_points x dim`` and must return an array
+            whose first axis corresponds to the points.
+        ranges (sequence): Bounds of the integration interval in each
+            dimension.
+        order (int, optional): Number of nodes per dimension of the
+            quadrature rule. Defaults to 10.
+        epsabs (float, optional): Absolute tolerance. Defaults to 1e-200.
+        epsrel (float, optional): Relative tolerance. Defaults to 1e-8.
+        limit (int, optional): Maximum number of boxes. Defaults to 1000.
+
+    Returns:
+        (tuple): Tuple with the value of the integral and the estimation of
+        its (absolute) error, using the max norm for vector valued
+        integrands.
+
+    Examples:
+
+        >>> from skfda._utils import nquad_gauss
+        >>> integral, error = nquad_gauss(
+        ...     lambda x: x[:, 0] * x[:, 1]**2, [(0, 1), (0, 3)])
+        >>> integral.round(6)
+        4.5
+
+    """
+    cells = np.asarray(ranges, dtype=float).reshape(1, -1, 2)
+    dim = cells.shape[1]
+    total_volume = np.prod(cells[0, :, 1] - cells[0, :, 0])
+
+    # The full rule and, for each dimension, the rule with half the nodes
+    # in that dimension
+    rules_orders = [[order] * dim] + [
+        [max(order // 2, 1) if i == j else order for i in range(dim)]
+        for j in range(dim)]
+
+    integral = 0
+    error = 0
+    n_cells = 1
+
+    while len(cells) > 0:
+        rules = [_gauss_legendre_cells(cells, orders)
+                 for orders in rules_orders]
+
+        values = np.asarray(func(np.concatenate(
+            [nodes.reshape(-1, dim) for nodes, _ in rules])))
+
+        rules_integrals = []
+        start = 0
+        for nodes, weights in rules:
+            end = start + nodes.shape[0] * nodes.shape[1]
+            rule_values = values[start:end].reshape(
+                nodes.shape[:2] + values.shape[1:])
+            rules_integrals.append(
+                np.einsum('ij,ij...->i...', weights, rule_values))
+            start = end
+
+        cells_integral = rules_integrals[0]
+
+        # Shape n_cells x dim
+        axis_error = np.stack([
+            np.abs(cells_integral - reduced).reshape(
+                len(cells), -1).max(axis=1, initial=0)
+            for reduced in rules_integrals[1:]], axis=1)
+        cells_error = np.sum(axis_error, axis=1)
+
+        estimate = integral + np.sum(cells_integral, axis=0)
+        tolerance = max(epsabs, epsrel * np.max(np.abs(estimate), initial=0))
+
+        volume = np.prod(cells[..., 1] - cells[..., 0], axis=1)
+        converged = cells_error <= tolerance * volume / total_volume
+
+        n_new_cells = np.sum(~converged)
+        if n_cells + n_new_cells > limit:
+            warnings.warn("The maximum number of subdivisions has been "
+                          "reached", scipy.integrate.IntegrationWarning)
+            converged[:] = True
         else:
-            f = functools.partial(integrate, *args, depth=depth - 1)
+            n_cells += n_new_cells
+
+        integral = integral + np.sum(cells_integral[converged], axis=0)
+        error = error + np.sum(cells_error[converged])
 
-        return scipy.integrate.quad_vec(f, *ranges[initial_depth - depth])[0]
+        # Split the remaining boxes along the dimension with larger error
+        cells = cells[~converged]
+        split_axis = np.argmax(axis_error[~converged], axis=1)
+        index = np.arange(len(cells))
+        middle = np.mean(cells[index, split_axis], axis=-1)
 
-    return integrate(depth=initial_depth)
+        lower_cells = cells.copy()
+        lower_cells[index, split_axis, 1] = middle
+        upper_cells = cells.copy()
+        upper_cells[index, split_axis, 0] = middle
+
+        cells = np.concatenate((lower_cells, upper_cells))
+
+    return integral, error
 
 
 def _pairwise_commutative(function, arg1, arg2=None, **kwargs):
@@ -416,6 +550,122 @@ def _pairwise_commutative(function, arg1, arg2=None, **kwargs):
                 (len(arg1), len(arg2)))
 
 
+def _reduceat(ufunc, array, starts):
+    """
+    Apply ``ufunc.reduceat`` along the first axis, allowing no groups.
+
+    """
+    if len(starts) == 0:
+        return np.empty((0,) + array.shape[1:], dtype=array.dtype)
+
+    return ufunc.reduceat(array, starts, axis=0)
+
+
+def _group_reduce(array, group_codes, how, *, n_groups=None,
+                  skipna=False, min_count=0, ddof=0):
+    """
+    Reduce the rows of an array by groups.
+
+    All the groups are reduced in one pass: the rows are sorted by their
+    group code and each contiguous block is accumulated with
+    ``ufunc.reduceat``.
+
+    Args:
+        array (array_like): Array whose first axis corresponds to the
+            samples.
+        group_codes (array_like): Integer code of the group of each sample.
+            Samples with negative codes do not belong to any group and are
+            ignored.
+        how (str): Reduction to apply. One of ``'sum'``, ``'mean'``,
+            ``'var'``, ``'min'`` or ``'max'``.
+        n_groups (int, optional): Number of groups. By default it is the
+            maximum code plus one.
+        skipna (bool, optional): Whether to ignore the NaN values.
+        min_count (int, optional): Minimum number of valid values required
+            to compute the reduction. If there are fewer, the result is NaN.
+        ddof (int, optional): Delta degrees of freedom used in the variance.
+
+    Returns:
+        (np.ndarray): Array with shape ``(n_groups,) + array.shape[1:]``
+        containing the reduction of each group.
+
+    """
+    if how not in ('sum', 'mean', 'var', 'min', 'max'):
+        raise ValueError(f"Invalid reduction: {how}")
+
+    array = np.asarray(array)
+    group_codes = np.asarray(group_codes, dtype=np.intp)
+
+    if group_codes.shape != (len(array),):
+        raise ValueError("There must be a group code for each sample.")
+
+    if n_groups is None:
+        n_groups = np.max(group_codes, initial=-1) + 1
+
+    if np.any(group_codes >= n_groups):
+        raise ValueError("The group codes must be lower than n_groups.")
+
+    values = _int_to_real(array.reshape(len(array), -1))
+
+    order = np.argsort(group_codes, kind='stable')
+    sorted_codes = group_codes[order]
+    first_valid = np.searchsorted(sorted_codes, 0)
+    sorted_codes = sorted_codes[first_valid:]
+    values = values[order[first_valid:]]
+
+    groups, starts = np.unique(sorted_codes, return_index=True)
+
+    nan_mask = np.isnan(values)
+
+    if skipna:
+        count = _reduceat(np.add, (~nan_mask).astype(np.intp), starts)
+    else:
+        sizes = np.diff(np.append(starts, len(values)))
+        count = np.broadcast_to(sizes[:, np.newaxis],
+                                (len(groups), values.shape[1]))
+
+    if how in ('min', 'max'):
+        ufunc, fill = ((np.minimum, np.inf) if how == 'min'
+                       else (np.maximum, -np.inf))
+        if skipna:
+            values = np.where(nan_mask, fill, values)
+        reduction = _reduceat(ufunc, values, starts)
+        empty_value = np.nan
+    else:
+        if skipna:
+            values = np.where(nan_mask, 0, values)
+        reduction = _reduceat(np.add, values, starts)
+        empty_value = 0 if how == 'sum' else np.nan
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if how != 'sum':
+                reduction = reduction / count
+
+            if how == 'var':
+                centered = values - reduction[np.searchsorted(groups,
+                                                              sorted_codes)]
+                if skipna:
+                    centered[nan_mask] = 0
+
+                squares = _reduceat(np.add, centered**2, starts)
+                dof = count - ddof
+                reduction = np.where(dof > 0, squares / dof, np.nan)
+
+    res = np.full((n_groups, values.shape[1]), fill_value=empty_value,
+                  dtype=reduction.dtype)
+    res_count = np.zeros((n_groups, values.shape[1]), dtype=np.intp)
+    res[groups] = reduction
+    res_count[groups] = count
+
+    if how in ('min', 'max'):
+        res[res_count == 0] = np.nan
+
+    if min_count > 0:
+        res[res_count < min_count] = np.nan
+
+    return res.reshape((n_groups,) + array.shape[1:])
+
+
 def _int_to_real(array):
     """
     Convert integer arrays to floating point.
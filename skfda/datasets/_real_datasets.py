@@ -1,4 +1,3 @@
-import rdata
 import warnings
 
 from sklearn.utils import Bunch
@@ -69,6 +68,8 @@ def fetch_cran(name, package_name, *, converter=None,
         package_name: Name of the R package containing the dataset.
 
     """
+    import rdata
+
     repositories = _get_skdatasets_repositories()
 
     if converter is None:
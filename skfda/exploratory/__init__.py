@@ -1,4 +1,4 @@
-from . import depth
-from . import outliers
-from . import stats
-from . import visualization
+from .._utils import _lazy_submodules
+
+__getattr__, __dir__ = _lazy_submodules(
+    __name__, ["depth", "outliers", "stats", "visualization"])
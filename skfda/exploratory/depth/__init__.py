@@ -2,4 +2,5 @@ from . import multivariate
 from ._depth import (IntegratedDepth,
                      ModifiedBandDepth,
                      BandDepth)
+from ._depth_result import DepthResult
 from .multivariate import Depth, Outlyingness, OutlyingnessBasedDepth
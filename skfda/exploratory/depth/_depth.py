@@ -3,7 +3,7 @@
 This module includes different methods to order functional data,
 from the center (larger values) outwards(smaller ones)."""
 
-import itertools
+from sklearn.utils import gen_batches, get_chunk_n_rows
 
 import scipy.integrate
 
@@ -17,10 +17,123 @@ __author__ = "Amanda Hernando Bernabé"
 __email__ = "amanda.hernando@estudiante.uam.es"
 
 
+def _pattern_keys(bits):
+    """Exact integer keys of the rows of a boolean matrix.
+
+    The bits of each row are packed in unsigned 64-bit words, so that two
+    rows are equal if and only if their keys are equal.
+
+    """
+    packed = np.packbits(bits, axis=1)
+    packed = np.pad(packed, ((0, 0), (0, -packed.shape[1] % 8)))
+
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def _group_ids(keys):
+    """Consecutive integer identifier of the distinct rows of keys."""
+    order = np.lexsort(keys.T[::-1])
+    sorted_keys = keys[order]
+
+    new_group = np.ones(len(keys), dtype=bool)
+    new_group[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+
+    ids = np.empty(len(keys), dtype=int)
+    ids[order] = np.cumsum(new_group) - 1
+
+    return ids
+
+
+def _n_bands_containing(distribution, x):
+    """Number of bands of two curves of the distribution containing x.
+
+    The band of two curves contains x if, at no point, both curves are
+    above x or both are below it. The curves with the same pattern of
+    points above and below x are counted together. The curves coinciding
+    with x at every point are in a band with any other curve. The band of
+    two curves that do not coincide with x at any point contains it if one
+    is above x exactly where the other one is below it, so the pairs of
+    complementary patterns are found by sorting them. The remaining
+    patterns, with some but not all points coinciding with x, are compared
+    with the others with bitwise operations on the packed patterns.
+
+    Args:
+        distribution (numpy.ndarray): Matrix with the values of each curve
+            of the distribution at the points of the grid.
+        x (numpy.ndarray): Values of the curve at the points of the grid.
+
+    Returns:
+        (int): Number of bands containing the curve.
+
+    """
+    n_samples = len(distribution)
+    above = distribution > x
+    below = distribution < x
+
+    # The points where every curve coincides with x do not matter
+    relevant = np.any(above | below, axis=0)
+    if not np.all(relevant):
+        above = above[:, relevant]
+        below = below[:, relevant]
+
+    if above.shape[1] == 0:
+        return n_samples * (n_samples - 1) // 2
+
+    above_keys = _pattern_keys(above)
+    below_keys = _pattern_keys(below)
+    ids = _group_ids(np.concatenate((above_keys, below_keys), axis=1))
+    counts = np.bincount(ids)
+    first = np.empty(len(counts), dtype=int)
+    first[ids[::-1]] = np.arange(n_samples)[::-1]
+    above_keys, below_keys = above_keys[first], below_keys[first]
+
+    n_ties = np.count_nonzero(~(above[first] | below[first]), axis=1)
+    zero = n_ties == above.shape[1]
+    exact = n_ties == 0
+    partial = ~(zero | exact)
+
+    n_zero = np.sum(counts[zero])
+    n_bands = n_zero * (n_samples - n_zero) + n_zero * (n_zero - 1) // 2
+
+    exact_counts = counts[exact]
+    n_exact = len(exact_counts)
+
+    exact_ids = _group_ids(np.concatenate((above_keys[exact],
+                                           below_keys[exact])))
+    group_counts = np.bincount(exact_ids[:n_exact], weights=exact_counts,
+                               minlength=2 * n_exact)
+
+    # Each pair is found from both curves
+    n_pairs = np.sum(exact_counts * group_counts[exact_ids[n_exact:]]) / 2
+
+    partial_above, partial_below = above_keys[partial], below_keys[partial]
+    partial_counts = counts[partial]
+    others = exact | partial
+    others_above, others_below = above_keys[others], below_keys[others]
+    # The pairs of partial patterns are also found from both of them
+    others_weights = np.where(partial[others], 1 / 2, 1) * counts[others]
+
+    # The packed patterns are compared in blocks of rows
+    n_rows = max(1, 2 ** 20 // (others_above.size + 1))
+    for block in gen_batches(len(partial_counts), n_rows):
+        conflicts = np.any(
+            (partial_above[block, np.newaxis] & others_above)
+            | (partial_below[block, np.newaxis] & others_below), axis=-1)
+        n_pairs += np.sum(partial_counts[block]
+                          * (~conflicts @ others_weights))
+
+    return n_bands + int(round(n_pairs))
+
+    return n_bands
+
+
 class IntegratedDepth(Depth):
     r"""
     Functional depth as the integral of a multivariate depth.
 
+    The samples are evaluated in blocks, whose intermediate arrays fit in
+    ``working_memory``, and the blocks can be evaluated in parallel threads.
+
     Args:
         multivariate_depth (Depth): Multivariate depth to integrate.
             By default it is the one used by Fraiman and Muniz, that is,
@@ -28,6 +141,15 @@ class IntegratedDepth(Depth):
             .. math::
                 D(x) = 1 - \left\lvert \frac{1}{2}- F(x)\right\rvert
 
+        working_memory (int, optional): Maximum memory, in MiB, of the
+            temporary arrays used to evaluate a block of samples. Defaults
+            to the value of ``working_memory`` in
+            :func:`sklearn.get_config`.
+        n_jobs (int or None, optional): The number of threads evaluating
+            the blocks. ``None`` means 1 unless in a
+            :obj:`joblib.parallel_backend` context. ``-1`` means using all
+            processors.
+
     Examples:
 
         >>> import skfda
@@ -51,8 +173,11 @@ class IntegratedDepth(Depth):
     """
 
     def __init__(self, *,
-                 multivariate_depth=multivariate._UnivariateFraimanMuniz()):
+                 multivariate_depth=multivariate._UnivariateFraimanMuniz(),
+                 working_memory=None, n_jobs=None):
         self.multivariate_depth = multivariate_depth
+        self.working_memory = working_memory
+        self.n_jobs = n_jobs
 
     def fit(self, X, y=None):
 
@@ -61,12 +186,9 @@ class IntegratedDepth(Depth):
         self.multivariate_depth.fit(X.data_matrix)
         return self
 
-    def predict(self, X):
-
-        pointwise_depth = self.multivariate_depth.predict(X.data_matrix)
-
-        interval_len = (self._domain_range[0][1]
-                        - self._domain_range[0][0])
+    def _predict_block(self, X, data_matrix):
+        """Depth of the samples of X with the given data matrix."""
+        pointwise_depth = self.multivariate_depth.predict(data_matrix)
 
         integrand = pointwise_depth
 
@@ -79,6 +201,26 @@ class IntegratedDepth(Depth):
 
         return integrand
 
+    def predict(self, X):
+        from joblib import Parallel, delayed
+
+        # The multivariate depths use a few temporary arrays with the size
+        # of the data matrix of the samples
+        row_bytes = 8 * X.data_matrix[0].size * 4
+        n_rows = get_chunk_n_rows(row_bytes=row_bytes,
+                                  max_n_rows=X.n_samples,
+                                  working_memory=self.working_memory)
+        blocks = list(gen_batches(X.n_samples, n_rows))
+
+        if len(blocks) == 1:
+            return self._predict_block(X, X.data_matrix)
+
+        depths = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(self._predict_block)(X, X.data_matrix[block])
+            for block in blocks)
+
+        return np.concatenate(depths)
+
     @property
     def max(self):
         return self.multivariate_depth.max
@@ -121,8 +263,9 @@ class ModifiedBandDepth(IntegratedDepth):
         https://doi.org/10.1198/jasa.2009.0108
     """
 
-    def __init__(self):
-        super().__init__(multivariate_depth=multivariate.SimplicialDepth())
+    def __init__(self, *, working_memory=None, n_jobs=None):
+        super().__init__(multivariate_depth=multivariate.SimplicialDepth(),
+                         working_memory=working_memory, n_jobs=n_jobs)
 
 
 class BandDepth(Depth):
@@ -135,6 +278,19 @@ class BandDepth(Depth):
     of curves, surfaces determine the bands. In larger dimensions, the
     hyperplanes determine the bands.
 
+    The bands containing each curve are counted exactly without iterating
+    over the pairs of curves: the band of two curves contains the whole
+    graph if one curve is above it exactly where the other one is below,
+    so the curves are grouped by the points where they are above and below
+    it. The cost for each sample is :math:`O(nm\log n)` for :math:`n`
+    curves observed in :math:`m` points, instead of :math:`O(n^2m)`, and
+    thus :math:`O(n^2m\log n)` to compute the depth of the :math:`n`
+    curves. Repeated curves, and curves coinciding with the sample at
+    every point, do not increase the cost. Only the :math:`u` distinct
+    curves touching the sample at some but not all points are compared
+    with the other distinct curves, adding :math:`O(unm)` bitwise
+    operations on the points packed in 64-bit words.
+
     Examples:
 
         >>> import skfda
@@ -169,20 +325,12 @@ class BandDepth(Depth):
 
     def predict(self, X):
 
-        num_in = 0
-        n_total = 0
-
-        for f1, f2 in itertools.combinations(self._distribution, 2):
-            between_range_1 = (f1.data_matrix <= X.data_matrix) & (
-                X.data_matrix <= f2.data_matrix)
-
-            between_range_2 = (f2.data_matrix <= X.data_matrix) & (
-                X.data_matrix <= f1.data_matrix)
-
-            between_range = between_range_1 | between_range_2
+        n_samples = self._distribution.n_samples
+        distribution = self._distribution.data_matrix.reshape(n_samples, -1)
 
-            num_in += np.all(between_range,
-                             axis=tuple(range(1, X.data_matrix.ndim)))
-            n_total += 1
+        num_in = np.array([
+            _n_bands_containing(distribution, x)
+            for x in X.data_matrix.reshape(X.n_samples, -1)])
+        n_total = n_samples * (n_samples - 1) // 2
 
         return num_in / n_total
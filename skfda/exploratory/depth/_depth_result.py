@@ -0,0 +1,130 @@
+from sklearn.base import clone
+
+import numpy as np
+
+from ._depth import ModifiedBandDepth
+
+
+def _indices_descending_depth(depth, n_samples=None):
+    """Indexes of the deepest samples, in decreasing order of depth.
+
+    The indexes are the first ones of a stable sort of the depths in
+    decreasing order, but the deepest samples are selected with a partition
+    and only they are sorted.
+
+    Args:
+        depth (numpy.ndarray): Depth of each sample.
+        n_samples (int, optional): Number of indexes returned. Defaults to
+            all the samples.
+
+    Returns:
+        (numpy.ndarray): Indexes of the ``n_samples`` deepest samples.
+
+    """
+    if n_samples is None or n_samples >= len(depth):
+        return np.argsort(-depth, kind='stable')
+
+    if n_samples <= 0:
+        return np.empty(0, dtype=int)
+
+    threshold = -np.partition(-depth, n_samples - 1)[n_samples - 1]
+
+    # The ties with the last selected sample are taken in order
+    deeper = np.flatnonzero(depth > threshold)
+    ties = np.flatnonzero(depth == threshold)[:n_samples - len(deeper)]
+    selected = np.sort(np.concatenate((deeper, ties)))
+
+    return selected[np.argsort(-depth[selected], kind='stable')]
+
+
+class DepthResult():
+    r"""Depth of the samples of a dataset, computed only once.
+
+    It can be passed as the depth method of the functions and classes that
+    order the samples of a dataset by their depth, such as
+    :class:`~skfda.exploratory.visualization.Boxplot`,
+    :class:`~skfda.exploratory.outliers.IQROutlierDetector`,
+    :func:`~skfda.exploratory.stats.depth_based_median` or
+    :func:`~skfda.exploratory.stats.trim_mean`, so that they share the same
+    depth computation. When called with the same dataset (the same object)
+    it returns the stored depth. The depth method fitted to the dataset is
+    kept, and used for the depth of other samples with respect to it.
+
+    Pointwise multivariate depths can be shared in the same way, as the
+    ``multivariate_depth`` of
+    :func:`~skfda.exploratory.outliers.directional_outlyingness_stats`, using
+    the data matrix of the dataset.
+
+    Args:
+        X: Dataset whose depth is computed.
+        depth_method (:ref:`depth measure <depth-measures>`, optional):
+            Method used to compute the depth. Defaults to :func:`modified
+            band depth <skfda.exploratory.depth.ModifiedBandDepth>`.
+
+    Attributes:
+        X: Dataset whose depth is computed.
+        depth_method (:ref:`depth measure <depth-measures>`): Method used to
+            compute the depth.
+        depth (numpy.ndarray): Depth of each sample of ``X``.
+        fitted_depth_method (:ref:`depth measure <depth-measures>`): Copy
+            of the depth method fitted to ``X``, or None if it is not an
+            estimator.
+
+    Examples:
+
+        >>> import skfda
+        >>> from skfda.exploratory.depth import DepthResult
+        >>> from skfda.exploratory.stats import depth_based_median, trim_mean
+        >>>
+        >>> data_matrix = [[1, 1, 2, 3, 2.5, 2],
+        ...                [0.5, 0.5, 1, 2, 1.5, 1],
+        ...                [-1, -1, -0.5, 1, 1, 0.5],
+        ...                [-0.5, -0.5, -0.5, -1, -1, -1]]
+        >>> grid_points = [0, 2, 4, 6, 8, 10]
+        >>> fd = skfda.FDataGrid(data_matrix, grid_points)
+        >>> depth = DepthResult(fd)
+        >>> depth.depth
+        array([ 0.5       ,  0.83333333,  0.73333333,  0.66666667])
+        >>> depth_based_median(fd, depth_method=depth).data_matrix[..., 0]
+        array([[ 0.5,  0.5,  1. ,  2. ,  1.5,  1. ]])
+        >>> trim_mean(fd, 0.25, depth_method=depth).data_matrix[..., 0]
+        array([[-0.33333333, -0.33333333,  0.        ,  0.66666667,
+                 0.5       ,  0.16666667]])
+
+    """
+
+    def __init__(self, X, depth_method=ModifiedBandDepth()):
+        self.X = X
+        self.depth_method = depth_method
+        if hasattr(depth_method, 'fit'):
+            self.fitted_depth_method = clone(depth_method).fit(X)
+            self.depth = self.fitted_depth_method.predict(X)
+        else:
+            self.fitted_depth_method = None
+            self.depth = depth_method(X)
+
+    def __call__(self, X, *, distribution=None):
+        """Depth of the samples of X.
+
+        Args:
+            X: Points whose depth is going to be evaluated.
+            distribution: Functional dataset from which the distribution of
+                the data is inferred. If ``None`` it is the same as ``X``.
+
+        Returns:
+            (numpy.ndarray): Depth of each sample, which is the stored one if
+            X is the dataset of this object and the distribution is not
+            another one, and is computed with the fitted depth method if the
+            distribution is that dataset.
+
+        """
+        if X is self.X and (distribution is None or distribution is X):
+            return self.depth
+
+        if distribution is self.X and self.fitted_depth_method is not None:
+            return self.fitted_depth_method.predict(X)
+
+        return self.depth_method(X, distribution=distribution)
+
+    def __repr__(self):
+        return f"DepthResult(depth_method={self.depth_method!r})"
@@ -1,6 +1,7 @@
 import abc
 import math
 from scipy.special import comb
+from sklearn.utils import check_random_state, gen_batches, get_chunk_n_rows
 
 import scipy.stats
 import sklearn
@@ -141,6 +142,379 @@ def _cumulative_distribution(column):
                                  side='right') / len(column)
 
 
+# Tolerance used to decide if points are in general position, or if angles
+# are equal
+_TOLERANCE = 1e-10
+
+
+def _pseudo_angles(x, y):
+    """Increasing function of the angle of the points, faster to compute.
+
+    The values are in :math:`(-2, 2]`, corresponding to the angles in
+    :math:`(-\\pi, \\pi]`, and have the same sign as the angles.
+
+    """
+    with np.errstate(invalid='ignore'):
+        ratio = y / (np.abs(x) + np.abs(y))
+
+    return np.where(x < 0, np.where(y < 0, -2, 2) - ratio, ratio)
+
+
+def _half_plane_counts(x, y, valid):
+    """Number of points in the half-plane to the left of each point.
+
+    The points are sorted by their angle around the origin, breaking ties by
+    their index. For each point, the points after it whose angle is less
+    than the opposite angle of the point (in the counterclockwise order) are
+    counted, using only one sort of the angles and the opposite angles.
+    Angles that differ less than a tolerance are considered tied.
+
+    Args:
+        x (numpy.ndarray): First coordinate of the points, with the points
+            in the last axis.
+        y (numpy.ndarray): Second coordinate of the points.
+        valid (numpy.ndarray): Boolean mask of the points to consider. The
+            count of the other points is 0.
+
+    Returns:
+        (numpy.ndarray): Number of points in the half-plane of each point.
+
+    """
+    n_points = x.shape[-1]
+
+    angles = _pseudo_angles(x, y)
+    # The opposite angles are computed from the opposite points, so that
+    # opposite points have exactly the same value
+    opposite_angles = _pseudo_angles(-x, -y)
+
+    for a in (angles, opposite_angles):
+        a[~valid] = np.inf
+
+    # The opposite angles are placed first, so that in case of ties they are
+    # sorted before the angles
+    merged = np.concatenate((opposite_angles, angles), axis=-1)
+    order = np.argsort(merged, axis=-1, kind='stable')
+
+    # The angles that differ only by rounding errors are tied, and sorted
+    # again where they are present
+    sorted_merged = np.take_along_axis(merged, order, axis=-1)
+    with np.errstate(invalid='ignore'):
+        tied = np.diff(sorted_merged, axis=-1) <= _TOLERANCE
+    has_ties = np.any(tied, axis=-1)
+
+    if np.any(has_ties):
+        tied_values = np.cumsum(np.concatenate(
+            (np.zeros(tied.shape[:-1] + (1,), dtype=int), ~tied), axis=-1),
+            axis=-1)
+        tied_merged = np.empty_like(tied_values)
+        np.put_along_axis(tied_merged, order, tied_values, axis=-1)
+        order[has_ties] = np.argsort(tied_merged[has_ties], axis=-1,
+                                     kind='stable')
+
+    is_angle = order >= n_points
+    n_angles_before = np.cumsum(is_angle, axis=-1) - is_angle
+
+    ranks = np.empty_like(n_angles_before)
+    np.put_along_axis(ranks, order, n_angles_before, axis=-1)
+
+    # The half-plane of the points with positive angle wraps around pi
+    n_valid = np.sum(valid, axis=-1, keepdims=True)
+    counts = (ranks[..., :n_points] - ranks[..., n_points:] - 1
+              + np.where(angles > 0, n_valid, 0))
+
+    return np.where(valid, counts, 0)
+
+
+def _angular_groups(x, y, valid):
+    """Groups of points with the same angle around the origin.
+
+    The angles and the opposite angles of the points are sorted together,
+    and the ones that differ less than a tolerance form a group, as in
+    :func:`_half_plane_counts`. The points in the open half-plane to the
+    left of a group are the ones in the groups between it and its opposite
+    group.
+
+    Args:
+        x (numpy.ndarray): First coordinate of the points, with the points
+            in the last axis.
+        y (numpy.ndarray): Second coordinate of the points.
+        valid (numpy.ndarray): Boolean mask of the points to consider.
+
+    Returns:
+        (tuple): Number of points in the open half-plane to the left of the
+        group of each point, number of points in the group, label of the
+        group (unique along the last axis) and boolean mask of the first
+        point of each group. They are 0 or False for the points not valid.
+
+    """
+    n_points = x.shape[-1]
+
+    def sortable_angles(x, y):
+        angles = _pseudo_angles(x, y)
+        # The angles close to -pi are tied with the ones equal to pi
+        angles[angles < -2 + _TOLERANCE] += 4
+        angles[~valid] = np.inf
+        return angles
+
+    merged = np.concatenate((sortable_angles(-x, -y), sortable_angles(x, y)),
+                            axis=-1)
+    order = np.argsort(merged, axis=-1, kind='stable')
+    sorted_merged = np.take_along_axis(merged, order, axis=-1)
+    del merged
+
+    with np.errstate(invalid='ignore'):
+        new_group = np.diff(sorted_merged, axis=-1) > _TOLERANCE
+    is_angle = (order >= n_points) & np.isfinite(sorted_merged)
+    del sorted_merged
+
+    boundary = np.ones(new_group.shape[:-1] + (1,), dtype=bool)
+    starts = np.concatenate((boundary, new_group), axis=-1)
+    ends = np.concatenate((new_group, boundary), axis=-1)
+    groups = np.cumsum(starts, axis=-1)
+
+    # Number of angles before the start and up to the end of each group
+    n_through = np.cumsum(is_angle, axis=-1)
+    n_before = n_through - is_angle
+    positions = np.arange(2 * n_points)
+    start_positions = np.maximum.accumulate(
+        np.where(starts, positions, 0), axis=-1)
+    end_positions = np.minimum.accumulate(
+        np.where(ends, positions, 2 * n_points)[..., ::-1], axis=-1)[..., ::-1]
+    first = is_angle & (n_before == np.take_along_axis(
+        n_before, start_positions, axis=-1))
+    n_before = np.take_along_axis(n_before, start_positions, axis=-1)
+    n_through = np.take_along_axis(n_through, end_positions, axis=-1)
+
+    def unsort(values):
+        result = np.empty_like(values)
+        np.put_along_axis(result, order, values, axis=-1)
+        return result
+
+    groups, n_before, n_through, first = (
+        unsort(groups), unsort(n_before), unsort(n_through), unsort(first))
+
+    # The half-plane of the groups after their opposite wraps around pi
+    n_valid = np.sum(valid, axis=-1, keepdims=True)
+    opposite_groups = groups[..., :n_points]
+    groups = groups[..., n_points:]
+    n_left = (n_before[..., :n_points] - n_through[..., n_points:]
+              + np.where(opposite_groups < groups, n_valid, 0))
+    n_left[opposite_groups == groups] = 0
+    sizes = n_through[..., n_points:] - n_before[..., n_points:]
+
+    return (np.where(valid, n_left, 0), np.where(valid, sizes, 0),
+            groups, first[..., n_points:] & valid)
+
+
+def _n_pairs(counts):
+    return counts * (counts - 1) // 2
+
+
+def _n_triples(counts):
+    return _n_pairs(counts) * (counts - 2) // 3
+
+
+def _n_simplices_containing_2d(diff):
+    """Number of triangles containing the origin.
+
+    A closed triangle does not contain the origin if and only if its
+    vertices lie in an open half-plane through the origin. Each of these
+    triangles is counted once, from its first vertex in the angular order
+    (Rousseeuw and Ruts, 1996).
+
+    Args:
+        diff (numpy.ndarray): Array with shape (n_queries, n_points, 2) with
+            the points, centered in each query point.
+
+    Returns:
+        (numpy.ndarray): Number of triangles with vertices in the points
+        containing each query point.
+
+    """
+    valid = np.any(diff != 0, axis=-1)
+    counts = _half_plane_counts(diff[..., 0], diff[..., 1], valid)
+
+    return comb(diff.shape[-2], 3) - np.sum(_n_pairs(counts), axis=-1)
+
+
+# Fixed directions in general position, defining the height in the sphere
+_HEIGHT_DIRECTIONS = np.array([[1, np.sqrt(2), np.pi],
+                               [np.sqrt(3), -np.e, 1],
+                               [-np.sqrt(5), 1, np.sqrt(7)],
+                               [np.pi, np.e, -np.sqrt(2)]])
+_HEIGHT_DIRECTIONS /= np.linalg.norm(_HEIGHT_DIRECTIONS, axis=-1,
+                                     keepdims=True)
+
+
+def _height_directions():
+    """Directions for the height, first the fixed ones and then random."""
+    yield from _HEIGHT_DIRECTIONS
+
+    random_state = np.random.RandomState(0)
+    while True:
+        direction = random_state.normal(size=3)
+        yield direction / np.linalg.norm(direction)
+
+
+def _n_in_hemispheres(directions, gram, projected, n_codirectional,
+                      n_left, sizes, groups, first, height_direction):
+    """Number of sets of four directions in an open hemisphere.
+
+    The open region of the normals of the hemispheres containing four
+    directions is a convex spherical polygon, bounded by the great circles
+    orthogonal to the directions, with Euler characteristic 1 if it is not
+    empty. The sets are counted adding the critical points of the height in
+    their polygons: its minimum and maximum in the sphere, the minimums and
+    maximums in the great circles in which the height increases towards the
+    polygon, and the vertices that are local minimums. The parallel
+    directions define the same great circle, and are ordered by index. The
+    great circles through a vertex are grouped by the angle of their
+    directions around it.
+
+    Args:
+        directions (numpy.ndarray): Array with shape (n_queries, n_points,
+            3) with the unit directions, or zero for the points equal to the
+            query.
+        gram (numpy.ndarray): Products of the directions.
+        projected (numpy.ndarray): Mask of the pairs of non parallel
+            directions.
+        n_codirectional (numpy.ndarray): Number of equal directions after
+            each one.
+        n_left, sizes, groups, first (numpy.ndarray): Groups of the
+            directions around each direction, from :func:`_angular_groups`.
+        height_direction (numpy.ndarray): Direction defining the height.
+
+    Returns:
+        (tuple): Number of sets in an open hemisphere, and mask of the
+        queries for which the height has critical points out of the
+        vertices of the great circles, for which it is not valid.
+
+    """
+    heights = directions @ height_direction
+
+    # The direction k is in the open hemisphere of the maximum of the height
+    # in the great circle orthogonal to the direction j if the slope is
+    # positive, and in the one of the minimum if it is negative
+    slopes = heights[..., np.newaxis, :] - heights[..., np.newaxis] * gram
+
+    degenerate = (
+        np.any((np.abs(heights) < _TOLERANCE) & np.any(directions, axis=-1),
+               axis=-1)
+        | np.any(projected & (np.abs(slopes) < _TOLERANCE), axis=(-2, -1)))
+
+    # Minimum and maximum of the height in the sphere
+    n_hemisphere = (comb(np.sum(heights < 0, axis=-1), 4)
+                    + comb(np.sum(heights > 0, axis=-1), 4))
+
+    # Minimum and maximum in the great circles in which the height increases
+    # towards the polygon
+    n_below = np.sum(projected & (slopes < 0), axis=-1) + n_codirectional
+    n_above = np.sum(projected & (slopes > 0), axis=-1) + n_codirectional
+    n_hemisphere += np.sum(np.where(
+        heights > 0, _n_triples(n_below) - _n_triples(n_above), 0), axis=-1)
+
+    # Vertices which are local minimums, for each group of great circles
+    # through them in which the height increases from the vertex. The
+    # directions of the group whose circle has the polygon above it are
+    # counted summing by group
+    n_groups = 2 * gram.shape[-1] + 1
+    labels = (groups + n_groups * np.arange(groups.size // groups.shape[-1])
+              .reshape(groups.shape[:-1] + (1,)))
+    below = projected & (np.swapaxes(slopes, -1, -2) < 0)
+    n_group_below = np.bincount(labels.ravel(), weights=below.ravel())
+    n_group_below = n_group_below[labels].astype(int)
+    del labels, below
+
+    codirectional = n_codirectional[..., np.newaxis]
+    n_group_below += codirectional
+    n_group = sizes + codirectional
+    n_hemisphere += np.sum(np.where(
+        first & (slopes > 0),
+        (n_group - n_group_below) * _n_pairs(n_left)
+        + (_n_pairs(n_group) - _n_pairs(n_group_below)) * n_left
+        + _n_triples(n_group) - _n_triples(n_group_below), 0),
+        axis=(-2, -1))
+
+    return n_hemisphere, degenerate
+
+
+def _n_simplices_containing_3d(diff):
+    """Number of tetrahedra containing the origin.
+
+    A closed tetrahedron does not contain the origin if and only if the
+    directions of its vertices lie in an open hemisphere. These sets of
+    directions are counted with :func:`_n_in_hemispheres`, sorting the
+    directions by angle around each direction, so that coplanar directions
+    have tied angles. The height is taken in a fixed direction, and in
+    other directions for the queries in which it is not in general position
+    with respect to the great circles.
+
+    Args:
+        diff (numpy.ndarray): Array with shape (n_queries, n_points, 3) with
+            the points, centered in each query point.
+
+    Returns:
+        (numpy.ndarray): Number of tetrahedra with vertices in the points
+        containing each query point.
+
+    """
+    n_points = diff.shape[-2]
+
+    # The points equal to the query up to rounding errors have no direction
+    norms = np.linalg.norm(diff, axis=-1)
+    valid = norms > _TOLERANCE * np.max(norms, axis=-1, keepdims=True)
+    directions = (np.where(valid[..., np.newaxis], diff, 0)
+                  / np.where(valid, norms, 1)[..., np.newaxis])
+    del norms
+
+    gram = directions @ np.swapaxes(directions, -1, -2)
+
+    # Projections of the directions in an orthonormal basis of the plane
+    # orthogonal to each direction
+    axes = np.eye(3)[np.argmin(np.abs(directions), axis=-1)]
+    first_axis = np.cross(directions, axes)
+    first_axis /= np.where(valid, np.linalg.norm(first_axis, axis=-1),
+                           1)[..., np.newaxis]
+    second_axis = np.cross(directions, first_axis)
+
+    projections_x = first_axis @ np.swapaxes(directions, -1, -2)
+    projections_y = second_axis @ np.swapaxes(directions, -1, -2)
+    projected = (valid[..., np.newaxis, :] & valid[..., np.newaxis]
+                 & ~np.eye(n_points, dtype=bool))
+    parallel = projected & (np.hypot(projections_x, projections_y)
+                            < _TOLERANCE)
+    projected &= ~parallel
+
+    n_codirectional = np.sum(
+        parallel & (gram > 0) & np.triu(np.ones((n_points, n_points),
+                                                dtype=bool), k=1),
+        axis=-1)
+    del parallel
+
+    arrays = (directions, gram, projected, n_codirectional,
+              *_angular_groups(projections_x, projections_y, projected))
+    del projections_x, projections_y
+
+    n_simplices = np.empty(diff.shape[:-2])
+    pending = np.arange(len(n_simplices))
+    for height_direction in _height_directions():
+        n_hemisphere, degenerate = _n_in_hemispheres(*arrays,
+                                                     height_direction)
+        n_simplices[pending] = comb(n_points, 4) - n_hemisphere
+
+        if not np.any(degenerate):
+            return n_simplices
+
+        pending = pending[degenerate]
+        arrays = tuple(a[degenerate] for a in arrays)
+
+
+_n_simplices_containing = {
+    2: _n_simplices_containing_2d,
+    3: _n_simplices_containing_3d,
+}
+
+
 class _UnivariateFraimanMuniz(Depth):
     r"""
     Univariate depth used to compute the Fraiman an Muniz depth.
@@ -182,11 +556,32 @@ class SimplicialDepth(Depth):
     distribution :math:`F` is the probability that a random simplex with its
     :math:`p + 1` points sampled from :math:`F` contains :math:`x`.
 
+    It is implemented for :math:`p \leq 3`, computing the number of
+    simplices containing each point without enumerating them. In one
+    dimension, the points below and above are counted with a binary search.
+    In two dimensions, the triangles not containing the point are counted
+    sorting the other points by angle, in :math:`O(n \log n)` time for each
+    point. In three dimensions, the tetrahedra not containing the point are
+    counted sorting the other points by angle around each of them, in
+    :math:`O(n^2 \log n)` time. The repeated points and the points in a
+    line or a plane with the point have tied angles, and are counted in
+    groups, without enumerating the tetrahedra. When the points have more
+    than one dimension, the data is processed in blocks whose temporary
+    arrays fit in the ``working_memory`` of :func:`sklearn.get_config`.
+
     References:
 
         Liu, R. Y. (1990). On a Notion of Data Depth Based on Random
         Simplices. The Annals of Statistics, 18(1), 405–414.
 
+        Rousseeuw, P. J., & Ruts, I. (1996). Algorithm AS 307: Bivariate
+        location depth. Journal of the Royal Statistical Society. Series C
+        (Applied Statistics), 45(4), 516–526.
+
+        Cheng, A. Y., & Ouyang, M. (2001). On algorithms for simplicial
+        depth. In Proceedings of the 13th Canadian Conference on
+        Computational Geometry (pp. 53–56).
+
 
     """
 
@@ -195,40 +590,81 @@ class SimplicialDepth(Depth):
 
         if self._dim == 1:
             self.sorted_values = np.sort(X, axis=0)
+        elif self._dim in _n_simplices_containing:
+            self._points = np.asarray(X)
         else:
             raise NotImplementedError("SimplicialDepth is currently only "
-                                      "implemented for one-dimensional data.")
+                                      "implemented for data with dimension "
+                                      "up to 3.")
 
         return self
 
+    def _predict_multivariate(self, X):
+        """Depth of multidimensional points, each point of the grid apart."""
+        n_samples = len(self._points)
+
+        # The last two axes are the samples and their coordinates
+        points = np.moveaxis(self._points, 0, -2)
+        points = points.reshape(-1, n_samples, self._dim)
+        X = np.moveaxis(X, 0, -2)
+        shape = X.shape[:-1]
+        X = X.reshape(len(points), -1, self._dim)
+        n_queries = X.shape[1]
+
+        # The temporary arrays, including the differences and the sorting of
+        # the angles, take less than 24 floats for each point, or pair of
+        # points in three dimensions, for each query
+        n_rows = get_chunk_n_rows(
+            row_bytes=8 * 24 * n_samples ** (self._dim - 1),
+            max_n_rows=len(points) * n_queries)
+
+        n_simplices = np.empty(len(points) * n_queries)
+        for block in gen_batches(len(n_simplices), n_rows):
+            grid_index, query_index = np.divmod(
+                np.arange(block.start, block.stop), n_queries)
+            diff = (points[grid_index]
+                    - X[grid_index, query_index][:, np.newaxis])
+            n_simplices[block] = _n_simplices_containing[self._dim](diff)
+
+        depth = n_simplices / comb(n_samples, self._dim + 1)
+
+        return np.moveaxis(depth.reshape(shape), -1, 0)
+
     def predict(self, X):
 
         assert self._dim == X.shape[-1]
 
-        if self._dim == 1:
-            positions_left = _searchsorted_ordered(
-                np.moveaxis(self.sorted_values, 0, -1),
-                np.moveaxis(X, 0, -1))
+        if self._dim > 1:
+            return self._predict_multivariate(X)
+
+        positions_left = _searchsorted_ordered(
+            np.moveaxis(self.sorted_values, 0, -1),
+            np.moveaxis(X, 0, -1))
 
-            positions_left = np.moveaxis(positions_left, -1, 0)[..., 0]
+        positions_left = np.moveaxis(positions_left, -1, 0)[..., 0]
 
-            positions_right = _searchsorted_ordered(
-                np.moveaxis(self.sorted_values, 0, -1),
-                np.moveaxis(X, 0, -1), side='right')
+        positions_right = _searchsorted_ordered(
+            np.moveaxis(self.sorted_values, 0, -1),
+            np.moveaxis(X, 0, -1), side='right')
 
-            positions_right = np.moveaxis(positions_right, -1, 0)[..., 0]
+        positions_right = np.moveaxis(positions_right, -1, 0)[..., 0]
 
-            num_strictly_below = positions_left
-            num_strictly_above = len(self.sorted_values) - positions_right
+        num_strictly_below = positions_left
+        num_strictly_above = len(self.sorted_values) - positions_right
 
-            total_pairs = comb(len(self.sorted_values), 2)
+        total_pairs = comb(len(self.sorted_values), 2)
 
         return (total_pairs - comb(num_strictly_below, 2)
                 - comb(num_strictly_above, 2)) / total_pairs
 
     @property
     def min(self):
-        return 1 / 2
+        """
+        Minimum of the possibly predicted values. It is 1/2 for univariate
+        data, which is also assumed before fitting, and 0 otherwise.
+
+        """
+        return 1 / 2 if getattr(self, '_dim', 1) == 1 else 0
 
 
 class OutlyingnessBasedDepth(Depth):
@@ -293,6 +729,22 @@ class StahelDonohoOutlyingness(Outlyingness):
     :math:`\text{Med}` is the median and :math:`\text{MAD}` is the
     median absolute deviation.
 
+    In one dimension it is computed exactly. In higher dimensions, the
+    supremum is approximated by the maximum over ``n_projections`` random
+    directions, drawn uniformly in the sphere when the estimator is fitted
+    and reused in the predictions. The data is projected in all the
+    directions with one matrix product, and the median and median absolute
+    deviation of each projection are computed at once. More projections
+    give a better approximation, which never exceeds the supremum, at a
+    higher cost.
+
+    Args:
+        n_projections (int, optional): Number of random directions used in
+            more than one dimension. Defaults to 200.
+        random_state (int, RandomState instance or None, optional): Random
+            state used to draw the directions. Pass an int for reproducible
+            results. Defaults to None.
+
     References:
 
         Zuo, Y., Cui, H., & He, X. (2004). On the Stahel-Donoho
@@ -301,6 +753,10 @@ class StahelDonohoOutlyingness(Outlyingness):
 
     """
 
+    def __init__(self, *, n_projections=200, random_state=None):
+        self.n_projections = n_projections
+        self.random_state = random_state
+
     def fit(self, X, y=None):
 
         dim = X.shape[-1]
@@ -310,7 +766,14 @@ class StahelDonohoOutlyingness(Outlyingness):
             self._scale = scipy.stats.median_abs_deviation(
                 X, axis=0)
         else:
-            raise NotImplementedError("Only implemented for one dimension")
+            random_state = check_random_state(self.random_state)
+            directions = random_state.normal(size=(dim, self.n_projections))
+            self._directions = directions / np.linalg.norm(directions, axis=0)
+
+            projections = X @ self._directions
+            self._location = np.median(projections, axis=0)
+            self._scale = scipy.stats.median_abs_deviation(
+                projections, axis=0)
 
         return self
 
@@ -324,7 +787,9 @@ class StahelDonohoOutlyingness(Outlyingness):
                     self._scale)[..., 0]
 
         else:
-            raise NotImplementedError("Only implemented for one dimension")
+            projections = X @ self._directions
+            return np.max(np.abs(projections - self._location)
+                          / self._scale, axis=-1)
 
     @property
     def max(self):
@@ -338,6 +803,14 @@ class ProjectionDepth(OutlyingnessBasedDepth):
     It is defined as the depth induced by the
     :class:`Stahel-Donoho outlyingness <StahelDonohoOutlyingness>`.
 
+    Args:
+        n_projections (int, optional): Number of random directions used to
+            approximate the outlyingness in more than one dimension.
+            Defaults to 200.
+        random_state (int, RandomState instance or None, optional): Random
+            state used to draw the directions. Pass an int for reproducible
+            results. Defaults to None.
+
     See also:
         :class:`StahelDonohoOutlyingness`: Stahel-Donoho outlyingness.
 
@@ -349,5 +822,8 @@ class ProjectionDepth(OutlyingnessBasedDepth):
 
     """
 
-    def __init__(self):
-        super().__init__(outlyingness=StahelDonohoOutlyingness())
+    def __init__(self, *, n_projections=200, random_state=None):
+        self.n_projections = n_projections
+        self.random_state = random_state
+        super().__init__(outlyingness=StahelDonohoOutlyingness(
+            n_projections=n_projections, random_state=random_state))
@@ -5,12 +5,13 @@ from numpy import linalg as la
 import scipy.integrate
 from scipy.stats import f
 import scipy.stats
-from sklearn.base import BaseEstimator, OutlierMixin
+from sklearn.base import BaseEstimator, OutlierMixin, clone
 from sklearn.covariance import MinCovDet
 
 import numpy as np
 
 from ... import FDataGrid
+from ..depth import DepthResult
 
 
 class DirectionalOutlyingnessStats(typing.NamedTuple):
@@ -86,6 +87,8 @@ def directional_outlyingness_stats(
         multivariate_depth (:ref:`depth measure <depth-measures>`, optional):
             Method used to order the data. Defaults to :func:`projection
             depth <skfda.exploratory.depth.multivariate.ProjectionDepth>`.
+            A :class:`~skfda.exploratory.depth.DepthResult` of the data
+            matrix of ``fdatagrid`` can be used to reuse its depth.
         pointwise_weights (array_like, optional): an array containing the
             weights of each point of discretisation where values have been
             recorded. Defaults to the same weight for each of the points:
@@ -147,6 +150,18 @@ def directional_outlyingness_stats(
         Analysis 131 (2019): 50-65.
 
     """
+    pointwise_weights = _pointwise_weights(fdatagrid, pointwise_weights)
+
+    depth_pointwise = multivariate_depth(fdatagrid.data_matrix)
+    assert depth_pointwise.shape == fdatagrid.data_matrix.shape[:-1]
+
+    return _directional_outlyingness_stats(
+        fdatagrid, depth_pointwise,
+        _pointwise_median(fdatagrid, depth_pointwise), pointwise_weights)
+
+
+def _pointwise_weights(fdatagrid, pointwise_weights):
+    """Check the pointwise weights, or compute the default ones."""
     if fdatagrid.dim_domain > 1:
         raise NotImplementedError("Only support 1 dimension on the domain.")
 
@@ -162,15 +177,29 @@ def directional_outlyingness_stats(
             len(fdatagrid.grid_points[0])) / (
                 fdatagrid.domain_range[0][1] - fdatagrid.domain_range[0][0])
 
-    depth_pointwise = multivariate_depth(fdatagrid.data_matrix)
-    assert depth_pointwise.shape == fdatagrid.data_matrix.shape[:-1]
+    return pointwise_weights
 
-    # Obtaining the pointwise median sample Z, to calculate
-    # v(t) = {X(t) − Z(t)}/|| X(t) − Z(t) ||
+
+def _pointwise_median(fdatagrid, depth_pointwise):
+    """Deepest value of the samples at each point."""
     median_index = np.argmax(depth_pointwise, axis=0)
     pointwise_median = fdatagrid.data_matrix[
         median_index, range(fdatagrid.data_matrix.shape[1])]
     assert pointwise_median.shape == fdatagrid.data_matrix.shape[1:]
+
+    return pointwise_median
+
+
+def _directional_outlyingness_stats(fdatagrid, depth_pointwise,
+                                    pointwise_median, pointwise_weights):
+    """Directional outlyingness given the pointwise depth and median.
+
+    The pointwise depth of the samples and the pointwise median can be
+    computed with respect to another dataset, as a reference sample.
+
+    """
+    # Obtaining the pointwise median sample Z, to calculate
+    # v(t) = {X(t) − Z(t)}/|| X(t) − Z(t) ||
     v = fdatagrid.data_matrix - pointwise_median
     assert v.shape == fdatagrid.data_matrix.shape
     v_norm = la.norm(v, axis=-1, keepdims=True)
@@ -252,10 +281,18 @@ class DirectionalOutlierDetector(BaseEstimator, OutlierMixin):
     :math:`\alpha = 0.993`, which is used in the classical boxplot for
     detecting outliers under a normal distribution.
 
+    The detector can be fitted to a reference sample and then predict
+    whether new batches of samples are outliers with respect to it. The
+    multivariate depth fitted to the reference, its pointwise median, the
+    robust covariance and the cutoff value are kept, so the cost of each
+    prediction only depends on the number of new samples.
+
     Parameters:
         multivariate_depth (:ref:`depth measure <depth-measures>`, optional):
             Method used to order the data. Defaults to :class:`projection
-            depth <fda.depth_measures.multivariate.ProjectionDepth>`.
+            depth <fda.depth_measures.multivariate.ProjectionDepth>`. If it
+            is a callable that cannot be fitted, the depth of new samples is
+            computed passing the fitted data matrix as its ``distribution``.
         pointwise_weights (array_like, optional): an array containing the
             weights of each points of discretisati on where values have
             been recorded.
@@ -295,6 +332,18 @@ class DirectionalOutlierDetector(BaseEstimator, OutlierMixin):
         >>> out_detector.fit_predict(fd)
         array([1, 1, 1, 1])
 
+        A detector fitted to a reference sample predicts whether new
+        samples are outliers with respect to it.
+
+        >>> reference = skfda.datasets.make_gaussian_process(
+        ...     n_samples=100, n_features=20, noise=0.01, random_state=0)
+        >>> out_detector = DirectionalOutlierDetector().fit(reference)
+        >>> new_fd = skfda.datasets.make_gaussian_process(
+        ...     n_samples=3, n_features=20, noise=0.01, random_state=2)
+        >>> new_fd.data_matrix[2] += 5
+        >>> out_detector.predict(new_fd)
+        array([ 1,  1, -1])
+
     References:
         Dai, Wenlin, and Genton, Marc G. "Multivariate functional data
         visualization and outlier detection." Journal of Computational
@@ -320,13 +369,8 @@ class DirectionalOutlierDetector(BaseEstimator, OutlierMixin):
         self.alpha = alpha
         self._force_asymptotic = _force_asymptotic
 
-    def _compute_points(self, X):
-        # The depths of the samples are calculated giving them an ordering.
-        *_, mean_dir_outl, variation_dir_outl = directional_outlyingness_stats(
-            X,
-            multivariate_depth=self.multivariate_depth,
-            pointwise_weights=self.pointwise_weights)
-
+    @staticmethod
+    def _points(mean_dir_outl, variation_dir_outl):
         points = np.concatenate((mean_dir_outl,
                                  variation_dir_outl[:, np.newaxis]), axis=1)
 
@@ -416,14 +460,47 @@ class DirectionalOutlierDetector(BaseEstimator, OutlierMixin):
         else:
             return scaling_list[key], cutoff_list[key]
 
-    def fit_predict(self, X, y=None):
+    def fit(self, X, y=None):
 
         try:
             self.random_state_ = np.random.RandomState(self.random_state)
         except ValueError:
             self.random_state_ = self.random_state
 
-        self.points_ = self._compute_points(X)
+        self.pointwise_weights_ = _pointwise_weights(
+            X, self.pointwise_weights)
+
+        # The pointwise depth fitted to the reference sample and its median
+        # are kept to compute the outlyingness of new samples. The depth
+        # already fitted to the data matrix is reused. The depths that are
+        # plain callables are computed with respect to the stored data
+        # matrix instead.
+        multivariate_depth = self.multivariate_depth
+        self._fit_data_matrix = X.data_matrix
+
+        if (isinstance(multivariate_depth, DepthResult)
+                and multivariate_depth.X is X.data_matrix):
+            self.depth_ = multivariate_depth.fitted_depth_method
+            depth_pointwise = multivariate_depth.depth
+        else:
+            if (isinstance(multivariate_depth, DepthResult)
+                    and multivariate_depth.fitted_depth_method is not None):
+                multivariate_depth = multivariate_depth.depth_method
+
+            if hasattr(multivariate_depth, 'fit'):
+                self.depth_ = clone(multivariate_depth).fit(X.data_matrix)
+                depth_pointwise = self.depth_.predict(X.data_matrix)
+            else:
+                self.depth_ = None
+                depth_pointwise = multivariate_depth(X.data_matrix)
+
+        self.pointwise_median_ = _pointwise_median(X, depth_pointwise)
+
+        *_, mean_dir_outl, variation_dir_outl = (
+            _directional_outlyingness_stats(
+                X, depth_pointwise, self.pointwise_median_,
+                self.pointwise_weights_))
+        self.points_ = self._points(mean_dir_outl, variation_dir_outl)
 
         # The square mahalanobis distances of the samples are
         # calulated using MCD.
@@ -447,7 +524,10 @@ class DirectionalOutlierDetector(BaseEstimator, OutlierMixin):
                 sample_size=X.n_samples,
                 dimension=dimension)
 
-        rmd_2 = self.cov_.mahalanobis(self.points_)
+        return self
+
+    def _predict_points(self, points):
+        rmd_2 = self.cov_.mahalanobis(points)
 
         outliers = self.scaling_ * rmd_2 > self.cutoff_value_
 
@@ -455,3 +535,22 @@ class DirectionalOutlierDetector(BaseEstimator, OutlierMixin):
         predicted = ~outliers + outliers * -1
 
         return predicted
+
+    def predict(self, X):
+        if self.depth_ is None:
+            depth_pointwise = self.multivariate_depth(
+                X.data_matrix, distribution=self._fit_data_matrix)
+        else:
+            depth_pointwise = self.depth_.predict(X.data_matrix)
+
+        *_, mean_dir_outl, variation_dir_outl = (
+            _directional_outlyingness_stats(
+                X, depth_pointwise, self.pointwise_median_,
+                self.pointwise_weights_))
+
+        return self._predict_points(
+            self._points(mean_dir_outl, variation_dir_outl))
+
+    def fit_predict(self, X, y=None):
+
+        return self.fit(X)._predict_points(self.points_)
@@ -1,7 +1,10 @@
+import math
+
 from sklearn.base import BaseEstimator, OutlierMixin
 
 from . import _envelopes
 from ..depth import ModifiedBandDepth
+from ..depth._depth_result import _indices_descending_depth
 
 
 class IQROutlierDetector(BaseEstimator, OutlierMixin):
@@ -12,8 +15,15 @@ class IQROutlierDetector(BaseEstimator, OutlierMixin):
     envelope, given a functional depth measure. This corresponds to the
     points selected as outliers by the functional boxplot.
 
+    The detector can be fitted to a reference sample and then predict
+    whether new batches of samples are outliers with respect to it. Only
+    the non-outlying envelope of the reference is kept, so each new sample
+    is compared pointwise with it, without computing its depth.
+
     Parameters:
-        depth_method (Callable): The functional depth measure used.
+        depth_method (Callable): The functional depth measure used. A
+            :class:`~skfda.exploratory.depth.DepthResult` of the data can
+            be used to reuse its depth.
         factor (float): The number of times the IQR is multiplied.
 
     Example:
@@ -29,6 +39,11 @@ class IQROutlierDetector(BaseEstimator, OutlierMixin):
         >>> out_detector = IQROutlierDetector()
         >>> out_detector.fit_predict(fd)
         array([-1, 1, 1, -1])
+        >>> new_data_matrix = [[0, 0, 0.5, 1.5, 1.5, 1],
+        ...                    [5, 5, 5, 5, 5, 5]]
+        >>> new_fd = skfda.FDataGrid(new_data_matrix, grid_points)
+        >>> out_detector.fit(fd).predict(new_fd)
+        array([ 1, -1])
 
     """
 
@@ -38,7 +53,8 @@ class IQROutlierDetector(BaseEstimator, OutlierMixin):
 
     def fit(self, X, y=None):
         depth = self.depth_method(X)
-        indices_descending_depth = (-depth).argsort(axis=0)
+        indices_descending_depth = _indices_descending_depth(
+            depth, math.ceil(X.n_samples * 0.5))
 
         # Central region and envelope must be computed for outlier detection
         central_region = _envelopes._compute_region(
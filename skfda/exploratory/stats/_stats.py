@@ -1,6 +1,9 @@
 """Functional data descriptive statistics.
 """
+import numpy as np
+
 from ..depth import ModifiedBandDepth
+from ..depth._depth_result import _indices_descending_depth
 
 
 def mean(fdata):
@@ -81,16 +84,17 @@ def depth_based_median(fdatagrid, depth_method=ModifiedBandDepth()):
         depth_method (:ref:`depth measure <depth-measures>`, optional):
                 Method used to order the data. Defaults to :func:`modified
                 band depth <skfda.exploratory.depth.ModifiedBandDepth>`.
+                A :class:`~skfda.exploratory.depth.DepthResult` of the data
+                can be used to reuse its depth.
 
     Returns:
         FDataGrid: object containing the computed depth_based median.
 
     """
     depth = depth_method(fdatagrid)
-    indices_descending_depth = (-depth).argsort(axis=0)
 
     # The median is the deepest curve
-    return fdatagrid[indices_descending_depth[0]]
+    return fdatagrid[np.argmax(depth)]
 
 
 def trim_mean(fdatagrid,
@@ -115,6 +119,8 @@ def trim_mean(fdatagrid,
         depth_method (:ref:`depth measure <depth-measures>`, optional):
             Method used to order the data. Defaults to :func:`modified
             band depth <skfda.exploratory.depth.ModifiedBandDepth>`.
+            A :class:`~skfda.exploratory.depth.DepthResult` of the data can
+            be used to reuse its depth.
 
     Returns:
         FDataGrid: object containing the computed trimmed mean.
@@ -123,10 +129,11 @@ def trim_mean(fdatagrid,
     n_samples_to_keep = (fdatagrid.n_samples -
                          int(fdatagrid.n_samples * proportiontocut))
 
-    # compute the depth of each curve and store the indexes in descending order
+    # compute the depth of each curve and select the deepest ones
     depth = depth_method(fdatagrid)
-    indices_descending_depth = (-depth).argsort(axis=0)
+    indices_descending_depth = _indices_descending_depth(
+        depth, n_samples_to_keep)
 
-    trimmed_curves = fdatagrid[indices_descending_depth[:n_samples_to_keep]]
+    trimmed_curves = fdatagrid[indices_descending_depth]
 
     return trimmed_curves.mean()
@@ -13,6 +13,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from ..depth import ModifiedBandDepth
+from ..depth._depth_result import _indices_descending_depth
 from ..outliers import _envelopes
 from ._utils import (_figure_to_svg, _get_figure_and_axes,
                      _set_figure_layout_for_fdata, _set_labels)
@@ -256,7 +257,9 @@ class Boxplot(FDataBoxplot):
             depth_method (:ref:`depth measure <depth-measures>`, optional):
                 Method used to order the data. Defaults to :func:`modified
                 band depth
-                <skfda.exploratory.depth.ModifiedBandDepth>`.
+                <skfda.exploratory.depth.ModifiedBandDepth>`. A
+                :class:`~skfda.exploratory.depth.DepthResult` of the data
+                can be used to reuse its depth.
             prob (list of float, optional): List with float numbers (in the
                 range from 1 to 0) that indicate which central regions to
                 represent.
@@ -279,8 +282,10 @@ class Boxplot(FDataBoxplot):
 
         self._envelopes = [None] * len(prob)
 
+        # Only the samples of the largest region are sorted
         depth = depth_method(fdatagrid)
-        indices_descending_depth = (-depth).argsort(axis=0)
+        indices_descending_depth = _indices_descending_depth(
+            depth, math.ceil(fdatagrid.n_samples * max(max(prob), 0.5)))
 
         # The median is the deepest curve
         self._median = fdatagrid[indices_descending_depth[0]
@@ -12,7 +12,7 @@ import scipy.integrate
 
 import numpy as np
 
-from .._utils import _same_domain, nquad_vec, _pairwise_commutative
+from .._utils import _same_domain, nquad_gauss, _pairwise_commutative
 from ..representation import FDataGrid, FDataBasis
 from ..representation.basis import Basis
 
@@ -325,8 +325,9 @@ def _inner_product_integrate(arg1, arg2):
                           arg2.domain_range):
         raise ValueError("Domain range for both objects must be equal")
 
-    integral = nquad_vec(
-        lambda *args: arg1([*args])[:, 0, :] * arg2([*args])[:, 0, :],
+    # The integrand is evaluated at all the quadrature nodes at once
+    integral, _ = nquad_gauss(
+        lambda points: np.moveaxis(arg1(points) * arg2(points), 1, 0),
         arg1.domain_range)
 
     return np.sum(integral, axis=-1)
@@ -1,16 +1,12 @@
 import abc
 import numbers
 
-import matplotlib.pyplot as plt
-
 import numpy as np
 import sklearn.gaussian_process.kernels as sklearn_kern
 
-from ..exploratory.visualization._utils import _create_figure, _figure_to_svg
-
 
 def _squared_norms(x, y):
-    return ((x[np.newaxis, :, :] - y[:, np.newaxis, :]) ** 2).sum(2)
+    return ((x[:, np.newaxis, :] - y[np.newaxis, :, :]) ** 2).sum(2)
 
 
 def _transform_to_2d(t):
@@ -61,6 +57,8 @@ class Covariance(abc.ABC):
 
         """
 
+        from ..exploratory.visualization._utils import _create_figure
+
         x = np.linspace(*limits, 1000)
 
         cov_matrix = self(x, x)
@@ -105,6 +103,10 @@ class Covariance(abc.ABC):
         return fr"\(\displaystyle {self._latex_content()}\)"
 
     def _repr_html_(self):
+        import matplotlib.pyplot as plt
+
+        from ..exploratory.visualization._utils import _figure_to_svg
+
         fig = self.heatmap()
         heatmap = _figure_to_svg(fig)
         plt.close(fig)
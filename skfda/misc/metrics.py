@@ -461,6 +461,91 @@ def amplitude_distance(fdata1, fdata2, *, lam=0., eval_points=None,
     return distance
 
 
+def _amplitude_lower_bound(fdata, *, eval_points=None, **kwargs):
+    r"""Embedding whose distances are lower bounds of the amplitude distance.
+
+    Let :math:`q^+` and :math:`q^-` be the positive and negative parts of the
+    SRSF of a function :math:`f`. The action of a warping :math:`\gamma`,
+    :math:`(q \circ \gamma) \sqrt{\dot{\gamma}}`, preserves the sign of
+    :math:`q` and the :math:`\mathbb{L}^2` norm of both parts. As
+    :math:`(a - b)^2 \geq (a^+ - b^+)^2 + (a^- - b^-)^2` pointwise, for any
+    penalty term
+
+    .. math::
+        d_{\lambda}^2(f_i, f_j) \geq (\|q_i^+\| - \|q_j^+\|)^2 +
+        (\|q_i^-\| - \|q_j^-\|)^2.
+
+    The norms of the parts of the SRSF are the square roots of the total
+    increase and decrease of each function, so the bound is computed without
+    aligning the functions.
+
+    Args:
+        fdata (FData): Functional data object.
+        eval_points (array_like, optional): Array with points of evaluation.
+        **kwargs (dict): Additional parameters of the amplitude distance,
+            which do not affect the bound.
+
+    Returns:
+        numpy.ndarray: Array with shape (n_samples, 2), such that the
+        euclidean distance between two of its rows is a lower bound of the
+        amplitude distance between the corresponding samples.
+
+    Examples:
+
+        >>> from skfda.datasets import make_sinusoidal_process
+        >>> fd = make_sinusoidal_process(n_samples=3, random_state=0)
+        >>> embedding = _amplitude_lower_bound(fd)
+        >>> bound = np.linalg.norm(embedding[0] - embedding[1:], axis=1)
+        >>> bool(np.all(bound <= amplitude_distance(fd[[0, 0]], fd[1:])))
+        True
+
+    """
+    if eval_points is not None:
+        fdata = fdata.to_grid(eval_points)
+    elif not isinstance(fdata, FDataGrid):
+        fdata = fdata.to_grid(np.linspace(*fdata.domain_range[0]))
+
+    eval_points_normalized = _normalize_scale(fdata.grid_points[0])
+    fdata = fdata.copy(grid_points=eval_points_normalized,
+                       domain_range=(0, 1))
+
+    srsf = SRSF(initial_value=0).fit_transform(fdata).data_matrix[..., 0]
+
+    parts = np.stack((np.maximum(srsf, 0), np.minimum(srsf, 0)), axis=1)
+
+    return np.sqrt(scipy.integrate.simps(parts ** 2,
+                                         x=eval_points_normalized))
+
+
+def _amplitude_upper_bound(fdata1, fdata2, *, eval_points=None, _check=True,
+                           **kwargs):
+    """Upper bound of the amplitude distance, without alignment.
+
+    The Fisher-Rao distance is the amplitude distance obtained with the
+    identity warping, whose penalty term is zero.
+
+    """
+    return fisher_rao_distance(fdata1, fdata2, eval_points=eval_points,
+                               _check=_check)
+
+
+def _metric_bounds(metric):
+    """Cheap bounds of a metric whose evaluation is expensive.
+
+    Returns:
+        tuple or None: A pair ``(lower_bound, upper_bound)``, where
+        ``lower_bound(fdata, **metric_params)`` returns an embedding of the
+        samples whose euclidean distances are lower bounds of the metric and
+        ``upper_bound(fdata1, fdata2, **metric_params)`` is computed
+        elementwise as the metric. ``None`` if no bounds are known.
+
+    """
+    if metric is amplitude_distance:
+        return _amplitude_lower_bound, _amplitude_upper_bound
+
+    return None
+
+
 def phase_distance(fdata1, fdata2, *, lam=0., eval_points=None, _check=True,
                    **kwargs):
     r"""Compute the phase distance between two functional objects.
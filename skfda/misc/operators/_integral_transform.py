@@ -1,5 +1,6 @@
-import scipy.integrate
+import numpy as np
 
+from ..._utils import nquad_gauss
 from ._operators import Operator
 
 
@@ -21,13 +22,14 @@ class IntegralTransform(Operator):
 
         def evaluate_covariance(points):
 
-            def integral_body(integration_var):
-                return (f(integration_var) *
-                        self.kernel_function(integration_var, points))
+            def integral_body(integration_vars):
+                # Shape n_nodes x n_samples x n_points
+                return (np.moveaxis(f(integration_vars), 1, 0) *
+                        self.kernel_function(
+                            integration_vars, points)[:, np.newaxis, :])
 
-            domain_range = f.domain_range[0]
+            integral, _ = nquad_gauss(integral_body, f.domain_range[:1])
 
-            return scipy.integrate.quad_vec(
-                integral_body, domain_range[0], domain_range[1])[0]
+            return integral[..., np.newaxis]
 
         return evaluate_covariance
@@ -1,5 +1,7 @@
 
 
-from . import kmeans
-from ..._neighbors import NearestNeighbors
-from .kmeans import KMeans, FuzzyCMeans
+from . import hierarchical, kmeans
+from ..._neighbors import (NearestNeighbors, ApproximateNearestNeighbors,
+                           FunctionalNeighborsGraph)
+from .kmeans import KMeans, FuzzyCMeans, MiniBatchKMeans
+from .hierarchical import AgglomerativeClustering
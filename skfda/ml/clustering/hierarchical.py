@@ -0,0 +1,411 @@
+"""Hierarchical clustering."""
+
+import tempfile
+
+from sklearn.base import BaseEstimator, ClusterMixin
+
+import numpy as np
+
+from ..._neighbors.base import _l2_factor, _to_multivariate, _weigh
+from ...misc.metrics import pairwise_distance, lp_distance
+from .kmeans import _l2_distances
+
+
+def _lance_williams(linkage, distances_x, distances_y, distance_xy,
+                    size_x, size_y, sizes):
+    """Distances to the union of two clusters, from the distances to them.
+
+    Args:
+        linkage (str): Linkage criterion.
+        distances_x (numpy.ndarray): Distances of the clusters to the first
+            merged cluster.
+        distances_y (numpy.ndarray): Distances of the clusters to the second
+            merged cluster.
+        distance_xy (float): Distance between the merged clusters.
+        size_x (int): Number of samples of the first merged cluster.
+        size_y (int): Number of samples of the second merged cluster.
+        sizes (numpy.ndarray): Number of samples of the clusters.
+
+    Returns:
+        (numpy.ndarray): Distances of the clusters to the merged one.
+
+    """
+    if linkage == 'single':
+        return np.minimum(distances_x, distances_y)
+
+    if linkage == 'complete':
+        return np.maximum(distances_x, distances_y)
+
+    if linkage == 'average':
+        return ((size_x * distances_x + size_y * distances_y)
+                / (size_x + size_y))
+
+    # Ward
+    total = size_x + size_y + sizes
+    with np.errstate(invalid='ignore'):
+        return np.sqrt(((sizes + size_x) * distances_x ** 2
+                        + (sizes + size_y) * distances_y ** 2
+                        - sizes * distance_xy ** 2) / total)
+
+
+class _CondensedMatrix():
+    """Rows of a symmetric matrix stored as its condensed upper triangle.
+
+    The entry :math:`(i, j)`, with :math:`i < j`, is stored in the position
+    :math:`ni - i(i + 1)/2 + j - i - 1`, as in :func:`scipy.spatial.distance
+    .squareform`, so the part of the row :math:`i` after the diagonal is
+    contiguous.
+
+    """
+
+    def __init__(self, condensed, n_samples, linkage):
+        self.condensed = condensed
+        self.n_samples = n_samples
+        self.linkage = linkage
+        self.sizes = np.ones(n_samples)
+
+        columns = np.arange(n_samples)
+        self._offsets = (n_samples * columns - columns * (columns + 1) // 2
+                         - columns - 1)
+
+    def _indexes(self, i):
+        """Positions of the row i before and after the diagonal."""
+        start = self._offsets[i] + i + 1
+
+        return (self._offsets[:i] + i,
+                slice(start, start + self.n_samples - i - 1))
+
+    def row(self, i):
+        """Row i of the matrix, with infinity in the diagonal."""
+        before, after = self._indexes(i)
+
+        row = np.empty(self.n_samples)
+        row[:i] = self.condensed[before]
+        row[i] = np.inf
+        row[i + 1:] = self.condensed[after]
+
+        return row
+
+    def set_row(self, i, row):
+        """Overwrite the row i of the matrix, except its diagonal."""
+        before, after = self._indexes(i)
+
+        self.condensed[before] = row[:i]
+        self.condensed[after] = row[i + 1:]
+
+    def merge(self, x, y, distance):
+        """Store the union of the clusters x and y in the place of y."""
+        sizes = self.sizes
+
+        self.set_row(y, _lance_williams(
+            self.linkage, self.row(x), self.row(y), distance,
+            sizes[x], sizes[y], sizes))
+
+        sizes[y] += sizes[x]
+
+
+class _WardCentroids():
+    r"""Ward distances between clusters, computed from their centroids.
+
+    The ward distance between two clusters :math:`A` and :math:`B` with
+    centroids :math:`c_A` and :math:`c_B` is
+
+    .. math::
+        \sqrt{\frac{2|A||B|}{|A| + |B|}} \lVert c_A - c_B \rVert,
+
+    the same given by the Lance-Williams update of the euclidean distances,
+    so only the centroids and sizes of the clusters are stored.
+
+    """
+
+    def __init__(self, X):
+        self.centroids = np.array(X, dtype=float)
+        self.sizes = np.ones(len(X))
+
+    def row(self, i):
+        """Distances of the cluster i to the clusters, infinity to itself."""
+        differences = self.centroids - self.centroids[i]
+        sizes = self.sizes
+
+        row = np.sqrt(2 * sizes[i] * sizes / (sizes[i] + sizes)
+                      * np.einsum('ij,ij->i', differences, differences))
+        row[i] = np.inf
+
+        return row
+
+    def merge(self, x, y, distance):
+        """Store the union of the clusters x and y in the place of y."""
+        sizes = self.sizes
+
+        self.centroids[y] = ((sizes[x] * self.centroids[x]
+                              + sizes[y] * self.centroids[y])
+                             / (sizes[x] + sizes[y]))
+        sizes[y] += sizes[x]
+
+
+def _nn_chain(clusters, n_samples):
+    """Merges of the clusters with the nearest-neighbor chain algorithm.
+
+    The chain is extended with the nearest neighbor of its last cluster
+    until two clusters are reciprocal nearest neighbors, which are merged.
+    For the reducible linkages this gives the same hierarchy as merging
+    the closest pair of clusters in each step, updating only one row of the
+    distances in each merge.
+
+    Args:
+        clusters (_CondensedMatrix or _WardCentroids): Distances between
+            the clusters, which are updated in each merge.
+        n_samples (int): Number of samples.
+
+    Returns:
+        (tuple): Arrays with the indexes of the samples representing the
+        merged clusters and the distances between them, in the order in
+        which they are merged.
+
+    """
+    active = np.ones(n_samples, dtype=bool)
+
+    merges = np.empty((n_samples - 1, 2), dtype=int)
+    heights = np.empty(n_samples - 1)
+    chain = []
+
+    for k in range(n_samples - 1):
+        if not chain:
+            chain.append(np.argmax(active))
+
+        while True:
+            x = chain[-1]
+            row = clusters.row(x)
+            row[~active] = np.inf
+
+            if len(chain) > 1:
+                y = chain[-2]
+                current_min = row[y]
+            else:
+                current_min = np.inf
+
+            # The previous cluster of the chain is kept in case of ties
+            nearest = np.argmin(row)
+            if row[nearest] < current_min:
+                y = nearest
+                current_min = row[nearest]
+
+            if len(chain) > 1 and y == chain[-2]:
+                break
+
+            chain.append(y)
+
+        del chain[-2:]
+        x, y = min(x, y), max(x, y)
+
+        merges[k] = x, y
+        heights[k] = current_min
+
+        # The merged cluster is stored in the place of y
+        clusters.merge(x, y, current_min)
+        active[x] = False
+
+    return merges, heights
+
+
+def _find(parents, node):
+    """Root of a node of a forest, compressing the path to it."""
+    root = node
+    while parents[root] != root:
+        root = parents[root]
+
+    while parents[node] != root:
+        parents[node], node = root, parents[node]
+
+    return root
+
+
+def _find_roots(parents):
+    """Root of each node of a forest, by pointer jumping."""
+    while True:
+        grandparents = parents[parents]
+
+        if np.array_equal(grandparents, parents):
+            return parents
+
+        parents = grandparents
+
+
+class AgglomerativeClustering(BaseEstimator, ClusterMixin):
+    r"""Agglomerative hierarchical clustering of functional data.
+
+    Starting with a cluster for each sample, the two closest clusters are
+    merged recursively, until ``n_clusters`` remain. The distance between
+    clusters depends on the linkage: the minimum ('single'), maximum
+    ('complete') or average ('average') distance between their samples, or
+    the increase of the sum of squared distances to the centroids of the
+    clusters ('ward').
+
+    The merges are computed with the nearest-neighbor chain algorithm. With
+    the 'ward' linkage and the :math:`L_2` distance, the distances between
+    clusters are computed from their centroids when they are needed, using
+    the flattened data matrices or coefficients of the samples, so the
+    memory is :math:`O(nd)` for :math:`n` samples with :math:`d` values
+    each. Otherwise, the distances between the samples are stored as the
+    condensed upper triangle of their distance matrix, with :math:`n(n -
+    1)/2` entries, which is computed in blocks of rows, updated in place
+    and can be memory-mapped to a temporary file. With the :math:`L_2`
+    distance, the blocks are computed with matrix products.
+
+    Args:
+        n_clusters (int, optional): Number of clusters. Defaults to 2.
+        metric (callable, optional): Functional metric used to compute the
+            distances between samples. Defaults to
+            :func:`~skfda.misc.metrics.lp_distance`.
+        linkage ({'ward', 'complete', 'average', 'single'}, optional):
+            Distance between clusters. The 'ward' linkage requires the
+            :math:`L_2` distance. Defaults to 'ward'.
+        block_size (int, optional): Number of rows of the distance matrix
+            computed at once. Defaults to 256.
+        memmap_dir (str, optional): Directory in which the condensed
+            distances are stored in a temporary memory-mapped file. Defaults
+            to None, and they are stored in memory. Not used with the 'ward'
+            linkage and the :math:`L_2` distance, which do not store them.
+
+    Attributes:
+        labels_ (numpy.ndarray): Cluster of each sample.
+        n_leaves_ (int): Number of leaves of the hierarchical tree.
+        children_ (numpy.ndarray): Array with shape (n_samples - 1, 2) with
+            the children of each non-leaf node, sorted by distance. The
+            values less than ``n_samples`` are the samples, and a value
+            ``i`` greater or equal refers to the node
+            ``children_[i - n_samples]``.
+        distances_ (numpy.ndarray): Distances between the children of each
+            non-leaf node.
+
+    Examples:
+
+        >>> import skfda
+        >>> from skfda.ml.clustering import AgglomerativeClustering
+        >>> data_matrix = [[1, 1, 2, 3, 2.5, 2],
+        ...                [0.5, 0.5, 1, 2, 1.5, 1],
+        ...                [-1, -1, -0.5, 1, 1, 0.5],
+        ...                [-0.5, -0.5, -0.5, -1, -1, -1]]
+        >>> grid_points = [0, 2, 4, 6, 8, 10]
+        >>> fd = skfda.FDataGrid(data_matrix, grid_points)
+        >>> clustering = AgglomerativeClustering(linkage='average').fit(fd)
+        >>> clustering.labels_
+        array([0, 0, 1, 1])
+        >>> clustering.children_
+        array([[0, 1],
+               [2, 3],
+               [4, 5]])
+
+    """
+
+    def __init__(self, n_clusters=2, *, metric=lp_distance, linkage='ward',
+                 block_size=256, memmap_dir=None):
+        self.n_clusters = n_clusters
+        self.metric = metric
+        self.linkage = linkage
+        self.block_size = block_size
+        self.memmap_dir = memmap_dir
+
+    def _condensed_distances(self, fdata, out):
+        """Compute the condensed distances between the samples in blocks.
+
+        Args:
+            fdata (FData): Samples.
+            out (numpy.ndarray): Array in which the distances are stored.
+
+        """
+        n_samples = fdata.n_samples
+        factor = _l2_factor(fdata) if self.metric is lp_distance else None
+
+        if factor is not None:
+            X = _weigh(_to_multivariate(fdata).astype(float), factor)
+            squared_norms = np.einsum('ij,ij->i', X, X)
+
+        position = 0
+        for start in range(0, n_samples - 1, self.block_size):
+            stop = min(start + self.block_size, n_samples - 1)
+
+            # Only the columns after the first row of the block are needed
+            if factor is not None:
+                block = _l2_distances(X[start:stop], squared_norms[start:stop],
+                                      X[start:])
+            else:
+                block = pairwise_distance(self.metric)(fdata[start:stop],
+                                                       fdata[start:])
+
+            for i, row in enumerate(block):
+                row = row[i + 1:]
+                out[position:position + len(row)] = row
+                position += len(row)
+
+    def fit(self, X, y=None):
+        """Compute the hierarchical clustering.
+
+        Args:
+            X (FDataGrid or FDataBasis): Samples.
+            y: Ignored.
+
+        Returns:
+            self
+
+        """
+        if self.linkage not in ('ward', 'complete', 'average', 'single'):
+            raise ValueError(f"Unknown linkage {self.linkage}, must be one "
+                             f"of 'ward', 'complete', 'average' or 'single'")
+
+        if self.linkage == 'ward' and self.metric is not lp_distance:
+            raise ValueError("The ward linkage requires the L2 distance.")
+
+        n_samples = X.n_samples
+
+        if not 1 <= self.n_clusters <= n_samples:
+            raise ValueError(f"The number of clusters must be between 1 and "
+                             f"the number of samples ({n_samples}).")
+
+        n_distances = n_samples * (n_samples - 1) // 2
+        factor = _l2_factor(X) if self.metric is lp_distance else None
+
+        if self.linkage == 'ward' and factor is not None:
+            clusters = _WardCentroids(
+                _weigh(_to_multivariate(X).astype(float), factor))
+            merges, heights = _nn_chain(clusters, n_samples)
+        elif self.memmap_dir is None:
+            distances = np.empty(n_distances)
+            self._condensed_distances(X, distances)
+            merges, heights = _nn_chain(
+                _CondensedMatrix(distances, n_samples, self.linkage),
+                n_samples)
+        else:
+            with tempfile.TemporaryFile(dir=self.memmap_dir) as file:
+                distances = np.memmap(file, dtype=float, mode='w+',
+                                      shape=(max(n_distances, 1),))
+                self._condensed_distances(X, distances)
+                merges, heights = _nn_chain(
+                    _CondensedMatrix(distances, n_samples, self.linkage),
+                    n_samples)
+                del distances
+
+        # The merges are sorted by distance, and the clusters named by the
+        # order in which they are created
+        order = np.argsort(heights, kind='mergesort')
+        parents = list(range(2 * n_samples - 1))
+        children = np.empty((n_samples - 1, 2), dtype=int)
+
+        for k, (x, y) in enumerate(merges[order].tolist()):
+            nodes = sorted((_find(parents, x), _find(parents, y)))
+            children[k] = nodes
+            parents[nodes[0]] = parents[nodes[1]] = n_samples + k
+
+        self.n_leaves_ = n_samples
+        self.children_ = children
+        self.distances_ = heights[order]
+
+        # The tree is cut before the last n_clusters - 1 merges
+        parents = np.arange(2 * n_samples - 1)
+        n_merges = n_samples - self.n_clusters
+        parents[children[:n_merges]] = (
+            n_samples + np.arange(n_merges))[:, np.newaxis]
+        _, self.labels_ = np.unique(_find_roots(parents)[:n_samples],
+                                    return_inverse=True)
+
+        return self
@@ -8,14 +8,110 @@ from sklearn.utils import check_random_state
 from sklearn.utils.validation import check_is_fitted
 
 import numpy as np
+import scipy.sparse
 
-from ...misc.metrics import pairwise_distance, lp_distance
+from ... import FDataBasis
+from ..._neighbors.base import (_gram_factor, _l2_factor, _to_multivariate,
+                                _weigh)
+from ..._neighbors.lower_bound import LowerBoundIndex
+from ...misc.metrics import pairwise_distance, lp_distance, _metric_bounds
 
 
 __author__ = "Amanda Hernando Bernabé"
 __email__ = "amanda.hernando@estudiante.uam.es"
 
 
+def _l2_distances(X, squared_norms, centroids):
+    """Euclidean distances between the rows of two matrices.
+
+    The cross products are computed with a single matrix product.
+
+    """
+    squared_distances = (
+        squared_norms[:, np.newaxis] - 2 * X @ centroids.T
+        + np.einsum('ij,ij->i', centroids, centroids))
+
+    return np.sqrt(np.maximum(squared_distances, 0))
+
+
+def _cluster_sums(X, labels, n_clusters):
+    """Sums and number of the rows of X in each cluster.
+
+    The sums are computed with a single sparse matrix product.
+
+    """
+    n_samples = len(X)
+
+    indicator = scipy.sparse.csr_matrix(
+        (np.ones(n_samples, dtype=X.dtype), (labels, np.arange(n_samples))),
+        shape=(n_clusters, n_samples))
+    counts = np.bincount(labels, minlength=n_clusters)
+
+    return indicator @ X, counts
+
+
+def _cluster_means(X, labels, centroids):
+    """Means of the rows of X in each cluster.
+
+    Empty clusters keep their previous centroids.
+
+    """
+    sums, counts = _cluster_sums(X, labels, len(centroids))
+    non_empty = counts > 0
+
+    means = centroids.copy()
+    means[non_empty] = sums[non_empty] / counts[non_empty, np.newaxis]
+
+    return means
+
+
+def _set_flat(fdata, flat):
+    """Overwrite the data or coefficients of fdata with flattened ones."""
+    if isinstance(fdata, FDataBasis):
+        fdata.coefficients[...] = flat
+    else:
+        fdata.data_matrix[...] = flat.reshape(fdata.data_matrix.shape)
+
+
+def _kmeans_plusplus_indexes(distances_to, n_samples, n_clusters,
+                             random_state, sample_weight=None):
+    """Indexes of the samples chosen with the k-means++ method.
+
+    Args:
+        distances_to (callable): Function returning the distances of all
+            the samples to the sample with the given index.
+        n_samples (int): Number of samples.
+        n_clusters (int): Number of samples to choose.
+        random_state (RandomState): Random number generator.
+        sample_weight (numpy.ndarray, optional): Weights of the samples.
+
+    Returns:
+        (numpy.ndarray): Indexes of the chosen samples.
+
+    """
+    if sample_weight is None:
+        sample_weight = np.ones(n_samples)
+
+    indexes = [random_state.choice(n_samples,
+                                   p=sample_weight / np.sum(sample_weight))]
+    min_distances = distances_to(indexes[0])
+
+    for _ in range(1, n_clusters):
+        probabilities = sample_weight * min_distances ** 2
+        total = np.sum(probabilities)
+
+        if total == 0:
+            # The remaining samples coincide with the chosen ones
+            probabilities = sample_weight
+            total = np.sum(sample_weight)
+
+        indexes.append(random_state.choice(n_samples,
+                                           p=probabilities / total))
+        min_distances = np.minimum(min_distances, distances_to(indexes[-1]))
+
+    return np.array(indexes)
+
+
 class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
     """Base class to implement K-Means clustering algorithms.
 
@@ -26,17 +122,23 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
     """
 
     def __init__(self, n_clusters, init, metric, n_init, max_iter, tol,
-                 random_state):
+                 random_state, n_jobs=None):
         """Initialization of the BaseKMeans class.
 
         Args:
             n_clusters (int, optional): Number of groups into which the samples
                 are classified. Defaults to 2.
-            init (FDataGrid, optional): Contains the initial centers of the
-                different clusters the algorithm starts with. Its data_marix
-                must be of the shape (n_clusters, fdatagrid.ncol,
-                fdatagrid.dim_codomain). Defaults to None, and the centers are
-                initialized randomly.
+            init (FData or string, optional): Contains the initial centers of
+                the different clusters the algorithm starts with. Its
+                data_matrix must be of the shape (n_clusters, fdatagrid.ncol,
+                fdatagrid.dim_codomain), or be a FDataBasis with the basis of
+                the data and n_clusters samples if the data is a FDataBasis. It
+                can also be the method used to choose the initial centers among
+                the samples: 'random', 'k-means++', which chooses them with
+                probability proportional to their squared distance to the
+                nearest center already chosen, or 'k-means||', a scalable
+                variant of 'k-means++' for large datasets. Defaults to None,
+                and the centers are chosen randomly.
             metric (optional): functional data metric. Defaults to
                 *lp_distance*.
             n_init (int, optional): Number of time the k-means algorithm will
@@ -53,6 +155,13 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
                 initialization. ç Use an int to make the randomness
                 deterministic. Defaults to 0.
                 See :term:`Glossary <random_state>`.
+            n_jobs (int or None, optional): The number of parallel jobs to run
+                the ``n_init`` executions of the algorithm. ``-1`` means using
+                all processors. If it is given, each execution uses its own
+                random state seeded from ``random_state``, so the results do
+                not depend on the number of jobs, but they differ from the
+                ones obtained with ``None``, the default, which runs the
+                executions one after another sharing ``random_state``.
         """
         self.n_clusters = n_clusters
         self.init = init
@@ -61,13 +170,14 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         self.max_iter = max_iter
         self.tol = tol
         self.random_state = random_state
+        self.n_jobs = n_jobs
 
     def _check_clustering(self, fdata):
         """Checks the arguments used in the
         :func:`fit method <skfda.ml.clustering.base_kmeans.fit>`.
 
         Args:
-            fdata (FDataGrid object): Object whose samples
+            fdata (FDataGrid or FDataBasis object): Object whose samples
                 are classified into different groups.
         """
 
@@ -87,16 +197,32 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
             raise ValueError(
                 "The number of iterations must be greater than 0.")
 
-        if self.init is not None and self.n_init != 1:
+        if isinstance(self.init, str):
+            if self.init not in ('random', 'k-means++', 'k-means||'):
+                raise ValueError(f"Unknown init method {self.init}, must be "
+                                 f"one of 'random', 'k-means++' or "
+                                 f"'k-means||'")
+        elif self.init is not None and self.n_init != 1:
             self.n_init = 1
             warnings.warn("Warning: The number of iterations is ignored "
                           "because the init parameter is set.")
 
-        if self.init is not None and self.init.data_matrix.shape != (
-                self.n_clusters, fdata.ncol, fdata.dim_codomain):
-            raise ValueError("The init FDataGrid data_matrix should be of "
-                             "shape (n_clusters, n_features, dim_codomain) "
-                             "and gives the initial centers.")
+        if self.init is not None and not isinstance(self.init, str):
+            if isinstance(fdata, FDataBasis):
+                if (not isinstance(self.init, FDataBasis)
+                        or self.init.basis != fdata.basis
+                        or self.init.n_samples != self.n_clusters):
+                    raise ValueError("The init FDataBasis should have the "
+                                     "basis of the data and n_clusters "
+                                     "samples, and gives the initial "
+                                     "centers.")
+            elif (isinstance(self.init, FDataBasis)
+                  or self.init.data_matrix.shape != (
+                      self.n_clusters, fdata.ncol, fdata.dim_codomain)):
+                raise ValueError("The init FDataGrid data_matrix should be "
+                                 "of shape (n_clusters, n_features, "
+                                 "dim_codomain) and gives the initial "
+                                 "centers.")
 
         if self.max_iter < 1:
             raise ValueError(
@@ -108,6 +234,17 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         return fdata
 
     def _tolerance(self, fdata):
+        if isinstance(fdata, FDataBasis):
+            # The integral of the variance is the sum of the variances of
+            # the coefficients in an orthonormal basis
+            variances = np.var(_weigh(fdata.coefficients,
+                                      _gram_factor(fdata.basis)), axis=0)
+            domain_range = fdata.domain_range[0]
+            mean_variance = np.sum(variances) / (
+                (domain_range[1] - domain_range[0]) * fdata.dim_codomain)
+
+            return mean_variance * self.tol
+
         variance = fdata.var()
         mean_variance = np.mean(variance[0].data_matrix)
 
@@ -129,8 +266,12 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
             centroids (ndarray): initial centroids
         """
 
-        if self.init is None:
-            _, idx = np.unique(fdatagrid.data_matrix,
+        if self.init == 'k-means++':
+            return self._kmeans_plusplus(fdatagrid, random_state)
+        elif self.init == 'k-means||':
+            return self._kmeans_parallel(fdatagrid, random_state)
+        elif self.init is None or self.init == 'random':
+            _, idx = np.unique(_to_multivariate(fdatagrid),
                                axis=0, return_index=True)
             unique_data = fdatagrid[np.sort(idx)]
 
@@ -147,6 +288,78 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         else:
             return self.init.copy()
 
+    def _kmeans_plusplus(self, fdata, random_state):
+        """Choose the initial centroids with the k-means++ method.
+
+        Each centroid is chosen among the samples with probability
+        proportional to the squared distance to the nearest centroid
+        already chosen.
+
+        """
+        indexes = _kmeans_plusplus_indexes(
+            lambda i: self._distances_to_centroids(fdata, fdata[[i]])[:, 0],
+            n_samples=fdata.n_samples, n_clusters=self.n_clusters,
+            random_state=random_state)
+
+        return fdata[indexes].copy()
+
+    def _kmeans_parallel(self, fdata, random_state, n_rounds=5):
+        """Choose the initial centroids with the k-means|| method.
+
+        In each of the ``n_rounds`` rounds, about ``2 * n_clusters``
+        candidates are sampled independently with probability proportional
+        to their squared distance to the nearest candidate. The centroids
+        are chosen with the k-means++ method among the candidates, weighted
+        by the number of samples closer to them. Thus, the distances are
+        computed in a few passes over the data instead of one per centroid.
+
+        """
+        n_samples = fdata.n_samples
+        oversampling = 2 * self.n_clusters
+
+        candidates = [random_state.randint(n_samples)]
+        nearest = np.zeros(n_samples, dtype=int)
+        min_distances = self._distances_to_centroids(
+            fdata, fdata[candidates])[:, 0]
+
+        for _ in range(n_rounds):
+            squared_distances = min_distances ** 2
+            total = np.sum(squared_distances)
+
+            if total == 0:
+                break
+
+            new, = np.nonzero(random_state.uniform(size=n_samples)
+                              < oversampling * squared_distances / total)
+
+            if len(new) == 0:
+                continue
+
+            distances = self._distances_to_centroids(fdata, fdata[new])
+            closest = np.argmin(distances, axis=1)
+            closest_distances = distances[np.arange(n_samples), closest]
+
+            closer = closest_distances < min_distances
+            nearest[closer] = len(candidates) + closest[closer]
+            min_distances[closer] = closest_distances[closer]
+
+            candidates.extend(new)
+
+        if len(candidates) < self.n_clusters:
+            return self._kmeans_plusplus(fdata, random_state)
+
+        candidates = fdata[candidates]
+        candidate_distances = self._pairwise_distances(candidates, candidates)
+
+        indexes = _kmeans_plusplus_indexes(
+            lambda i: candidate_distances[:, i],
+            n_samples=len(candidate_distances), n_clusters=self.n_clusters,
+            random_state=random_state,
+            sample_weight=np.bincount(nearest,
+                                      minlength=len(candidate_distances)))
+
+        return candidates[indexes].copy()
+
     def _check_params(self):
         pass
 
@@ -159,12 +372,116 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
                 centroids):
         pass
 
+    @abstractmethod
+    def _l2_update(self, X, membership_matrix, distances_to_centroids,
+                   centroids):
+        """Update the memberships and the centroids as flattened matrices.
+
+        Returns:
+            (numpy.ndarray): The new centroids.
+
+        """
+        pass
+
+    def _l2_factor(self, fdata):
+        """Factor of the :math:`L_2` distance between flattened samples.
+
+        It is ``None`` if a different metric is used.
+
+        """
+        if self.metric is not lp_distance:
+            return None
+
+        return _l2_factor(fdata)
+
+    def _distances_to_centroids(self, fdata, centroids):
+        """Distances between the samples and the centroids."""
+        return self._pairwise_distances(fdata, centroids)
+
+    def _pairwise_distances(self, fdata, centroids):
+        """Distances between all the samples and all the centroids."""
+        factor = self._l2_factor(fdata)
+
+        if factor is not None:
+            X = _to_multivariate(fdata)
+
+            return np.stack([
+                np.linalg.norm(_weigh(X - c, factor), axis=1)
+                for c in _to_multivariate(centroids)], axis=1)
+
+        return pairwise_distance(self.metric)(fdata1=fdata, fdata2=centroids)
+
+    def _l2_algorithm(self, fdata, random_state, factor):
+        """Implementation of the algorithm for the :math:`L_2` distance.
+
+        The samples and the centroids are flattened matrices, with the
+        values in the grid or the coefficients in the basis, whose
+        distances in each iteration are computed with a single matrix
+        product. The computations keep the precision of the data, so float32
+        data is clustered in single precision.
+
+        Returns:
+            (tuple): The same values as :meth:`_algorithm`.
+
+        """
+        X = _to_multivariate(fdata)
+        if not np.issubdtype(X.dtype, np.floating):
+            X = X.astype(float)
+
+        n_samples = fdata.n_samples
+        factor = factor.astype(X.dtype)
+        X_weighted = _weigh(X, factor)
+        squared_norms = np.einsum('ij,ij->i', X_weighted, X_weighted)
+
+        membership_matrix = self._create_membership(n_samples)
+        centroids = self._init_centroids(fdata, random_state)
+        centroids_matrix = _to_multivariate(centroids).astype(X.dtype)
+
+        tolerance = self._tolerance(fdata)
+        repetitions = 0
+
+        while True:
+            centroids_old_matrix = centroids_matrix
+
+            distances_to_centroids = _l2_distances(
+                X_weighted, squared_norms,
+                _weigh(centroids_old_matrix, factor))
+
+            centroids_matrix = self._l2_update(
+                X, membership_matrix, distances_to_centroids,
+                centroids_old_matrix)
+
+            repetitions += 1
+
+            shifts = np.linalg.norm(
+                _weigh(centroids_matrix - centroids_old_matrix, factor),
+                axis=1)
+
+            if np.all(shifts < tolerance) or repetitions >= self.max_iter:
+                break
+
+        # The distances of the last iteration are computed without
+        # cancellation errors
+        distances_to_centroids = np.stack([
+            np.linalg.norm(X_weighted - c, axis=1)
+            for c in _weigh(centroids_old_matrix, factor)], axis=1)
+
+        if isinstance(centroids, FDataBasis):
+            centroids = centroids.copy(coefficients=centroids_matrix)
+        else:
+            centroids = centroids.copy(data_matrix=centroids_matrix.reshape(
+                (self.n_clusters,) + fdata.data_matrix.shape[1:]))
+
+        return (membership_matrix, centroids,
+                distances_to_centroids, repetitions)
+
     def _algorithm(self, fdata, random_state):
-        """ Implementation of the Fuzzy K-Means algorithm for FDataGrid objects
-        of any dimension.
+        """ Implementation of the Fuzzy K-Means algorithm for FDataGrid and
+        FDataBasis objects of any dimension.
 
         Args:
-            fdata (FDataGrid object): Object whose samples are clustered,
+            fdata (FDataGrid or FDataBasis object): Object whose samples are
+                clustered,
                 classified into different groups.
             random_state (RandomState object): random number generation for
                 centroid initialization.
@@ -184,15 +501,16 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
                 repetitions(int): number of iterations the algorithm was run.
 
         """
+        factor = self._l2_factor(fdata)
+
+        if factor is not None:
+            return self._l2_algorithm(fdata, random_state, factor)
+
         repetitions = 0
-        centroids_old_matrix = np.zeros(
-            (self.n_clusters, fdata.ncol, fdata.dim_codomain))
         membership_matrix = self._create_membership(fdata.n_samples)
 
         centroids = self._init_centroids(fdata, random_state)
-        centroids_old = centroids.copy(data_matrix=centroids_old_matrix)
-
-        pairwise_metric = pairwise_distance(self.metric)
+        centroids_old = centroids.copy()
 
         tolerance = self._tolerance(fdata)
 
@@ -200,10 +518,14 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
                (not np.all(self.metric(centroids, centroids_old) < tolerance)
                 and repetitions < self.max_iter)):
 
-            centroids_old.data_matrix[...] = centroids.data_matrix
+            _set_flat(centroids_old, _to_multivariate(centroids))
 
-            distances_to_centroids = pairwise_metric(fdata1=fdata,
-                                                     fdata2=centroids)
+            distances_to_centroids = self._distances_to_centroids(
+                fdata, centroids)
+
+            # Infinite distances were pruned
+            pruned = np.isinf(distances_to_centroids)
+            self.n_pruned_distances_ += np.count_nonzero(pruned)
 
             self._update(
                 fdata=fdata,
@@ -213,6 +535,12 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
 
             repetitions += 1
 
+        # The distances of the last iteration are needed by transform
+        if np.any(pruned):
+            samples, clusters = np.nonzero(pruned)
+            distances_to_centroids[pruned] = self.metric(
+                fdata[samples], centroids_old[clusters])
+
         return (membership_matrix, centroids,
                 distances_to_centroids, repetitions)
 
@@ -221,17 +549,32 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
                          distances_to_centroids):
         pass
 
+    def _single_run(self, fdata, random_state):
+        """Run the algorithm once.
+
+        Returns:
+            (tuple): The values returned by :meth:`_algorithm` and the number
+            of distances pruned.
+
+        """
+        self.n_pruned_distances_ = 0
+
+        return self._algorithm(fdata=fdata, random_state=random_state) + (
+            self.n_pruned_distances_,)
+
     def fit(self, X, y=None, sample_weight=None):
         """ Computes Fuzzy K-Means clustering calculating the attributes
         *labels_*, *cluster_centers_*, *inertia_* and *n_iter_*.
 
         Args:
-            X (FDataGrid object): Object whose samples are clusered,
-                classified into different groups.
+            X (FDataGrid or FDataBasis object): Object whose samples are
+                clusered, classified into different groups.
             y (Ignored): present here for API consistency by convention.
             sample_weight (Ignored): present here for API consistency by
                 convention.
         """
+        from joblib import Parallel, delayed
+
         fdata = self._check_clustering(X)
         random_state = check_random_state(self.random_state)
 
@@ -243,11 +586,26 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         best_distances_to_centroids = None
         best_n_iter = None
 
-        for _ in range(self.n_init):
-            (membership, centroids,
-             distances_to_centroids, n_iter) = (
-                self._algorithm(fdata=fdata,
-                                random_state=random_state))
+        if self.n_jobs is None:
+            # The executions share the random state, one after another
+            results = [self._single_run(fdata, random_state)
+                       for _ in range(self.n_init)]
+        else:
+            # Each execution has an independent random stream, so the
+            # results do not depend on the number of jobs
+            seeds = random_state.randint(np.iinfo(np.int32).max,
+                                         size=self.n_init)
+
+            results = Parallel(n_jobs=self.n_jobs)(
+                delayed(self._single_run)(fdata, np.random.RandomState(seed))
+                for seed in seeds)
+
+        self.n_pruned_distances_ = 0
+
+        for (membership, centroids, distances_to_centroids, n_iter,
+             n_pruned_distances) in results:
+
+            self.n_pruned_distances_ += n_pruned_distances
 
             inertia = self._compute_inertia(membership, centroids,
                                             distances_to_centroids)
@@ -269,10 +627,17 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
 
     def _check_test_data(self, fdatagrid):
         """Checks that the FDataGrid object and the calculated centroids have
-        compatible shapes.
+        compatible shapes, or that the FDataBasis object has the basis of
+        the centroids.
         """
-        if (fdatagrid.data_matrix.shape[1:3]
-                != self.cluster_centers_.data_matrix.shape[1:3]):
+        if isinstance(self.cluster_centers_, FDataBasis):
+            if (not isinstance(fdatagrid, FDataBasis)
+                    or fdatagrid.basis != self.cluster_centers_.basis):
+                raise ValueError("The fdatabasis basis is not the one of "
+                                 "the calculated cluster_centers_.")
+        elif (isinstance(fdatagrid, FDataBasis)
+              or fdatagrid.data_matrix.shape[1:3]
+              != self.cluster_centers_.data_matrix.shape[1:3]):
             raise ValueError("The fdatagrid shape is not the one expected for "
                              "the calculated cluster_centers_.")
 
@@ -280,8 +645,8 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         """Predict the closest cluster each sample in X belongs to.
 
         Args:
-            X (FDataGrid object): Object whose samples are classified into
-                different groups.
+            X (FDataGrid or FDataBasis object): Object whose samples are
+                classified into different groups.
             y (Ignored): present here for API consistency by convention.
             sample_weight (Ignored): present here for API consistency by
                 convention.
@@ -295,10 +660,7 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         membership_matrix = self._create_membership(X.n_samples)
         centroids = self.cluster_centers_.copy()
 
-        pairwise_metric = pairwise_distance(self.metric)
-
-        distances_to_centroids = pairwise_metric(fdata1=X,
-                                                 fdata2=centroids)
+        distances_to_centroids = self._distances_to_centroids(X, centroids)
 
         self._update(
             fdata=X,
@@ -312,8 +674,8 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         """Transform X to a cluster-distance space.
 
         Args:
-            X (FDataGrid object): Object whose samples are classified into
-                different groups.
+            X (FDataGrid or FDataBasis object): Object whose samples are
+                classified into different groups.
             y (Ignored): present here for API consistency by convention.
             sample_weight (Ignored): present here for API consistency by
                 convention.
@@ -330,8 +692,8 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         """Compute clustering and transform X to cluster-distance space.
 
         Args:
-            X (FDataGrid object): Object whose samples are classified into
-                different groups.
+            X (FDataGrid or FDataBasis object): Object whose samples are
+                classified into different groups.
             y (Ignored): present here for API consistency by convention.
             sample_weight (Ignored): present here for API consistency by
                 convention.
@@ -347,8 +709,8 @@ class BaseKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
         """Opposite of the value of X on the K-means objective.
 
         Args:
-            X (FDataGrid object): Object whose samples are classified into
-                different groups.
+            X (FDataGrid or FDataBasis object): Object whose samples are
+                classified into different groups.
             y (Ignored): present here for API consistency by convention.
             sample_weight (Ignored): present here for API consistency by
                 convention.
@@ -416,14 +778,25 @@ class KMeans(BaseKMeans):
     This algorithm is applied for each dimension on the image of the FDataGrid
     object.
 
+    The samples can also be a FDataBasis object. With the :math:`L_2`
+    distance, the algorithm is applied to the coefficients of the samples,
+    whose distances are computed with the Gram matrix of the basis, without
+    evaluating the functions.
+
     Args:
         n_clusters (int, optional): Number of groups into which the samples are
             classified. Defaults to 2.
-        init (FDataGrid, optional): Contains the initial centers of the
-            different clusters the algorithm starts with. Its data_marix must
+        init (FData or string, optional): Contains the initial centers of the
+            different clusters the algorithm starts with. Its data_matrix must
             be of the shape (n_clusters, fdatagrid.ncol,
-            fdatagrid.dim_codomain). Defaults to None, and the centers are
-            initialized randomly.
+            fdatagrid.dim_codomain), or be a FDataBasis with the basis of the
+            data and n_clusters samples if the data is a FDataBasis. It can
+            also be the method used to choose the initial centers among the
+            samples: 'random', 'k-means++', which chooses them with probability
+            proportional to their squared distance to the nearest center
+            already chosen, or 'k-means||', a scalable variant of 'k-means++'
+            for large datasets. Defaults to None, and the centers are chosen
+            randomly.
         metric (optional): functional data metric. Defaults to
             *lp_distance*.
         n_init (int, optional): Number of time the k-means algorithm will be
@@ -438,18 +811,39 @@ class KMeans(BaseKMeans):
             Determines random number generation for centroid initialization.
             Use an int to make the randomness deterministic. Defaults to 0.
             See :term:`Glossary <random_state>`.
+        algorithm ({'full', 'elkan'}, optional): K-means algorithm to use.
+            The classical algorithm is 'full'. The 'elkan' variation keeps
+            bounds of the distances between the samples and the centroids,
+            which are updated using the triangle inequality, and skips the
+            distances that cannot change the assignment of a sample. It
+            requires a symmetric metric satisfying the triangle inequality.
+            Defaults to 'full'.
+        n_jobs (int or None, optional): The number of parallel jobs to run the
+            ``n_init`` executions of the algorithm. ``-1`` means using all
+            processors. If it is given, each execution uses its own random
+            state seeded from ``random_state``, so the results do not depend
+            on the number of jobs, but they differ from the ones obtained with
+            ``None``, the default, which runs the executions one after another
+            sharing ``random_state``.
 
     Attributes:
         labels_ (numpy.ndarray: n_samples): vector in which each entry contains
             the cluster each observation belongs to.
-        cluster_centers_ (FDataGrid object): data_matrix of shape
-            (n_clusters, ncol, dim_codomain) and contains the centroids for
-            each cluster.
+        cluster_centers_ (FDataGrid or FDataBasis object): data_matrix of
+            shape (n_clusters, ncol, dim_codomain), or coefficients in the
+            basis of the data, that contains the centroids for each cluster.
         inertia_ (numpy.ndarray, (fdatagrid.dim_codomain)): Sum of squared
             distances of samples to their closest cluster center for each
             dimension.
         n_iter_ (numpy.ndarray, (fdatagrid.dim_codomain)): number of iterations
             the algorithm was run for each dimension.
+        n_pruned_distances_ (int): number of distances between samples and
+            centroids not computed during the fit. The assignments skip the
+            evaluation of expensive metrics, as the elastic ones, for the
+            centroids that are known to be farther than the nearest one, and
+            the 'elkan' algorithm skips the distances bounded using the
+            triangle inequality. The distances between the centroids that
+            the 'elkan' algorithm evaluates to bound them are subtracted.
 
     Example:
 
@@ -481,17 +875,24 @@ class KMeans(BaseKMeans):
 
     def __init__(self, n_clusters=2, init=None,
                  metric=lp_distance,
-                 n_init=1, max_iter=100, tol=1e-4, random_state=0):
+                 n_init=1, max_iter=100, tol=1e-4, random_state=0,
+                 algorithm='full', n_jobs=None):
         """Initialization of the KMeans class.
 
         Args:
             n_clusters (int, optional): Number of groups into which the samples
                 are classified. Defaults to 2.
-            init (FDataGrid, optional): Contains the initial centers of the
-                different clusters the algorithm starts with. Its data_marix
-                must be of the shape (n_clusters, fdatagrid.ncol,
-                fdatagrid.dim_codomain). Defaults to None, and the centers are
-                initialized randomly.
+            init (FData or string, optional): Contains the initial centers of
+                the different clusters the algorithm starts with. Its
+                data_matrix must be of the shape (n_clusters, fdatagrid.ncol,
+                fdatagrid.dim_codomain), or be a FDataBasis with the basis of
+                the data and n_clusters samples if the data is a FDataBasis. It
+                can also be the method used to choose the initial centers among
+                the samples: 'random', 'k-means++', which chooses them with
+                probability proportional to their squared distance to the
+                nearest center already chosen, or 'k-means||', a scalable
+                variant of 'k-means++' for large datasets. Defaults to None,
+                and the centers are chosen randomly.
             metric (optional): functional data metric. Defaults to
                 *lp_distance*.
             n_init (int, optional): Number of time the k-means algorithm will
@@ -508,33 +909,197 @@ class KMeans(BaseKMeans):
                 initialization. Use an int to make the randomness
                 deterministic.
                 Defaults to 0.
+            algorithm ({'full', 'elkan'}, optional): K-means algorithm to
+                use. Defaults to 'full'.
+            n_jobs (int or None, optional): The number of parallel jobs to run
+                the ``n_init`` executions of the algorithm. ``-1`` means using
+                all processors. If it is given, each execution uses its own
+                random state seeded from ``random_state``, so the results do
+                not depend on the number of jobs, but they differ from the
+                ones obtained with ``None``, the default, which runs the
+                executions one after another sharing ``random_state``.
         """
         super().__init__(n_clusters=n_clusters, init=init, metric=metric,
                          n_init=n_init, max_iter=max_iter, tol=tol,
-                         random_state=random_state)
+                         random_state=random_state, n_jobs=n_jobs)
+        self.algorithm = algorithm
+
+    def _check_params(self):
+        if self.algorithm not in ('full', 'elkan'):
+            raise ValueError(f"Unknown algorithm {self.algorithm}, must be "
+                             f"one of 'full' or 'elkan'")
 
     def _compute_inertia(self, membership, centroids,
                          distances_to_centroids):
-        distances_to_their_center = np.choose(membership,
-                                              distances_to_centroids.T)
+        distances_to_their_center = distances_to_centroids[
+            np.arange(len(membership)), membership]
 
         return np.sum(distances_to_their_center ** 2)
 
     def _create_membership(self, n_samples):
         return np.empty(n_samples, dtype=int)
 
+    def _distances_to_centroids(self, fdata, centroids):
+        bounds = _metric_bounds(self.metric)
+
+        if bounds is None:
+            return super()._distances_to_centroids(fdata, centroids)
+
+        # Only the distance to the nearest centroid is needed, so the
+        # evaluations of expensive metrics are pruned if possible
+        index = LowerBoundIndex(self.metric, lower_bound=bounds[0],
+                                upper_bound=bounds[1]).fit(centroids)
+        distances, nearest = index.kneighbors(fdata, n_neighbors=1)
+
+        distances_to_centroids = np.full((len(fdata), len(centroids)),
+                                         np.inf)
+        distances_to_centroids[np.arange(len(fdata)),
+                               nearest[:, 0]] = distances[:, 0]
+
+        return distances_to_centroids
+
+    def _paired_distances(self, fdata, samples, centroids, clusters):
+        """Distances between the given samples and centroids, elementwise."""
+        if len(samples) == 0:
+            return np.empty(0)
+
+        return np.ravel(self.metric(fdata[samples], centroids[clusters]))
+
+    def _algorithm(self, fdata, random_state):
+        if self.algorithm == 'full':
+            return super()._algorithm(fdata=fdata, random_state=random_state)
+
+        return self._elkan_algorithm(fdata=fdata, random_state=random_state)
+
+    def _elkan_algorithm(self, fdata, random_state):
+        """Implementation of the K-Means algorithm of Elkan.
+
+        For each sample, an upper bound of the distance to its centroid and
+        lower bounds of the distances to the other centroids are kept, and
+        updated with the distances moved by the centroids in each iteration.
+        The distance to a centroid is only computed if these bounds, or the
+        distance between the centroids, do not guarantee that it is farther
+        than the assigned one.
+
+        Returns:
+            (tuple): The same values as the classical algorithm.
+
+        """
+        n_samples = fdata.n_samples
+        samples = np.arange(n_samples)
+
+        membership_matrix = self._create_membership(n_samples)
+        centroids = self._init_centroids(fdata, random_state)
+        centroids_old = centroids.copy()
+
+        tolerance = self._tolerance(fdata)
+
+        # The first assignment computes all the distances
+        distances_to_centroids = super()._distances_to_centroids(
+            fdata, centroids)
+        known = np.ones(distances_to_centroids.shape, dtype=bool)
+
+        membership_matrix[:] = np.argmin(distances_to_centroids, axis=1)
+        lower_bounds = distances_to_centroids.copy()
+        upper_bounds = distances_to_centroids[samples, membership_matrix]
+
+        self._update_centroids(fdata, membership_matrix, centroids)
+        shifts = np.ravel(self.metric(centroids, centroids_old))
+        repetitions = 1
+
+        while (not np.all(shifts < tolerance)
+               and repetitions < self.max_iter):
+
+            _set_flat(centroids_old, _to_multivariate(centroids))
+
+            upper_bounds += shifts[membership_matrix]
+            lower_bounds = np.maximum(lower_bounds - shifts, 0)
+
+            # Half of the distances between centroids
+            i, j = np.triu_indices(self.n_clusters, 1)
+            half_distances = np.zeros((self.n_clusters, self.n_clusters))
+            half_distances[i, j] = np.ravel(
+                self.metric(centroids[i], centroids[j])) / 2
+            half_distances[j, i] = half_distances[i, j]
+
+            nearest_half_distances = np.min(
+                half_distances + np.diag(np.full(self.n_clusters, np.inf)),
+                axis=1)
+
+            def candidates():
+                mask = ((upper_bounds[:, np.newaxis] > lower_bounds)
+                        & (upper_bounds[:, np.newaxis]
+                           > half_distances[membership_matrix]))
+                mask[samples, membership_matrix] = False
+                return mask
+
+            mask = candidates()
+            mask[upper_bounds <= nearest_half_distances[
+                membership_matrix]] = False
+
+            # Tighten the upper bounds of the samples that may change
+            tightened, = np.nonzero(np.any(mask, axis=1))
+            upper_bounds[tightened] = self._paired_distances(
+                fdata, tightened, centroids,
+                membership_matrix[tightened])
+            lower_bounds[tightened, membership_matrix[tightened]] = (
+                upper_bounds[tightened])
+
+            mask &= candidates()
+            sample_idx, cluster_idx = np.nonzero(mask)
+            lower_bounds[sample_idx, cluster_idx] = self._paired_distances(
+                fdata, sample_idx, centroids, cluster_idx)
+
+            # The distances between centroids and their shifts are also
+            # evaluations of the metric
+            n_evaluations = (len(tightened) + len(sample_idx)
+                             + self.n_clusters * (self.n_clusters + 1) // 2)
+            self.n_pruned_distances_ += (n_samples * self.n_clusters
+                                         - n_evaluations)
+
+            known = mask.copy()
+            known[tightened, membership_matrix[tightened]] = True
+
+            # Not evaluated centroids are not closer than the assigned one
+            distances_to_centroids = np.full(mask.shape, np.inf)
+            distances_to_centroids[samples, membership_matrix] = upper_bounds
+            distances_to_centroids[mask] = lower_bounds[mask]
+
+            membership_matrix[:] = np.argmin(distances_to_centroids, axis=1)
+            upper_bounds = distances_to_centroids[samples, membership_matrix]
+
+            self._update_centroids(fdata, membership_matrix, centroids)
+            shifts = np.ravel(self.metric(centroids, centroids_old))
+            repetitions += 1
+
+        # The distances of the last iteration are needed by transform
+        distances_to_centroids[known] = lower_bounds[known]
+        sample_idx, cluster_idx = np.nonzero(~known)
+        distances_to_centroids[sample_idx, cluster_idx] = (
+            self._paired_distances(fdata, sample_idx, centroids_old,
+                                   cluster_idx))
+
+        return (membership_matrix, centroids,
+                distances_to_centroids, repetitions)
+
     def _update(self, fdata, membership_matrix, distances_to_centroids,
                 centroids):
 
         membership_matrix[:] = np.argmin(distances_to_centroids, axis=1)
+        self._update_centroids(fdata, membership_matrix, centroids)
+
+    def _update_centroids(self, fdata, membership_matrix, centroids):
+
+        _set_flat(centroids, _cluster_means(
+            _to_multivariate(fdata), membership_matrix,
+            _to_multivariate(centroids)))
 
-        for i in range(self.n_clusters):
+    def _l2_update(self, X, membership_matrix, distances_to_centroids,
+                   centroids):
 
-            indices, = np.where(membership_matrix == i)
+        membership_matrix[:] = np.argmin(distances_to_centroids, axis=1)
 
-            if len(indices) != 0:
-                centroids.data_matrix[i] = np.average(
-                    fdata.data_matrix[indices, ...], axis=0)
+        return _cluster_means(X, membership_matrix, centroids)
 
 
 class FuzzyCMeans(BaseKMeans):
@@ -596,14 +1161,25 @@ class FuzzyCMeans(BaseKMeans):
     This algorithm is applied for each dimension on the image of the FDataGrid
     object.
 
+    The samples can also be a FDataBasis object. With the :math:`L_2`
+    distance, the algorithm is applied to the coefficients of the samples,
+    whose distances are computed with the Gram matrix of the basis, without
+    evaluating the functions.
+
     Args:
         n_clusters (int, optional): Number of groups into which the samples are
             classified. Defaults to 2.
-        init (FDataGrid, optional): Contains the initial centers of the
-            different clusters the algorithm starts with. Its data_marix must
+        init (FData or string, optional): Contains the initial centers of the
+            different clusters the algorithm starts with. Its data_matrix must
             be of the shape (n_clusters, fdatagrid.ncol,
-            fdatagrid.dim_codomain). Defaults to None, and the centers are
-            initialized randomly.
+            fdatagrid.dim_codomain), or be a FDataBasis with the basis of the
+            data and n_clusters samples if the data is a FDataBasis. It can
+            also be the method used to choose the initial centers among the
+            samples: 'random', 'k-means++', which chooses them with probability
+            proportional to their squared distance to the nearest center
+            already chosen, or 'k-means||', a scalable variant of 'k-means++'
+            for large datasets. Defaults to None, and the centers are chosen
+            randomly.
         metric (optional): functional data metric. Defaults to
             *lp_distance*.
         n_init (int, optional): Number of time the k-means algorithm will be
@@ -620,14 +1196,21 @@ class FuzzyCMeans(BaseKMeans):
             See :term:`Glossary <random_state>`.
         fuzzifier (int, optional): Scalar parameter used to specify the
             degree of fuzziness in the fuzzy algorithm. Defaults to 2.
+        n_jobs (int or None, optional): The number of parallel jobs to run the
+            ``n_init`` executions of the algorithm. ``-1`` means using all
+            processors. If it is given, each execution uses its own random
+            state seeded from ``random_state``, so the results do not depend
+            on the number of jobs, but they differ from the ones obtained with
+            ``None``, the default, which runs the executions one after another
+            sharing ``random_state``.
 
     Attributes:
         labels_ (numpy.ndarray: (n_samples, n_clusters)): 2-dimensional
             matrix in which each row contains the cluster that observation
             belongs to.
-        cluster_centers_ (FDataGrid object): data_matrix of shape
-            (n_clusters, ncol, dim_codomain) and contains the centroids for
-            each cluster.
+        cluster_centers_ (FDataGrid or FDataBasis object): data_matrix of
+            shape (n_clusters, ncol, dim_codomain), or coefficients in the
+            basis of the data, that contains the centroids for each cluster.
         inertia_ (numpy.ndarray, (fdatagrid.dim_codomain)): Sum of squared
             distances of samples to their closest cluster center for each
             dimension.
@@ -661,17 +1244,23 @@ class FuzzyCMeans(BaseKMeans):
 
     def __init__(self, n_clusters=2, init=None,
                  metric=lp_distance, n_init=1, max_iter=100,
-                 tol=1e-4, random_state=0, fuzzifier=2):
+                 tol=1e-4, random_state=0, fuzzifier=2, n_jobs=None):
         """Initialization of the FuzzyKMeans class.
 
         Args:
             n_clusters (int, optional): Number of groups into which the samples
                 are classified. Defaults to 2.
-            init (FDataGrid, optional): Contains the initial centers of the
-                different clusters the algorithm starts with. Its data_marix
-                must be of the shape (n_clusters, fdatagrid.ncol,
-                fdatagrid.dim_codomain).
-                Defaults to None, and the centers are initialized randomly.
+            init (FData or string, optional): Contains the initial centers of
+                the different clusters the algorithm starts with. Its
+                data_matrix must be of the shape (n_clusters, fdatagrid.ncol,
+                fdatagrid.dim_codomain), or be a FDataBasis with the basis of
+                the data and n_clusters samples if the data is a FDataBasis. It
+                can also be the method used to choose the initial centers among
+                the samples: 'random', 'k-means++', which chooses them with
+                probability proportional to their squared distance to the
+                nearest center already chosen, or 'k-means||', a scalable
+                variant of 'k-means++' for large datasets. Defaults to None,
+                and the centers are chosen randomly.
             metric (optional): functional data metric. Defaults to
                 *lp_distance*.
             n_init (int, optional): Number of time the k-means algorithm will
@@ -688,11 +1277,19 @@ class FuzzyCMeans(BaseKMeans):
                 deterministic. Defaults to 0.
             fuzzifier (int, optional): Scalar parameter used to specify the
                 degree of fuzziness in the fuzzy algorithm. Defaults to 2.
+            n_jobs (int or None, optional): The number of parallel jobs to run
+                the ``n_init`` executions of the algorithm. ``-1`` means using
+                all processors. If it is given, each execution uses its own
+                random state seeded from ``random_state``, so the results do
+                not depend on the number of jobs, but they differ from the
+                ones obtained with ``None``, the default, which runs the
+                executions one after another sharing ``random_state``.
 
         """
         super().__init__(n_clusters=n_clusters, init=init, metric=metric,
                          n_init=n_init,
-                         max_iter=max_iter, tol=tol, random_state=random_state)
+                         max_iter=max_iter, tol=tol, random_state=random_state,
+                         n_jobs=n_jobs)
 
         self.fuzzifier = fuzzifier
 
@@ -707,8 +1304,7 @@ class FuzzyCMeans(BaseKMeans):
     def _create_membership(self, n_samples):
         return np.empty((n_samples, self.n_clusters))
 
-    def _update(self, fdata, membership_matrix, distances_to_centroids,
-                centroids):
+    def _update_membership(self, membership_matrix, distances_to_centroids):
         # Divisions by zero allowed
         with np.errstate(divide='ignore'):
             distances_to_centers_raised = (distances_to_centroids ** (
@@ -724,12 +1320,338 @@ class FuzzyCMeans(BaseKMeans):
         # inf / inf divisions should be 1 in this context
         membership_matrix[np.isnan(membership_matrix)] = 1
 
+    def _update(self, fdata, membership_matrix, distances_to_centroids,
+                centroids):
+        self._update_membership(membership_matrix, distances_to_centroids)
+
         membership_matrix_raised = np.power(
             membership_matrix, self.fuzzifier)
 
-        slice_denominator = ((slice(None),) + (np.newaxis,) *
-                             (fdata.data_matrix.ndim - 1))
-        centroids.data_matrix[:] = (
-            np.einsum('ij,i...->j...', membership_matrix_raised,
-                      fdata.data_matrix)
-            / np.sum(membership_matrix_raised, axis=0)[slice_denominator])
+        _set_flat(centroids, (
+            membership_matrix_raised.T @ _to_multivariate(fdata)
+            / np.sum(membership_matrix_raised, axis=0)[:, np.newaxis]))
+
+    def _l2_update(self, X, membership_matrix, distances_to_centroids,
+                   centroids):
+        self._update_membership(membership_matrix, distances_to_centroids)
+
+        membership_matrix_raised = np.power(
+            membership_matrix, self.fuzzifier).astype(X.dtype)
+
+        return (membership_matrix_raised.T @ X
+                / np.sum(membership_matrix_raised, axis=0)[:, np.newaxis])
+
+
+class MiniBatchKMeans(BaseEstimator, ClusterMixin, TransformerMixin):
+    r"""Mini-batch K-Means clustering with the :math:`L_2` distance.
+
+    Variant of the :class:`KMeans` algorithm that updates the centroids using
+    small random batches of samples instead of the whole dataset. Each
+    centroid moves towards the mean of the samples of the batch assigned to
+    it, with a learning rate equal to the fraction of all the samples
+    assigned to it so far that belong to the batch, so that it is the mean of
+    all of them. Thus, the memory and time of each update only depend on the
+    size of the batch, and the model can be trained with a stream of data
+    using :meth:`partial_fit`.
+
+    The :math:`L_2` distance between functions is computed as an euclidean
+    distance between their data matrices, weighted with the quadrature of
+    the grid, or between their coefficients, weighted with a factor of the
+    Gram matrix of the basis in the case of a :class:`FDataBasis`. The
+    quadrature is the Simpson rule used by
+    :func:`~skfda.misc.metrics.lp_distance`, or the trapezoidal rule in the
+    grids in which some weight of the Simpson rule is negative.
+
+    Args:
+        n_clusters (int, optional): Number of groups into which the samples
+            are classified. Defaults to 2.
+        init (FData or string, optional): Initial centers of the clusters,
+            or method used to choose them among the samples: 'random' or
+            'k-means++'. Defaults to None, and the centers are chosen
+            randomly.
+        batch_size (int, optional): Number of samples of each batch in
+            :meth:`fit`. Defaults to 100.
+        max_iter (int, optional): Maximum number of passes over the
+            data in :meth:`fit`. Defaults to 100.
+        max_no_improvement (int, optional): Number of consecutive batches
+            without improvement of the smoothed inertia of the batches after
+            which :meth:`fit` stops. Defaults to 10.
+        random_state (int, RandomState instance or None, optional):
+            Determines random number generation for centroid initialization
+            and batch sampling. Use an int to make the randomness
+            deterministic. Defaults to 0.
+            See :term:`Glossary <random_state>`.
+
+    Attributes:
+        cluster_centers_ (FData): Centroids of the clusters, with the same
+            representation as the training data.
+        counts_ (numpy.ndarray): Number of samples assigned to each cluster
+            in the updates.
+        labels_ (numpy.ndarray): Cluster of each training sample. Only
+            computed by :meth:`fit`.
+        inertia_ (float): Sum of squared distances of the training samples
+            to their closest cluster center. Only computed by :meth:`fit`.
+        n_steps_ (int): Number of batches processed.
+
+    Examples:
+
+        >>> from skfda.datasets import make_multimodal_samples
+        >>> from skfda.ml.clustering import KMeans, MiniBatchKMeans
+        >>> fd = make_multimodal_samples(n_samples=1000, n_modes=1,
+        ...                              random_state=0)
+        >>> kmeans = MiniBatchKMeans(n_clusters=3, batch_size=50).fit(fd)
+        >>> kmeans.cluster_centers_.n_samples
+        3
+
+        The model can also be trained with a stream of batches.
+
+        >>> kmeans = MiniBatchKMeans(n_clusters=3)
+        >>> for i in range(0, 1000, 100):
+        ...     kmeans = kmeans.partial_fit(fd[i:i + 100])
+        >>> kmeans.predict(fd[:5]).shape
+        (5,)
+
+    """
+
+    def __init__(self, n_clusters=2, init=None, batch_size=100,
+                 max_iter=100, max_no_improvement=10, random_state=0):
+        self.n_clusters = n_clusters
+        self.init = init
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.max_no_improvement = max_no_improvement
+        self.random_state = random_state
+
+    def _to_fit_representation(self, X):
+        """Convert the data to the representation used in the fit."""
+        template = self.cluster_centers_
+
+        if isinstance(template, FDataBasis):
+            if not isinstance(X, FDataBasis) or X.basis != template.basis:
+                X = X.to_basis(template.basis)
+        elif isinstance(X, FDataBasis):
+            X = X.to_grid(template.grid_points)
+
+        return X
+
+    def _flatten(self, X):
+        """Matrix with the flattened data or coefficients of each sample."""
+        return _to_multivariate(self._to_fit_representation(X))
+
+    def _weigh(self, X):
+        """Flattened data in which the L2 distance is the euclidean one."""
+        return _weigh(X, self._factor)
+
+    def _set_centers(self, centers):
+        """Store the centroids, in the representation of the data."""
+        self._centers = centers
+        template = self.cluster_centers_
+        sample_names = (None,) * self.n_clusters
+
+        if isinstance(template, FDataBasis):
+            self.cluster_centers_ = template.copy(coefficients=centers,
+                                                  sample_names=sample_names)
+        else:
+            self.cluster_centers_ = template.copy(
+                data_matrix=centers.reshape(
+                    (self.n_clusters,) + template.data_matrix.shape[1:]),
+                sample_names=sample_names)
+
+    def _init_centers(self, X, random_state):
+        """Initialize the centroids with the first data seen."""
+        if self.n_clusters < 2:
+            raise ValueError(
+                "The number of clusters must be greater than 1.")
+
+        self._factor = _l2_factor(X)
+        if self._factor is None:
+            self._factor = _l2_factor(X, rule='trapezoid')
+
+        self.cluster_centers_ = X
+        flat = self._flatten(X).astype(float)
+
+        if self.init is not None and not isinstance(self.init, str):
+            centers = self._flatten(self.init).astype(float)
+
+            if len(centers) != self.n_clusters:
+                raise ValueError("The init FData should contain n_clusters "
+                                 "samples with the initial centers.")
+        else:
+            if len(flat) < self.n_clusters:
+                raise ValueError(f"The number of samples to initialize the "
+                                 f"centers ({len(flat)}) must be at least "
+                                 f"n_clusters ({self.n_clusters})")
+
+            # The centers are chosen among a subsample of the data
+            subsample = random_state.permutation(len(flat))[
+                :max(3 * self.batch_size, self.n_clusters)]
+            weighted = self._weigh(flat[subsample])
+
+            if self.init == 'k-means++':
+                indexes = _kmeans_plusplus_indexes(
+                    lambda i: np.linalg.norm(weighted - weighted[i], axis=1),
+                    n_samples=len(subsample), n_clusters=self.n_clusters,
+                    random_state=random_state)
+            elif self.init is None or self.init == 'random':
+                indexes = np.arange(self.n_clusters)
+            else:
+                raise ValueError(f"Unknown init method {self.init}, must be "
+                                 f"one of 'random' or 'k-means++'")
+
+            centers = flat[subsample[indexes]]
+
+        self._set_centers(centers.copy())
+        self.counts_ = np.zeros(self.n_clusters, dtype=int)
+        self.n_steps_ = 0
+
+    def _distances(self, flat):
+        """Distances between the flattened samples and the centroids."""
+        weighted = self._weigh(flat)
+        weighted_centers = self._weigh(self._centers)
+
+        return np.stack([np.linalg.norm(weighted - c, axis=1)
+                         for c in weighted_centers], axis=1)
+
+    def _step(self, flat):
+        """Update the centroids with a batch of flattened samples.
+
+        Returns:
+            (numpy.ndarray): Squared distances of the samples to their
+            closest centroid before the update.
+
+        """
+        weighted = self._weigh(flat)
+        distances = _l2_distances(weighted,
+                                  np.einsum('ij,ij->i', weighted, weighted),
+                                  self._weigh(self._centers))
+        labels = np.argmin(distances, axis=1)
+
+        sums, counts = _cluster_sums(flat, labels, self.n_clusters)
+        self.counts_ = self.counts_ + counts
+
+        # Each centroid is the mean of all the samples assigned to it
+        updated = counts > 0
+        centers = self._centers.copy()
+        centers[updated] += ((sums[updated]
+                              - counts[updated, np.newaxis]
+                              * centers[updated])
+                             / self.counts_[updated, np.newaxis])
+
+        self._set_centers(centers)
+        self.n_steps_ += 1
+
+        return distances[np.arange(len(flat)), labels] ** 2
+
+    def fit(self, X, y=None):
+        """Compute the clustering using random batches of the samples.
+
+        Args:
+            X (FDataGrid or FDataBasis): Training data.
+            y: Ignored.
+
+        Returns:
+            self
+
+        """
+        random_state = check_random_state(self.random_state)
+        self._init_centers(X, random_state)
+
+        flat = self._flatten(X).astype(float)
+        n_samples = len(flat)
+        batch_size = min(self.batch_size, n_samples)
+        n_steps = self.max_iter * n_samples // batch_size
+
+        # The inertia of the batches is smoothed with an exponentially
+        # weighted average, to decide when to stop
+        alpha = min(2 * batch_size / (n_samples + 1), 1)
+        smoothed_inertia = None
+        best_inertia = np.inf
+        n_no_improvement = 0
+
+        for _ in range(n_steps):
+            batch = random_state.randint(0, n_samples, batch_size)
+            batch_inertia = np.mean(self._step(flat[batch]))
+
+            if smoothed_inertia is None:
+                smoothed_inertia = batch_inertia
+            else:
+                smoothed_inertia += alpha * (batch_inertia
+                                             - smoothed_inertia)
+
+            if smoothed_inertia < best_inertia:
+                best_inertia = smoothed_inertia
+                n_no_improvement = 0
+            else:
+                n_no_improvement += 1
+
+            if n_no_improvement >= self.max_no_improvement:
+                break
+
+        distances = self._distances(flat)
+        self.labels_ = np.argmin(distances, axis=1)
+        self.inertia_ = np.sum(
+            distances[np.arange(n_samples), self.labels_] ** 2)
+
+        return self
+
+    def partial_fit(self, X, y=None):
+        """Update the centroids with a single batch of samples.
+
+        The centroids are initialized with the first batch.
+
+        Args:
+            X (FDataGrid or FDataBasis): Batch of samples.
+            y: Ignored.
+
+        Returns:
+            self
+
+        """
+        if not hasattr(self, '_centers'):
+            self._random_state = check_random_state(self.random_state)
+            self._init_centers(X, self._random_state)
+
+        self._step(self._flatten(X).astype(float))
+
+        return self
+
+    def transform(self, X):
+        """Compute the distances of the samples to the centroids.
+
+        Args:
+            X (FDataGrid or FDataBasis): Samples.
+
+        Returns:
+            (numpy.ndarray): Array with shape (n_samples, n_clusters) with
+            the distances of each sample to each centroid.
+
+        """
+        check_is_fitted(self, 'cluster_centers_')
+
+        return self._distances(self._flatten(X))
+
+    def predict(self, X):
+        """Predict the closest cluster of each sample.
+
+        Args:
+            X (FDataGrid or FDataBasis): Samples.
+
+        Returns:
+            (numpy.ndarray): Cluster of each sample.
+
+        """
+        return np.argmin(self.transform(X), axis=1)
+
+    def score(self, X, y=None):
+        """Opposite of the value of X on the K-means objective.
+
+        Args:
+            X (FDataGrid or FDataBasis): Samples.
+            y: Ignored.
+
+        Returns:
+            (float): Opposite of the sum of squared distances of the samples
+            to their closest centroid.
+
+        """
+        return -np.sum(np.min(self.transform(X), axis=1) ** 2)
@@ -1,3 +1,4 @@
-from . import registration
-from . import smoothing
-from . import dim_reduction
+from .._utils import _lazy_submodules
+
+__getattr__, __dir__ = _lazy_submodules(
+    __name__, ["registration", "smoothing", "dim_reduction"])
@@ -1,2 +1,4 @@
-from . import projection
-from . import variable_selection
+from ..._utils import _lazy_submodules
+
+__getattr__, __dir__ = _lazy_submodules(
+    __name__, ["projection", "variable_selection"])
@@ -1,5 +1,4 @@
 
-from fdasrsf.utility_functions import optimum_reparam
 import scipy.integrate
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.utils.validation import check_is_fitted
@@ -257,6 +256,8 @@ def _elastic_alignment_array(template_data, q_data,
         the functions aligned to the template(s).
     """
 
+    from fdasrsf.utility_functions import optimum_reparam
+
     return optimum_reparam(np.ascontiguousarray(template_data.T),
                            np.ascontiguousarray(eval_points),
                            np.ascontiguousarray(q_data.T),
@@ -4,7 +4,10 @@
 This module contains the class for the basis smoothing.
 
 """
+import collections
 from enum import Enum
+import hashlib
+import pickle
 from typing import Union, Iterable
 
 import scipy.linalg
@@ -20,42 +23,50 @@ from ._linear import _LinearSmoother
 class _Cholesky():
     """Solve the linear equation using cholesky factorization"""
 
-    def __call__(self, *, basis_values, weight_matrix, data_matrix,
-                 penalty_matrix, **_):
+    def factorize(self, *, basis_values, weight_matrix, penalty_matrix,
+                  **_):
+        """Return a function that computes the coefficients from the data"""
 
         common_matrix = basis_values.T
 
         if weight_matrix is not None:
-            common_matrix @= weight_matrix
+            common_matrix = common_matrix @ weight_matrix
 
-        right_matrix = common_matrix @ data_matrix
         left_matrix = common_matrix @ basis_values
 
         # Adds the roughness penalty to the equation
         if penalty_matrix is not None:
             left_matrix += penalty_matrix
 
-        coefficients = scipy.linalg.cho_solve(scipy.linalg.cho_factor(
-            left_matrix, lower=True), right_matrix)
+        factorization = scipy.linalg.cho_factor(left_matrix, lower=True)
 
-        # The ith column is the coefficients of the ith basis for each
-        #  sample
-        coefficients = coefficients.T
+        def solve(data_matrix):
+            right_matrix = common_matrix @ data_matrix
 
-        return coefficients
+            # The ith column is the coefficients of the ith basis for each
+            #  sample
+            return scipy.linalg.cho_solve(factorization, right_matrix).T
+
+        return solve
+
+    def __call__(self, *, data_matrix, **kwargs):
+        return self.factorize(**kwargs)(data_matrix)
 
 
 class _QR():
     """Solve the linear equation using qr factorization"""
 
-    def __call__(self, *, basis_values, weight_matrix, data_matrix,
-                 penalty_matrix, **_):
+    def factorize(self, *, basis_values, weight_matrix, penalty_matrix,
+                  **_):
+        """Return a function that computes the coefficients from the data"""
+
+        upper = None
+        n_points = basis_values.shape[0]
 
         if weight_matrix is not None:
-            # Decompose W in U'U and calculate UW and Uy
+            # Decompose W in U'U and calculate UW
             upper = scipy.linalg.cholesky(weight_matrix)
             basis_values = upper @ basis_values
-            data_matrix = upper @ data_matrix
 
         if not np.all(penalty_matrix == 0):
             w, v = np.linalg.eigh(penalty_matrix)
@@ -67,16 +78,12 @@ class _QR():
 
             penalty_matrix = v @ np.diag(np.sqrt(w))
             # Augment the basis matrix with the square root of the
-            # penalty matrix
+            # penalty matrix. The data matrix would be augmented by zeros,
+            # so those rows of Q do not contribute to the solution.
             basis_values = np.concatenate([
                 basis_values,
                 penalty_matrix.T],
                 axis=0)
-            # Augment data matrix by n zeros
-            data_matrix = np.pad(data_matrix,
-                                 ((0, len(v)),
-                                  (0, 0)),
-                                 mode='constant')
 
         # Resolves the equation
         # B.T @ B @ C = B.T @ D
@@ -84,15 +91,40 @@ class _QR():
 
         # B = Q @ R
         q, r = np.linalg.qr(basis_values)
-        right_matrix = q.T @ data_matrix
+        q_t = q[:n_points].T
+
+        if upper is not None:
+            q_t = q_t @ upper
+
+        def solve(data_matrix):
+            # R @ C = Q.T @ D
+            coefficients = scipy.linalg.solve_triangular(
+                r, q_t @ data_matrix)
+
+            # The ith column is the coefficients of the ith basis for each
+            # sample
+            return coefficients.T
 
-        # R @ C = Q.T @ D
-        coefficients = np.linalg.solve(r, right_matrix)
-        # The ith column is the coefficients of the ith basis for each
-        # sample
-        coefficients = coefficients.T
+        return solve
 
-        return coefficients
+    def __call__(self, *, data_matrix, **kwargs):
+        return self.factorize(**kwargs)(data_matrix)
+
+
+def _fingerprint(obj):
+    """Return a hashable digest of an object, or None if not possible"""
+    try:
+        if isinstance(obj, np.ndarray):
+            obj = (obj.shape, obj.dtype.str, np.ascontiguousarray(obj))
+        return hashlib.sha1(pickle.dumps(obj)).hexdigest()
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+# Factorizations shared by all the smoothers, so that projecting several
+# batches of data sampled in the same grid only costs one solve per batch
+_SOLVER_CACHE_SIZE = 32
+_solver_cache = collections.OrderedDict()
 
 
 class _Matrix():
@@ -350,7 +382,7 @@ class BasisSmoother(_LinearSmoother):
 
         right_side = basis_values_input.T
         if self.weights is not None:
-            right_side @= self.weights
+            right_side = right_side @ self.weights
 
         return np.linalg.solve(
             ols_matrix, right_side)
@@ -362,6 +394,84 @@ class BasisSmoother(_LinearSmoother):
 
         return basis_values_output @ self._coef_matrix(input_points)
 
+    def _solver(self, method):
+        """Return a function that computes the coefficients from the data.
+
+        The function is cached using a fingerprint of the basis, the input
+        points, the weights and the regularization, so it can be reused
+        between calls over data sampled in the same grid.
+
+        """
+        key = tuple(_fingerprint(obj) for obj in (
+            self.basis, tuple(self.input_points_), self.weights,
+            self.smoothing_parameter, self.regularization, method))
+
+        cacheable = None not in key
+
+        if cacheable:
+            solver = _solver_cache.get(key)
+            if solver is not None:
+                _solver_cache.move_to_end(key)
+                return solver
+
+        solver = self._compute_solver(method)
+
+        if cacheable:
+            _solver_cache[key] = solver
+            if len(_solver_cache) > _SOLVER_CACHE_SIZE:
+                _solver_cache.popitem(last=False)
+
+        return solver
+
+    def _compute_solver(self, method):
+        from ...misc.regularization import compute_penalty_matrix
+
+        penalty_matrix = compute_penalty_matrix(
+            basis_iterable=(self.basis,),
+            regularization_parameter=self.smoothing_parameter,
+            regularization=self.regularization)
+
+        # Each basis in a column
+        basis_values = self.basis.evaluate(
+            _cartesian_product(self.input_points_)).reshape(
+            (self.basis.n_basis, -1)).T
+
+        # If no weight matrix is given all the weights are one
+        weight_matrix = self.weights
+
+        # We need to solve the equation
+        # (phi' W phi + lambda * R) C = phi' W Y
+        # where:
+        #  phi is the basis_values
+        #  W is the weight matrix
+        #  lambda the smoothness parameter
+        #  C the coefficient matrix (the unknown)
+        #  Y is the data_matrix
+
+        if(basis_values.shape[0] > self.basis.n_basis
+           or self.smoothing_parameter > 0):
+
+            # The method is used to compute the coefficients
+            return method.factorize(basis_values=basis_values,
+                                    weight_matrix=weight_matrix,
+                                    penalty_matrix=penalty_matrix)
+
+        elif basis_values.shape[0] == self.basis.n_basis:
+            # If the number of basis equals the number of points and no
+            # smoothing is required
+            factorization = scipy.linalg.lu_factor(basis_values)
+
+            def solve(data_matrix):
+                return scipy.linalg.lu_solve(factorization, data_matrix).T
+
+            return solve
+
+        else:  # basis_values.shape[0] < basis.n_basis
+            raise ValueError(f"The number of basis functions "
+                             f"({self.basis.n_basis}) "
+                             f"exceed the number of points to be smoothed "
+                             f"({basis_values.shape[0]}).")
+
     def fit(self, X: FDataGrid, y=None):
         """Compute the hat matrix for the desired output points.
 
@@ -397,18 +507,11 @@ class BasisSmoother(_LinearSmoother):
             self (object)
 
         """
-        from ...misc.regularization import compute_penalty_matrix
-
         self.input_points_ = X.grid_points
         self.output_points_ = (self.output_points
                                if self.output_points is not None
                                else self.input_points_)
 
-        penalty_matrix = compute_penalty_matrix(
-            basis_iterable=(self.basis,),
-            regularization_parameter=self.smoothing_parameter,
-            regularization=self.regularization)
-
         # n is the samples
         # m is the observations
         # k is the number of elements of the basis
@@ -416,50 +519,16 @@ class BasisSmoother(_LinearSmoother):
         # Each sample in a column (m x n)
         data_matrix = X.data_matrix.reshape((X.n_samples, -1)).T
 
-        # Each basis in a column
-        basis_values = self.basis.evaluate(
-            _cartesian_product(self.input_points_)).reshape(
-            (self.basis.n_basis, -1)).T
-
-        # If no weight matrix is given all the weights are one
-        weight_matrix = self.weights
-
-        # We need to solve the equation
-        # (phi' W phi + lambda * R) C = phi' W Y
-        # where:
-        #  phi is the basis_values
-        #  W is the weight matrix
-        #  lambda the smoothness parameter
-        #  C the coefficient matrix (the unknown)
-        #  Y is the data_matrix
-
-        if(data_matrix.shape[0] > self.basis.n_basis
-           or self.smoothing_parameter > 0):
-
-            method = self._method_function()
-
-            # If the method provides the complete transformation use it
-            method_fit_transform = getattr(method, "fit_transform", None)
-            if method_fit_transform is not None:
-                return method_fit_transform(estimator=self, X=X, y=y)
-
-            # Otherwise the method is used to compute the coefficients
-            coefficients = method(estimator=self,
-                                  basis_values=basis_values,
-                                  weight_matrix=weight_matrix,
-                                  data_matrix=data_matrix,
-                                  penalty_matrix=penalty_matrix)
+        method = self._method_function()
 
-        elif data_matrix.shape[0] == self.basis.n_basis:
-            # If the number of basis equals the number of points and no
-            # smoothing is required
-            coefficients = np.linalg.solve(basis_values, data_matrix).T
+        # If the method provides the complete transformation use it
+        method_fit_transform = getattr(method, "fit_transform", None)
+        if method_fit_transform is not None and (
+                data_matrix.shape[0] > self.basis.n_basis
+                or self.smoothing_parameter > 0):
+            return method_fit_transform(estimator=self, X=X, y=y)
 
-        else:  # data_matrix.shape[0] < basis.n_basis
-            raise ValueError(f"The number of basis functions "
-                             f"({self.basis.n_basis}) "
-                             f"exceed the number of points to be smoothed "
-                             f"({data_matrix.shape[0]}).")
+        coefficients = self._solver(method)(data_matrix)
 
         fdatabasis = FDataBasis(
             basis=self.basis, coefficients=coefficients,
@@ -3,6 +3,6 @@ from . import extrapolation
 from . import grid
 from . import interpolation
 from ._evaluation_trasformer import EvaluationTransformer
-from ._functional_data import FData
+from ._functional_data import FData, group_reduce
 from .basis import FDataBasis
 from .grid import FDataGrid
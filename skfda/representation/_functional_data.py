@@ -297,6 +297,21 @@ class FData(ABC, pandas.api.extensions.ExtensionArray):
         """
         pass
 
+    def _evaluate_grid(self, axes, *, extrapolation=None, aligned=True):
+        """Evaluate the object in the cartesian grid spanned by the axes.
+
+        Subclasses may override this method to exploit the structure of the
+        grid. See :meth:`evaluate` for the description of the parameters.
+
+        """
+        return _evaluate_grid(axes,
+                              evaluate_method=self.evaluate,
+                              n_samples=self.n_samples,
+                              dim_domain=self.dim_domain,
+                              dim_codomain=self.dim_codomain,
+                              extrapolation=extrapolation,
+                              aligned=aligned)
+
     def evaluate(self, eval_points, *, derivative=0, extrapolation=None,
                  grid=False, aligned=True):
         """Evaluate the object or its derivatives at a list of values or
@@ -338,13 +353,9 @@ class FData(ABC, pandas.api.extensions.ExtensionArray):
                 aligned=aligned)
 
         if grid:  # Evaluation of a grid performed in auxiliar function
-            return _evaluate_grid(eval_points,
-                                  evaluate_method=self.evaluate,
-                                  n_samples=self.n_samples,
-                                  dim_domain=self.dim_domain,
-                                  dim_codomain=self.dim_codomain,
-                                  extrapolation=extrapolation,
-                                  aligned=aligned)
+            return self._evaluate_grid(eval_points,
+                                       extrapolation=extrapolation,
+                                       aligned=aligned)
 
         if extrapolation is None:
             extrapolation = self.extrapolation
@@ -575,6 +586,19 @@ class FData(ABC, pandas.api.extensions.ExtensionArray):
         return (self.sum(axis=axis, out=out, keepdims=keepdims, skipna=skipna)
                 / self.n_samples)
 
+    @abstractmethod
+    def _group_reduce(self, group_codes, how, *, n_groups, skipna=False,
+                      min_count=0, ddof=0):
+        """Reduce the samples of each group.
+
+        See :func:`group_reduce` for the description of the parameters.
+
+        Returns:
+            FData: A FData object with one sample per group.
+
+        """
+        pass
+
     @abstractmethod
     def to_grid(self, grid_points=None):
         """Return the discrete representation of the object.
@@ -894,6 +918,96 @@ class FData(ABC, pandas.api.extensions.ExtensionArray):
                    f"reduction '{name}'")
             raise TypeError(msg)
 
+    def _groupby_op(self, *, how, has_dropped_na, min_count, ngroups, ids,
+                    **kwargs):
+        """
+        Group-wise reduction hook used by pandas ``groupby``.
+
+        The supported reductions are computed for all groups at once with
+        :func:`group_reduce`, instead of reducing each group separately.
+
+        """
+        if how in _GROUP_REDUCTIONS:
+            return self._group_reduce(
+                ids, how,
+                n_groups=ngroups,
+                skipna=kwargs.get('skipna', True),
+                min_count=min_count,
+                ddof=kwargs.get('ddof', 1) if how == 'var' else 0)
+
+        return super()._groupby_op(
+            how=how, has_dropped_na=has_dropped_na, min_count=min_count,
+            ngroups=ngroups, ids=ids, **kwargs)
+
+
+_GROUP_REDUCTIONS = ('sum', 'mean', 'var', 'min', 'max')
+
+
+def group_reduce(fdata, group_codes, how='mean', *, n_groups=None,
+                 skipna=False, min_count=0, ddof=0):
+    """
+    Reduce the samples of a FData object by groups.
+
+    All the groups are computed at once, without building an intermediate
+    FData object per group.
+
+    Args:
+        fdata (:obj:`FData`): Functional data object.
+        group_codes (array_like): Integer code of the group of each sample,
+            between 0 and ``n_groups - 1``. Samples with a negative code are
+            ignored.
+        how (str, optional): Reduction to apply. One of ``'sum'``,
+            ``'mean'``, ``'var'``, ``'min'`` or ``'max'``. Defaults to
+            ``'mean'``.
+        n_groups (int, optional): Number of groups. By default it is the
+            maximum code plus one.
+        skipna (bool, optional): Whether to ignore missing values. Defaults
+            to False.
+        min_count (int, optional): Minimum number of valid values required
+            to compute the reduction. If there are fewer, the result is NaN.
+            Defaults to 0.
+        ddof (int, optional): Delta degrees of freedom of the variance.
+            Defaults to 0, as in :meth:`FDataGrid.var`.
+
+    Returns:
+        :obj:`FData`: FData object with one sample per group. The
+        reductions ``'var'``, ``'min'`` and ``'max'`` of a
+        :obj:`FDataBasis` are not in the span of its basis, and are
+        returned as a :obj:`FDataGrid` evaluated in the grid of
+        :meth:`FDataBasis.to_grid`.
+
+    Raises:
+        ValueError: If the reduction is not supported or the codes are not
+        valid.
+
+    Examples:
+
+        >>> from skfda import FDataGrid
+        >>> from skfda.representation import group_reduce
+        >>> fd = FDataGrid([[1, 2, 3], [3, 4, 5], [10, 10, 10]])
+        >>> group_reduce(fd, [0, 0, 1])
+        FDataGrid(
+            array([[[  2.],
+                    [  3.],
+                    [  4.]],
+        <BLANKLINE>
+                   [[ 10.],
+                    [ 10.],
+                    [ 10.]]]),
+            ...)
+
+    """
+    if how not in _GROUP_REDUCTIONS:
+        raise ValueError(f"Invalid reduction: {how}")
+
+    group_codes = np.asarray(group_codes, dtype=np.intp)
+
+    if n_groups is None:
+        n_groups = np.max(group_codes, initial=-1) + 1
+
+    return fdata._group_reduce(group_codes, how, n_groups=n_groups,
+                               skipna=skipna, min_count=min_count, ddof=ddof)
+
 
 def concatenate(objects, as_coordinates=False):
     """
@@ -11,7 +11,7 @@ import warnings
 import numpy as np
 
 from ..._utils import (_domain_range, _same_domain,
-                       _reshape_eval_points)
+                       _reshape_eval_points, _cartesian_product)
 
 
 __author__ = "Miguel Carbajo Berrocal"
@@ -116,6 +116,27 @@ class Basis(ABC):
         return self._evaluate(eval_points).reshape(
             (self.n_basis, len(eval_points), self.dim_codomain))
 
+    def _evaluate_grid(self, coefs, axes):
+        """Evaluate linear combinations of the basis in a grid.
+
+        Args:
+            coefs (numpy.ndarray): Coefficients of the linear combinations,
+                with shape ``n_samples`` x ``n_basis``.
+            axes (tuple of numpy.ndarray): Points of the grid in each domain
+                dimension.
+
+        Returns:
+            (numpy.darray): Array with shape ``n_samples`` x ``len(axes[0])``
+            x ... x ``len(axes[-1])`` x ``dim_codomain`` with the values of
+            the linear combinations in the grid.
+
+        """
+        eval_points, shape = _cartesian_product(axes, return_shape=True)
+
+        res = np.tensordot(coefs, self.evaluate(eval_points), axes=(1, 0))
+
+        return res.reshape((len(coefs),) + shape[:-1] + (self.dim_codomain,))
+
     def __call__(self, *args, **kwargs):
         return self.evaluate(*args, **kwargs)
 
@@ -9,8 +9,10 @@ import pandas.api.extensions
 import numpy as np
 
 from .. import grid
-from ..._utils import constants, _int_to_real, _check_array_key
+from ..._utils import (constants, _int_to_real, _check_array_key,
+                       _group_reduce, _tuple_of_arrays)
 from .._functional_data import FData
+from ..extrapolation import _parse_extrapolation
 
 
 def _same_domain(one_domain_range, other_domain_range):
@@ -277,6 +279,28 @@ class FDataBasis(FData):
 
             return res_matrix
 
+    def _evaluate_grid(self, axes, *, extrapolation=None, aligned=True):
+
+        if aligned:
+            axes = _tuple_of_arrays(axes)
+
+            if extrapolation is None:
+                extrapolation = self.extrapolation
+            else:
+                extrapolation = _parse_extrapolation(extrapolation)
+
+            # The basis can evaluate the grid directly if no point
+            # needs to be extrapolated
+            if len(axes) == self.dim_domain and (
+                    extrapolation is None or all(
+                        np.all((bounds[0] <= a) & (a <= bounds[1]))
+                        for a, bounds in zip(axes, self.domain_range))):
+
+                return self.basis._evaluate_grid(self.coefficients, axes)
+
+        return super()._evaluate_grid(axes, extrapolation=extrapolation,
+                                      aligned=aligned)
+
     def shift(self, shifts, *, restrict_domain=False, extrapolation=None,
               eval_points=None, **kwargs):
         r"""Perform a shift of the curves.
@@ -407,6 +431,23 @@ class FDataBasis(FData):
         return self.copy(coefficients=coefs,
                          sample_names=(None,))
 
+    def _group_reduce(self, group_codes, how, *, n_groups, skipna=False,
+                      min_count=0, ddof=0):
+
+        if how not in ('sum', 'mean'):
+            # Non-linear reductions are not in the span of the basis, so
+            # they are computed and returned in a grid
+            return self.to_grid()._group_reduce(
+                group_codes, how, n_groups=n_groups, skipna=skipna,
+                min_count=min_count, ddof=ddof)
+
+        coefficients = _group_reduce(self.coefficients, group_codes, how,
+                                     n_groups=n_groups, skipna=skipna,
+                                     min_count=min_count)
+
+        return self.copy(coefficients=coefficients,
+                         sample_names=(None,) * n_groups)
+
     def gmean(self, eval_points=None):
         """Compute the geometric mean of the functional data object.
 
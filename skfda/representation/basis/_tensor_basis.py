@@ -96,20 +96,32 @@ class Tensor(Basis):
 
         return matrix
 
+    def _evaluate_grid(self, coefs, axes):
+
+        # Contract the coefficients with one univariate basis at a time,
+        # instead of evaluating the whole basis at every point of the grid
+        res = coefs.reshape(
+            (len(coefs),) + tuple(b.n_basis for b in self.basis_list))
+
+        for b, axis in zip(self.basis_list, axes):
+            res = np.tensordot(res, b.evaluate(axis)[..., 0], axes=(1, 0))
+
+        return res[..., np.newaxis]
+
     def _derivative_basis_and_coefs(self, coefs, order=1):
 
         pass
 
     def _gram_matrix(self):
 
-        gram_matrices = [b.gram_matrix().ravel() for b in self.basis_list]
+        gram_matrices = [b.gram_matrix() for b in self.basis_list]
 
         gram = gram_matrices[0]
 
         for g in gram_matrices[1:]:
-            gram = np.outer(gram, g).ravel()
+            gram = np.kron(gram, g)
 
-        return gram.reshape((self.n_basis, self.n_basis))
+        return gram
 
     def __eq__(self, other):
         return super().__eq__(other) and self.basis_list == other.basis_list
@@ -11,7 +11,6 @@ import numbers
 from typing import Any
 import warnings
 
-import findiff
 import pandas.api.extensions
 import scipy.stats.mstats
 
@@ -19,7 +18,8 @@ import numpy as np
 
 from . import basis as fdbasis
 from .._utils import (_tuple_of_arrays, constants,
-                      _domain_range, _int_to_real, _check_array_key)
+                      _domain_range, _int_to_real, _check_array_key,
+                      _group_reduce)
 from ._functional_data import FData
 from .interpolation import SplineInterpolation
 
@@ -428,6 +428,9 @@ class FDataGrid(FData):
         if order_list.ndim != 1 or len(order_list) != self.dim_domain:
             raise ValueError("The order for each partial should be specified.")
 
+        # Imported here because findiff pulls in sympy
+        import findiff
+
         operator = findiff.FinDiff(*[(1 + i, p, o)
                                      for i, (p, o) in enumerate(
                                          zip(self.grid_points, order_list))])
@@ -484,6 +487,16 @@ class FDataGrid(FData):
         return self.copy(data_matrix=data,
                          sample_names=(None,))
 
+    def _group_reduce(self, group_codes, how, *, n_groups, skipna=False,
+                      min_count=0, ddof=0):
+
+        data_matrix = _group_reduce(self.data_matrix, group_codes, how,
+                                    n_groups=n_groups, skipna=skipna,
+                                    min_count=min_count, ddof=ddof)
+
+        return self.copy(data_matrix=data_matrix,
+                         sample_names=(None,) * n_groups)
+
     def var(self):
         """Compute the variance of a set of samples in a FDataGrid object.
 
@@ -476,6 +476,36 @@ class TestBasisEvaluationTensor(unittest.TestCase):
 
         np.testing.assert_allclose(fd.coefficients, fd2.coefficients)
 
+    def test_tensor_evaluation_grid(self):
+
+        basis = Tensor([BSpline(n_basis=5),
+                        Fourier(n_basis=3, domain_range=(0, 2))])
+
+        fd = FDataBasis(basis=basis,
+                        coefficients=np.arange(30).reshape(2, 15))
+
+        axes = [np.linspace(0, 1, 4), np.linspace(0, 2, 3)]
+
+        points = np.array([(x, y) for x in axes[0] for y in axes[1]])
+
+        res = fd(points).reshape(2, 4, 3, 1)
+
+        np.testing.assert_allclose(fd(axes, grid=True), res)
+
+        # Extrapolated points use the general evaluation
+        axes = [np.array([0.5, 1.5]), np.array([1.])]
+        fd.extrapolation = "zeros"
+
+        np.testing.assert_allclose(fd(axes, grid=True)[:, 1], 0)
+
+    def test_tensor_gram_matrix(self):
+
+        basis = Tensor([Monomial(n_basis=3),
+                        Monomial(n_basis=2, domain_range=(0, 2))])
+
+        np.testing.assert_allclose(
+            basis.gram_matrix(), basis._gram_matrix_numerical())
+
 
 if __name__ == '__main__':
     print()
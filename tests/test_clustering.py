@@ -1,8 +1,18 @@
-from skfda.ml.clustering import KMeans, FuzzyCMeans
+from skfda.datasets import make_multimodal_samples, make_sinusoidal_process
+from skfda.misc.metrics import (amplitude_distance, lp_distance,
+                                pairwise_distance)
+from skfda.ml.clustering import (KMeans, FuzzyCMeans, MiniBatchKMeans,
+                                 AgglomerativeClustering)
+from skfda.representation.basis import BSpline
 from skfda.representation.grid import FDataGrid
+from joblib import parallel_backend
+from sklearn.base import clone
+import tempfile
 import unittest
 
 import numpy as np
+from scipy.cluster.hierarchy import linkage
+from scipy.spatial.distance import squareform
 
 
 class TestClustering(unittest.TestCase):
@@ -36,6 +46,250 @@ class TestClustering(unittest.TestCase):
         np.testing.assert_allclose(kmeans.score(fd), np.array([-20.33333333]))
         np.testing.assert_array_equal(kmeans.n_iter_, np.array([3.]))
 
+    def test_kmeans_elastic_pruning(self):
+        fd = make_sinusoidal_process(n_samples=12, n_features=30,
+                                     amplitude_std=1, error_std=0,
+                                     random_state=0)
+
+        def unpruned_distance(fdata1, fdata2):
+            return amplitude_distance(fdata1, fdata2)
+
+        kmeans = KMeans(n_clusters=3, metric=amplitude_distance,
+                        random_state=0).fit(fd)
+        kmeans_unpruned = KMeans(n_clusters=3, metric=unpruned_distance,
+                                 random_state=0).fit(fd)
+
+        self.assertGreater(kmeans.n_pruned_distances_, 0)
+        self.assertEqual(kmeans_unpruned.n_pruned_distances_, 0)
+        np.testing.assert_array_equal(kmeans.labels_, kmeans_unpruned.labels_)
+        np.testing.assert_allclose(
+            kmeans.cluster_centers_.data_matrix,
+            kmeans_unpruned.cluster_centers_.data_matrix)
+        np.testing.assert_allclose(kmeans.transform(fd),
+                                   kmeans_unpruned.transform(fd))
+        np.testing.assert_array_equal(kmeans.predict(fd), kmeans.labels_)
+
+    def test_kmeans_elkan(self):
+        fd = make_multimodal_samples(n_samples=100, n_modes=1, noise=.05,
+                                     random_state=0)
+
+        for n_clusters in (2, 5):
+            kmeans = KMeans(n_clusters=n_clusters).fit(fd)
+            kmeans_elkan = KMeans(n_clusters=n_clusters,
+                                  algorithm='elkan').fit(fd)
+
+            self.assertGreater(kmeans_elkan.n_pruned_distances_, 0)
+            np.testing.assert_array_equal(kmeans_elkan.labels_,
+                                          kmeans.labels_)
+            np.testing.assert_allclose(
+                kmeans_elkan.cluster_centers_.data_matrix,
+                kmeans.cluster_centers_.data_matrix)
+            np.testing.assert_allclose(kmeans_elkan.transform(fd),
+                                       kmeans.transform(fd))
+            np.testing.assert_allclose(kmeans_elkan.inertia_,
+                                       kmeans.inertia_)
+            self.assertEqual(kmeans_elkan.n_iter_, kmeans.n_iter_)
+
+        with np.testing.assert_raises(ValueError):
+            KMeans(algorithm='unknown').fit(fd)
+
+    def test_l2_engine(self):
+        fd = make_multimodal_samples(n_samples=60, n_modes=1, dim_codomain=2,
+                                     noise=.05, random_state=0)
+
+        # A different function object uses the generic metric path
+        def generic_l2(fdata1, fdata2):
+            return lp_distance(fdata1, fdata2)
+
+        for cls in (KMeans, FuzzyCMeans):
+            estimator = cls(n_clusters=3).fit(fd)
+            estimator_generic = cls(n_clusters=3, metric=generic_l2).fit(fd)
+
+            np.testing.assert_allclose(estimator.labels_,
+                                       estimator_generic.labels_,
+                                       rtol=1e-6, atol=1e-10)
+            np.testing.assert_allclose(
+                estimator.cluster_centers_.data_matrix,
+                estimator_generic.cluster_centers_.data_matrix,
+                rtol=1e-6, atol=1e-10)
+            np.testing.assert_allclose(estimator.transform(fd),
+                                       estimator_generic.transform(fd))
+            np.testing.assert_allclose(estimator.inertia_,
+                                       estimator_generic.inertia_)
+            self.assertEqual(estimator.n_iter_, estimator_generic.n_iter_)
+
+        # Single precision data is clustered in single precision
+        fd32 = fd.copy(data_matrix=fd.data_matrix.astype(np.float32))
+        kmeans = KMeans(n_clusters=3).fit(fd32)
+        self.assertEqual(kmeans.cluster_centers_.data_matrix.dtype,
+                         np.float32)
+        np.testing.assert_array_equal(kmeans.labels_,
+                                      KMeans(n_clusters=3).fit(fd).labels_)
+
+    def test_kmeans_init_methods(self):
+        random_state = np.random.RandomState(0)
+        modes_location = (np.repeat(np.linspace(-.8, .8, 4), 25)
+                          + random_state.normal(0, .02, 100))
+        fd = make_multimodal_samples(n_samples=100,
+                                     modes_location=modes_location,
+                                     noise=.05, random_state=0)
+        labels = np.repeat(np.arange(4), 25)
+
+        for init in ('k-means++', 'k-means||'):
+            kmeans = KMeans(n_clusters=4, init=init, random_state=0).fit(fd)
+
+            # The separated groups are found
+            self.assertEqual(len(np.unique(kmeans.labels_)), 4)
+            self.assertEqual(len(np.unique(kmeans.labels_ * 4 + labels)), 4)
+
+        with np.testing.assert_raises(ValueError):
+            KMeans(init='unknown').fit(fd)
+
+    def test_kmeans_n_jobs(self):
+        fd = make_multimodal_samples(n_samples=50, n_modes=1, noise=.05,
+                                     random_state=0)
+
+        for cls in (KMeans, FuzzyCMeans):
+            # The results do not depend on the number of jobs. Threads are
+            # used, so that no process pool outlives the tests
+            estimator = cls(n_clusters=3, n_init=4, random_state=0,
+                            n_jobs=1).fit(fd)
+            with parallel_backend('threading'):
+                estimator_parallel = cls(n_clusters=3, n_init=4,
+                                         random_state=0, n_jobs=2).fit(fd)
+
+            np.testing.assert_allclose(estimator_parallel.labels_,
+                                       estimator.labels_)
+            np.testing.assert_allclose(estimator_parallel.inertia_,
+                                       estimator.inertia_)
+
+    def test_minibatch_kmeans(self):
+        random_state = np.random.RandomState(0)
+        modes_location = (np.repeat(np.linspace(-.8, .8, 4), 100)
+                          + random_state.normal(0, .02, 400))
+        fd = make_multimodal_samples(n_samples=400,
+                                     modes_location=modes_location,
+                                     noise=.05, random_state=0)
+        labels = np.repeat(np.arange(4), 100)
+        order = random_state.permutation(400)
+
+        kmeans = KMeans(n_clusters=4, init='k-means++').fit(fd)
+        minibatch = MiniBatchKMeans(n_clusters=4, init='k-means++',
+                                    batch_size=50).fit(fd)
+
+        # The separated groups are found
+        self.assertEqual(len(np.unique(minibatch.labels_ * 4 + labels)), 4)
+        np.testing.assert_array_equal(minibatch.predict(fd),
+                                      minibatch.labels_)
+        np.testing.assert_allclose(minibatch.inertia_, kmeans.inertia_,
+                                   rtol=1e-2)
+        np.testing.assert_allclose(-minibatch.score(fd), minibatch.inertia_)
+        self.assertEqual(minibatch.transform(fd).shape, (400, 4))
+
+        # Stream of batches
+        minibatch = MiniBatchKMeans(n_clusters=4, init='k-means++')
+        for batch in np.split(order, 8):
+            minibatch.partial_fit(fd[batch])
+
+        self.assertEqual(minibatch.n_steps_, 8)
+        self.assertEqual(np.sum(minibatch.counts_), 400)
+        self.assertEqual(
+            len(np.unique(minibatch.predict(fd) * 4 + labels)), 4)
+
+        # Coefficients of a basis
+        fd_basis = fd.to_basis(BSpline(n_basis=10))
+        minibatch = MiniBatchKMeans(n_clusters=4, init='k-means++',
+                                    batch_size=50).fit(fd_basis)
+
+        self.assertEqual(minibatch.cluster_centers_.basis, fd_basis.basis)
+        self.assertEqual(len(np.unique(minibatch.labels_ * 4 + labels)), 4)
+        np.testing.assert_array_equal(minibatch.predict(fd),
+                                      minibatch.labels_)
+
+        # Grid in which the Simpson rule has negative weights: the
+        # distances use the trapezoidal rule
+        grid_points = [0, .01, 1, 1.01, 2, 3]
+        fd_irregular = FDataGrid(random_state.normal(size=(20, 6)),
+                                 grid_points)
+        minibatch = MiniBatchKMeans(n_clusters=2,
+                                    random_state=0).fit(fd_irregular)
+        centers = minibatch.cluster_centers_.data_matrix[..., 0]
+        distances = np.sqrt(np.trapz(
+            (fd_irregular.data_matrix[..., 0][:, np.newaxis]
+             - centers) ** 2, x=grid_points, axis=-1))
+        np.testing.assert_allclose(minibatch.transform(fd_irregular),
+                                   distances)
+
+    def test_kmeans_basis(self):
+        fd_basis = make_multimodal_samples(n_samples=100, random_state=0
+                                           ).to_basis(BSpline(n_basis=15))
+        grid_points = np.linspace(*fd_basis.domain_range[0], 1000)
+        fd = fd_basis.to_grid(grid_points)
+
+        for estimator in (KMeans(n_clusters=3, init='k-means++'),
+                          FuzzyCMeans(n_clusters=3, init='k-means++')):
+            # The clustering of the coefficients is the clustering of the
+            # functions in L2
+            estimator_basis = clone(estimator).fit(fd_basis)
+            estimator_grid = clone(estimator).fit(fd)
+
+            self.assertEqual(estimator_basis.cluster_centers_.basis,
+                             fd_basis.basis)
+            np.testing.assert_allclose(estimator_basis.labels_,
+                                       estimator_grid.labels_, atol=1e-6)
+            np.testing.assert_allclose(
+                estimator_basis.cluster_centers_.to_grid(
+                    grid_points).data_matrix,
+                estimator_grid.cluster_centers_.data_matrix, atol=1e-6)
+            np.testing.assert_allclose(estimator_basis.inertia_,
+                                       estimator_grid.inertia_, rtol=1e-6)
+            self.assertEqual(estimator_basis.n_iter_, estimator_grid.n_iter_)
+            np.testing.assert_allclose(estimator_basis.predict(fd_basis),
+                                       estimator_grid.predict(fd), atol=1e-6)
+
+        # Other metrics use the generic algorithm
+        kmeans = KMeans(n_clusters=3,
+                        metric=lambda x, y: lp_distance(x, y)).fit(fd_basis)
+        np.testing.assert_array_equal(
+            kmeans.labels_, KMeans(n_clusters=3).fit(fd_basis).labels_)
+
+        with np.testing.assert_raises(ValueError):
+            KMeans(n_clusters=3).fit(fd_basis).predict(fd)
+
+    def test_agglomerative_clustering(self):
+        fd = make_multimodal_samples(n_samples=60, n_modes=2, noise=.05,
+                                     random_state=0)
+        distances = squareform(pairwise_distance(lp_distance)(fd, fd),
+                               checks=False)
+
+        def generic_l2(fdata1, fdata2):
+            return lp_distance(fdata1, fdata2)
+
+        for method in ('ward', 'complete', 'average', 'single'):
+            linkage_matrix = linkage(distances, method)
+
+            estimators = [
+                AgglomerativeClustering(n_clusters=3, linkage=method),
+                AgglomerativeClustering(n_clusters=3, linkage=method,
+                                        block_size=7,
+                                        memmap_dir=tempfile.gettempdir())]
+            if method != 'ward':
+                estimators.append(AgglomerativeClustering(
+                    n_clusters=3, linkage=method, metric=generic_l2))
+
+            for estimator in estimators:
+                estimator.fit(fd)
+
+                # The hierarchy is the one of the dense distance matrix
+                np.testing.assert_array_equal(estimator.children_,
+                                              linkage_matrix[:, :2])
+                np.testing.assert_allclose(estimator.distances_,
+                                           linkage_matrix[:, 2])
+                self.assertEqual(len(np.unique(estimator.labels_)), 3)
+
+        with np.testing.assert_raises(ValueError):
+            AgglomerativeClustering(metric=generic_l2).fit(fd)
+
     # def test_kmeans_multivariate(self):
     #     data_matrix = [[[1, 0.3], [2, 0.4], [3, 0.5], [4, 0.6]],
     #                    [[2, 0.5], [3, 0.6], [4, 0.7], [5, 0.7]],
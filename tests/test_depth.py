@@ -1,7 +1,20 @@
 import skfda
-from skfda.exploratory.depth import IntegratedDepth, ModifiedBandDepth
+from skfda.exploratory.depth import (IntegratedDepth, ModifiedBandDepth,
+                                     BandDepth, DepthResult)
+from skfda.exploratory.depth._depth_result import _indices_descending_depth
+from skfda.exploratory.depth.multivariate import (
+    ProjectionDepth, SimplicialDepth, StahelDonohoOutlyingness)
+from skfda.exploratory.outliers import (IQROutlierDetector,
+                                        directional_outlyingness_stats)
+from skfda.exploratory.stats import depth_based_median, trim_mean
+from skfda.exploratory.visualization import Boxplot
+import itertools
 import unittest
 import numpy as np
+import scipy.integrate
+import scipy.optimize
+import scipy.special
+import scipy.stats
 
 
 class TestsDepthSameCurves(unittest.TestCase):
@@ -28,3 +41,299 @@ class TestsDepthSameCurves(unittest.TestCase):
 
         np.testing.assert_almost_equal(
             depth(self.fd), [1, 1, 1, 1, 1])
+
+    def test_band_depth_equal(self):
+
+        depth = BandDepth()
+
+        np.testing.assert_almost_equal(
+            depth(self.fd), [1, 1, 1, 1, 1])
+
+
+class TestsBandDepth(unittest.TestCase):
+
+    @staticmethod
+    def _brute_force_band_depth(X, distribution):
+        pairs = list(itertools.combinations(distribution, 2))
+
+        return np.array([
+            np.mean([np.all((np.minimum(f1, f2) <= x)
+                            & (x <= np.maximum(f1, f2)))
+                     for f1, f2 in pairs])
+            for x in X])
+
+    def test_band_depth_brute_force(self):
+        random_state = np.random.RandomState(0)
+
+        for n_points in (1, 10, 70):
+            # Many ties between the curves
+            data_matrix = random_state.randint(0, 4, size=(12, n_points))
+            data_matrix[1] = data_matrix[0]
+            data_matrix[:, 0] = 0
+            test_matrix = random_state.normal(1.5, 1, size=(5, n_points))
+
+            for distribution in (data_matrix,
+                                 random_state.normal(size=(12, n_points))):
+                fd = skfda.FDataGrid(distribution)
+                fd_test = skfda.FDataGrid(test_matrix)
+
+                np.testing.assert_allclose(
+                    BandDepth()(fd),
+                    self._brute_force_band_depth(distribution, distribution))
+                np.testing.assert_allclose(
+                    BandDepth()(fd_test, distribution=fd),
+                    self._brute_force_band_depth(test_matrix, distribution))
+
+    def test_band_depth_repeated_curves(self):
+        random_state = np.random.RandomState(0)
+
+        # Repeated curves, and curves touching others at some points
+        curves = random_state.normal(size=(50, 20))
+        curves[10:20, :5] = curves[0, :5]
+        distribution = np.concatenate((curves, curves[:30], curves[:10]))
+        fd = skfda.FDataGrid(distribution)
+
+        lower = np.minimum(distribution[:, np.newaxis],
+                           distribution[np.newaxis])
+        upper = np.maximum(distribution[:, np.newaxis],
+                           distribution[np.newaxis])
+        pairs = np.triu_indices(len(distribution), k=1)
+        expected = [
+            np.mean(np.all((lower <= x) & (x <= upper), axis=-1)[pairs])
+            for x in distribution]
+
+        np.testing.assert_allclose(BandDepth()(fd), expected)
+
+
+class TestsIntegratedDepthBlocks(unittest.TestCase):
+
+    def test_blocks_equal_full_prediction(self):
+        random_state = np.random.RandomState(0)
+        fd = skfda.FDataGrid(random_state.normal(size=(30, 50)))
+        fd_test = skfda.FDataGrid(random_state.normal(size=(40, 50)))
+
+        for depth_class in (IntegratedDepth, ModifiedBandDepth):
+            expected = depth_class()(fd_test, distribution=fd)
+
+            # Blocks of 8 samples
+            working_memory = 8 * 8 * 50 * 4 / 2**20
+            for n_jobs in (None, 2):
+                depth = depth_class(working_memory=working_memory,
+                                    n_jobs=n_jobs)
+                np.testing.assert_array_equal(
+                    depth(fd_test, distribution=fd), expected)
+
+
+class TestsSimplicialDepth(unittest.TestCase):
+
+    @staticmethod
+    def _brute_force_simplicial_depth(X, distribution):
+        dim = distribution.shape[-1]
+        simplices = list(itertools.combinations(distribution, dim + 1))
+
+        # Degenerate simplices contain the point if it is a nonnegative
+        # combination of their vertices
+        def contains(simplex, x):
+            matrix = np.vstack((np.transpose(simplex), np.ones(dim + 1)))
+            _, residual = scipy.optimize.nnls(matrix, np.append(x, 1))
+            return residual < 1e-8
+
+        return np.array([
+            np.mean([contains(simplex, x) for simplex in simplices])
+            for x in X])
+
+    def test_simplicial_depth_brute_force(self):
+        random_state = np.random.RandomState(0)
+
+        for dim, n_samples in ((2, 12), (3, 9)):
+            distribution = random_state.normal(size=(n_samples, dim))
+            X = np.concatenate((random_state.normal(size=(5, dim)),
+                                distribution[:3]))
+
+            np.testing.assert_allclose(
+                SimplicialDepth().fit(distribution).predict(X),
+                self._brute_force_simplicial_depth(X, distribution))
+
+    def test_min(self):
+        self.assertEqual(SimplicialDepth().min, 1 / 2)
+        self.assertEqual(
+            SimplicialDepth().fit(np.zeros((5, 2))).min, 0)
+
+    def test_simplicial_depth_degenerate(self):
+        random_state = np.random.RandomState(0)
+
+        for dim, n_samples in ((2, 10), (3, 8)):
+            # Integer points, with ties and collinear or coplanar points
+            distribution = random_state.randint(
+                -2, 3, size=(n_samples, dim)) * 0.1
+            X = np.concatenate((
+                random_state.randint(-2, 3, size=(5, dim)) * 0.1,
+                distribution[:3]))
+
+            np.testing.assert_allclose(
+                SimplicialDepth().fit(distribution).predict(X),
+                self._brute_force_simplicial_depth(X, distribution))
+
+        # Points in a plane, as with a constant coordinate
+        distribution = random_state.normal(size=(7, 3))
+        distribution[:, 2] = 1
+        X = np.concatenate((distribution[:3], [[0.1, 0.2, 1],
+                                               [0.1, 0.2, 0]]))
+
+        np.testing.assert_allclose(
+            SimplicialDepth().fit(distribution).predict(X),
+            self._brute_force_simplicial_depth(X, distribution))
+
+    def test_simplicial_depth_repeated_curves(self):
+        random_state = np.random.RandomState(0)
+
+        n_curves = 60
+        curves = random_state.normal(size=(n_curves, 4, 3))
+        n_samples = 2 * n_curves
+        data_matrix = np.concatenate((curves, curves))
+
+        # The tetrahedra with a vertex in the curve contain it, and each
+        # tetrahedron of four other curves appears 16 times. The ones with
+        # other repeated vertices are triangles not containing it
+        n_with_curve = (scipy.special.comb(n_samples, 4)
+                        - scipy.special.comb(n_samples - 2, 4))
+        n_without_curve = np.array([
+            SimplicialDepth().fit(np.delete(curves, i, axis=0)).predict(
+                curves[i:i + 1])[0] * scipy.special.comb(n_curves - 1, 4)
+            for i in range(n_curves)])
+        expected = ((n_with_curve + 16 * n_without_curve)
+                    / scipy.special.comb(n_samples, 4))
+
+        np.testing.assert_allclose(
+            SimplicialDepth().fit_predict(data_matrix),
+            np.concatenate((expected, expected)))
+
+    def test_modified_band_depth_vector_valued(self):
+        random_state = np.random.RandomState(0)
+
+        for dim in (2, 3):
+            data_matrix = random_state.normal(size=(8, 5, dim))
+            # The curves coincide in the first point
+            data_matrix[:, 0] = 0
+            fd = skfda.FDataGrid(data_matrix, np.linspace(0, 1, 5))
+
+            pointwise_depth = np.array([
+                self._brute_force_simplicial_depth(data_matrix[:, i],
+                                                   data_matrix[:, i])
+                for i in range(1, 5)]).T
+
+            np.testing.assert_allclose(
+                SimplicialDepth().fit_predict(fd.data_matrix),
+                np.hstack((np.ones((8, 1)), pointwise_depth)))
+            np.testing.assert_allclose(
+                ModifiedBandDepth()(fd),
+                scipy.integrate.simps(
+                    np.hstack((np.ones((8, 1)), pointwise_depth)),
+                    fd.grid_points[0]))
+
+
+class TestsProjectionDepth(unittest.TestCase):
+
+    def test_random_projections(self):
+        random_state = np.random.RandomState(0)
+        distribution = random_state.normal(size=(50, 4, 2))
+        X = random_state.normal(size=(10, 4, 2))
+
+        # Outlyingness with a fine grid of directions
+        angles = np.linspace(0, np.pi, 10000)
+        directions = np.stack((np.cos(angles), np.sin(angles)))
+        projections = distribution @ directions
+        location = np.median(projections, axis=0)
+        scale = scipy.stats.median_abs_deviation(projections, axis=0)
+        expected = np.max(np.abs(X @ directions - location) / scale,
+                          axis=-1)
+
+        outlyingness = StahelDonohoOutlyingness(
+            n_projections=500, random_state=0).fit(distribution)
+        approximation = outlyingness.predict(X)
+
+        np.testing.assert_allclose(approximation, expected, rtol=5e-2)
+
+        np.testing.assert_allclose(
+            ProjectionDepth(n_projections=500, random_state=0)(
+                X, distribution=distribution),
+            1 / (1 + approximation))
+
+    def test_projection_depth_vector_valued(self):
+        random_state = np.random.RandomState(0)
+        fd = skfda.FDataGrid(random_state.normal(size=(20, 5, 3)),
+                             np.linspace(0, 1, 5))
+
+        depth = IntegratedDepth(
+            multivariate_depth=ProjectionDepth(random_state=0))
+
+        np.testing.assert_array_equal(depth(fd), depth(fd))
+        self.assertEqual(depth(fd).shape, (20,))
+
+
+class TestsDepthResult(unittest.TestCase):
+
+    class _CountingDepth():
+
+        def __init__(self, depth_method):
+            self.depth_method = depth_method
+            self.n_calls = 0
+
+        def __call__(self, X, *, distribution=None):
+            self.n_calls += 1
+            return self.depth_method(X, distribution=distribution)
+
+    def test_indices_descending_depth(self):
+        random_state = np.random.RandomState(0)
+        depth = random_state.randint(0, 5, size=30) / 4
+
+        for n_samples in range(32):
+            np.testing.assert_array_equal(
+                _indices_descending_depth(depth, n_samples),
+                np.argsort(-depth, kind='stable')[:n_samples])
+
+    def test_shared_depth(self):
+        fd = skfda.datasets.make_gaussian_process(
+            n_samples=40, n_features=20, random_state=0)
+
+        counting_depth = self._CountingDepth(ModifiedBandDepth())
+        depth = DepthResult(fd, depth_method=counting_depth)
+
+        boxplot = Boxplot(fd, depth_method=depth)
+        expected_boxplot = Boxplot(fd)
+        np.testing.assert_array_equal(boxplot.median,
+                                      expected_boxplot.median)
+        np.testing.assert_array_equal(boxplot.outliers,
+                                      expected_boxplot.outliers)
+
+        np.testing.assert_array_equal(
+            IQROutlierDetector(depth_method=depth).fit_predict(fd),
+            IQROutlierDetector().fit_predict(fd))
+        np.testing.assert_array_equal(
+            depth_based_median(fd, depth_method=depth).data_matrix,
+            depth_based_median(fd).data_matrix)
+        np.testing.assert_allclose(
+            trim_mean(fd, 0.2, depth_method=depth).data_matrix,
+            trim_mean(fd, 0.2).data_matrix)
+
+        self.assertEqual(counting_depth.n_calls, 1)
+
+        # Other data is not cached
+        np.testing.assert_array_equal(depth(fd[:10]),
+                                      ModifiedBandDepth()(fd[:10]))
+        self.assertEqual(counting_depth.n_calls, 2)
+
+    def test_shared_pointwise_depth(self):
+        fd = skfda.datasets.make_gaussian_process(
+            n_samples=20, n_features=10, random_state=0)
+
+        counting_depth = self._CountingDepth(ProjectionDepth())
+        depth = DepthResult(fd.data_matrix, depth_method=counting_depth)
+
+        stats = directional_outlyingness_stats(fd, multivariate_depth=depth)
+        expected_stats = directional_outlyingness_stats(fd)
+
+        for value, expected in zip(stats, expected_stats):
+            np.testing.assert_array_equal(value, expected)
+
+        self.assertEqual(counting_depth.n_calls, 1)
@@ -1,4 +1,4 @@
-from skfda import FDataGrid, concatenate
+from skfda import FDataGrid, concatenate, group_reduce
 from skfda.exploratory import stats
 import unittest
 
@@ -48,6 +48,41 @@ class TestFDataGrid(unittest.TestCase):
             fd.grid_points,
             np.array([[0., 0.25, 0.5, 0.75, 1.]]))
 
+    def test_group_reduce(self):
+        fd = FDataGrid([[1, 2, 3], [2, 3, 5], [4, 4, 4], [0, 2, 0]])
+        codes = [1, 0, 1, -1]
+
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'sum').data_matrix[..., 0],
+            [[2, 3, 5], [5, 6, 7]])
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'mean').data_matrix[..., 0],
+            [[2, 3, 5], [2.5, 3, 3.5]])
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'var').data_matrix[..., 0],
+            [[0, 0, 0], [2.25, 1, 0.25]])
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'min').data_matrix[..., 0],
+            [[2, 3, 5], [1, 2, 3]])
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'max', n_groups=3).data_matrix[..., 0],
+            [[2, 3, 5], [4, 4, 4], [np.nan] * 3])
+
+    def test_group_reduce_skipna(self):
+        fd = FDataGrid([[1, np.nan, 3], [3, 3, np.nan], [5, 5, 5]])
+        codes = [0, 0, 1]
+
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'mean', skipna=True).data_matrix[..., 0],
+            [[2, 3, 3], [5, 5, 5]])
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'mean').data_matrix[..., 0],
+            [[2, np.nan, np.nan], [5, 5, 5]])
+        np.testing.assert_array_equal(
+            group_reduce(fd, codes, 'sum', skipna=True,
+                         min_count=2).data_matrix[..., 0],
+            [[4, np.nan, np.nan], [np.nan] * 3])
+
     def test_slice(self):
         t = (5, 3)
         fd = FDataGrid(data_matrix=np.ones(t))
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestImport(unittest.TestCase):
+    """Guard the startup time of ``import skfda``."""
+
+    heavy_modules = [
+        "matplotlib.pyplot",
+        "fdasrsf",
+        "rdata",
+        "dcor",
+        "findiff",
+        "skfda.datasets",
+        "skfda.exploratory",
+        "skfda.inference",
+        "skfda.misc",
+        "skfda.ml",
+        "skfda.preprocessing",
+    ]
+
+    def _loaded_modules(self, statement):
+        code = (f"import sys; {statement}; "
+                f"print(' '.join(m for m in {self.heavy_modules!r} "
+                f"if m in sys.modules))")
+
+        # close_fds=False lets subprocess use posix_spawn instead of
+        # forking the (multithreaded) test process
+        output = subprocess.run([sys.executable, "-c", code],
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True,
+                                close_fds=False,
+                                check=True).stdout
+
+        return output.split()
+
+    def test_import_skfda(self):
+        self.assertEqual(self._loaded_modules("import skfda"), [])
+
+    def test_import_ml(self):
+        loaded = self._loaded_modules("import skfda.ml")
+
+        for module in ("matplotlib.pyplot", "fdasrsf", "rdata", "dcor",
+                       "findiff"):
+            self.assertNotIn(module, loaded)
+
+    def test_lazy_attribute(self):
+        import skfda
+
+        self.assertIn("preprocessing", dir(skfda))
+        self.assertEqual(
+            skfda.preprocessing.smoothing.BasisSmoother.__name__,
+            "BasisSmoother")
+
+        with self.assertRaises(AttributeError):
+            skfda.nonexistent_module
+
+
+if __name__ == '__main__':
+    print()
+    unittest.main()
@@ -1,4 +1,8 @@
+import scipy.integrate
 import skfda
+from skfda._utils import nquad_gauss
+from skfda.misc.covariances import Brownian, Gaussian
+from skfda.misc.operators import IntegralTransform
 from skfda.representation.basis import Monomial, Tensor, VectorValued
 import unittest
 import numpy as np
@@ -40,6 +44,51 @@ class InnerProductTest(unittest.TestCase):
         np.testing.assert_allclose(
             skfda.misc.inner_product(fd_basis, fd_basis), res, rtol=1e-5)
 
+    def test_several_variables_numerical(self):
+
+        basis = Tensor([Monomial(n_basis=2, domain_range=(0, 1)),
+                        Monomial(n_basis=2, domain_range=(0, 2)),
+                        Monomial(n_basis=2, domain_range=(0, 3))])
+
+        # Function f(x, y, z) = x * y * z
+        fd_basis = skfda.FDataBasis(basis, [0] * 7 + [1])
+
+        np.testing.assert_allclose(
+            skfda.misc.inner_product(fd_basis, fd_basis,
+                                     force_numerical=True),
+            8, rtol=1e-8)
+
+    def test_gauss_integration_refinement(self):
+
+        def f(x):
+            return np.abs(x[:, 0] - 1 / 3) * x[:, 1]
+
+        integral, error = nquad_gauss(f, [(0, 1), (0, 2)])
+
+        np.testing.assert_allclose(integral, 5 / 9, rtol=1e-8)
+        self.assertLess(error, 1e-8)
+
+    def test_integral_transform(self):
+        fd = skfda.datasets.make_gaussian_process(
+            n_samples=2, n_features=15, random_state=0)
+        points = np.linspace(0, 1, 3)
+
+        for kernel in (Gaussian(), Brownian()):
+            with self.subTest(kernel=kernel):
+                self.assertEqual(kernel(np.zeros(4), points).shape, (4, 3))
+
+                def integral_body(t):
+                    return fd(t)[:, 0] * kernel(t, points)
+
+                expected = scipy.integrate.quad_vec(
+                    integral_body, *fd.domain_range[0])[0]
+
+                result = IntegralTransform(kernel)(fd)(points)
+
+                self.assertEqual(result.shape, (2, 3, 1))
+                np.testing.assert_allclose(result[..., 0], expected,
+                                           rtol=1e-6)
+
     def test_vector_valued(self):
 
         def f(x):
@@ -1,15 +1,20 @@
 """Test neighbors classifiers and regressors"""
 
+from skfda._neighbors import VPTree
 from skfda._neighbors.outlier import LocalOutlierFactor  # Pending theory
 from skfda.datasets import make_multimodal_samples, make_sinusoidal_process
 from skfda.exploratory.stats import mean as l2_mean
-from skfda.misc.metrics import lp_distance, pairwise_distance
+from skfda.misc.metrics import (lp_distance, pairwise_distance,
+                                amplitude_distance)
 from skfda.ml.classification import (KNeighborsClassifier,
                                      RadiusNeighborsClassifier,
                                      NearestCentroid)
-from skfda.ml.clustering import NearestNeighbors
+from skfda.ml.clustering import (NearestNeighbors,
+                                 ApproximateNearestNeighbors,
+                                 FunctionalNeighborsGraph)
 from skfda.ml.regression import KNeighborsRegressor, RadiusNeighborsRegressor
 from skfda.representation.basis import Fourier
+from sklearn.base import clone
 import unittest
 
 import numpy as np
@@ -251,6 +256,34 @@ class TestNeighbors(unittest.TestCase):
         np.testing.assert_array_almost_equal(self.X[0].data_matrix,
                                              res[6].data_matrix)
 
+    def test_functional_response_custom_regressor(self):
+        """The weighted mean matches the one computed by each query"""
+
+        def weighted_mean(X, weights=None):
+            if weights is None:
+                return X.mean()
+
+            return (X * (weights / np.sum(weights))).sum()
+
+        response = self.X.to_basis(Fourier(domain_range=(-1, 1), n_basis=10))
+
+        for weights in ('uniform', 'distance', lambda d: np.exp(-d)):
+            for y in (self.X, response):
+                kwargs = {'radius': .2, 'weights': weights,
+                          'outlier_response': y[0]}
+                res = RadiusNeighborsRegressor(**kwargs).fit(
+                    self.X2, y).predict(self.X)
+                res_custom = RadiusNeighborsRegressor(
+                    regressor=weighted_mean, **kwargs).fit(
+                    self.X2, y).predict(self.X)
+
+                if y is response:
+                    np.testing.assert_array_almost_equal(
+                        res.coefficients, res_custom.coefficients)
+                else:
+                    np.testing.assert_array_almost_equal(
+                        res.data_matrix, res_custom.data_matrix)
+
     def test_nearest_centroids_exceptions(self):
 
         # Test more than one class
@@ -293,6 +326,261 @@ class TestNeighbors(unittest.TestCase):
         result = np.array([[0, 3], [1, 2], [2, 1], [3, 0]])
         np.testing.assert_array_almost_equal(neighbors, result)
 
+    def test_search_neighbors_l2_euclidean(self):
+        """The L2 distance uses the euclidean metric of sklearn"""
+
+        nn = NearestNeighbors(n_neighbors=3)
+        nn.fit(self.X)
+        self.assertEqual(nn.estimator_.metric, 'euclidean')
+
+        distances, neighbors = nn.kneighbors(self.X2[:5])
+
+        d = pairwise_distance(lp_distance)(self.X2[:5], self.X)
+        np.testing.assert_array_almost_equal(
+            distances, np.sort(d, axis=1)[:, :3])
+        np.testing.assert_array_equal(
+            neighbors, np.argsort(d, axis=1)[:, :3])
+
+        # The functional metric is still used with extra parameters
+        nn = NearestNeighbors(n_neighbors=3, metric_params={'p': 1})
+        nn.fit(self.X)
+        self.assertTrue(callable(nn.estimator_.metric))
+
+    def test_search_neighbors_basis(self):
+        """The L2 distance between FDataBasis uses the coefficients"""
+
+        X = self.X.to_basis(Fourier(n_basis=7))
+        X2 = self.X2.to_basis(Fourier(n_basis=7))
+
+        nn = NearestNeighbors(n_neighbors=3)
+        nn.fit(X)
+        self.assertEqual(nn.estimator_.metric, 'euclidean')
+
+        distances, neighbors = nn.kneighbors(X2[:5])
+
+        d = pairwise_distance(lp_distance)(X2[:5], X)
+        np.testing.assert_array_almost_equal(
+            distances, np.sort(d, axis=1)[:, :3])
+        np.testing.assert_array_equal(
+            neighbors, np.argsort(d, axis=1)[:, :3])
+
+        # Queries in other representations are converted to the basis
+        np.testing.assert_array_almost_equal(
+            nn.kneighbors(X2[:5].to_grid())[0], distances)
+
+        for neigh in (KNeighborsClassifier(),
+                      RadiusNeighborsClassifier(radius=.1)):
+            neigh.fit(X, self.y)
+            np.testing.assert_array_equal(neigh.predict(X), self.y)
+
+    def test_vp_tree(self):
+        """The vantage-point tree gives the same neighbors"""
+
+        tree = VPTree(lp_distance, leaf_size=4, random_state=0).fit(self.X)
+        n_evaluations = tree.n_distance_evaluations_
+
+        distances, neighbors = tree.kneighbors(self.X2, n_neighbors=3)
+
+        d = pairwise_distance(lp_distance)(self.X2, self.X)
+        np.testing.assert_array_almost_equal(
+            distances, np.sort(d, axis=1)[:, :3])
+        np.testing.assert_array_equal(
+            neighbors, np.argsort(d, axis=1)[:, :3])
+        self.assertLess(tree.n_distance_evaluations_ - n_evaluations, d.size)
+
+        _, neighbors = tree.radius_neighbors(self.X2, radius=.1)
+        for n, row in zip(neighbors, d):
+            np.testing.assert_array_equal(
+                np.sort(n), np.where(row <= .1)[0])
+
+        # The query samples are not their own neighbors
+        _, neighbors = tree.kneighbors(n_neighbors=1)
+        self.assertFalse(np.any(neighbors[:, 0] == np.arange(len(self.X))))
+
+    def test_vp_tree_vantage_queries(self):
+        """The vantage points queried as samples find all the neighbors"""
+
+        tree = VPTree(lp_distance, leaf_size=1, random_state=0).fit(self.X)
+        d = pairwise_distance(lp_distance)(self.X)
+        np.fill_diagonal(d, np.inf)
+
+        distances, neighbors = tree.kneighbors(n_neighbors=3)
+        np.testing.assert_array_almost_equal(
+            distances, np.sort(d, axis=1)[:, :3])
+        np.testing.assert_array_equal(
+            neighbors, np.argsort(d, axis=1)[:, :3])
+
+        _, neighbors = tree.radius_neighbors(radius=.1)
+        for n, row in zip(neighbors, d):
+            np.testing.assert_array_equal(
+                np.sort(n), np.where(row <= .1)[0])
+
+        graph = FunctionalNeighborsGraph(
+            n_neighbors=3, algorithm='vp_tree', leaf_size=1).fit(self.X)
+        np.testing.assert_array_almost_equal(
+            graph.graph_.toarray(),
+            FunctionalNeighborsGraph(n_neighbors=3).fit(
+                self.X).graph_.toarray())
+
+    def test_vp_tree_estimators(self):
+        """The estimators give the same results using the tree"""
+
+        for neigh in (KNeighborsClassifier,
+                      RadiusNeighborsClassifier):
+            kwargs = {} if neigh is KNeighborsClassifier else {'radius': .3}
+            pred = neigh(**kwargs).fit(self.X, self.y).predict(self.X2)
+            neigh = neigh(algorithm='vp_tree', **kwargs)
+            neigh.fit(self.X, self.y)
+            np.testing.assert_array_equal(neigh.predict(self.X2), pred)
+
+        pred = KNeighborsRegressor().fit(self.X, self.X).predict(self.X2)
+        neigh = KNeighborsRegressor(algorithm='vp_tree').fit(self.X, self.X)
+        np.testing.assert_array_almost_equal(
+            neigh.predict(self.X2).data_matrix, pred.data_matrix)
+
+        nn = NearestNeighbors(algorithm='vp_tree').fit(self.X)
+        distances, neighbors = NearestNeighbors().fit(self.X).kneighbors()
+        np.testing.assert_array_almost_equal(nn.kneighbors()[0], distances)
+        np.testing.assert_array_equal(nn.kneighbors()[1], neighbors)
+
+        lof = LocalOutlierFactor(algorithm='vp_tree')
+        np.testing.assert_array_equal(lof.fit_predict(self.fd_lof),
+                                      LocalOutlierFactor().fit_predict(
+                                          self.fd_lof))
+
+    def test_elastic_pruning(self):
+        """The elastic neighbors are found skipping alignments"""
+
+        fd = make_sinusoidal_process(n_samples=24, n_features=30,
+                                     amplitude_std=1, error_std=0,
+                                     random_state=0)
+        X, X2 = fd[:20], fd[20:]
+        y = np.arange(20) % 2
+
+        d = pairwise_distance(amplitude_distance)(X2, X)
+
+        nn = NearestNeighbors(n_neighbors=2, metric=amplitude_distance)
+        distances, neighbors = nn.fit(X).kneighbors(X2)
+        np.testing.assert_array_almost_equal(
+            distances, np.sort(d, axis=1)[:, :2])
+        np.testing.assert_array_equal(
+            neighbors, np.argsort(d, axis=1)[:, :2])
+        self.assertGreater(nn._index.n_pruned_distances_, 0)
+
+        neigh = NearestCentroid(metric=amplitude_distance).fit(X, y)
+        d = pairwise_distance(amplitude_distance)(X2, neigh.centroids_)
+        np.testing.assert_array_equal(neigh.predict(X2), np.argmin(d, axis=1))
+
+    def test_nearest_centroid_many_classes(self):
+        """The centroids of all the classes are computed at once"""
+
+        X = make_multimodal_samples(n_samples=200, random_state=0)
+        X2 = make_multimodal_samples(n_samples=30, random_state=1)
+        y = np.random.RandomState(0).randint(0, 40, 200) * 2
+
+        means = [X[y == c].data_matrix.mean(axis=0) for c in np.unique(y)]
+
+        for neigh in (NearestCentroid(),
+                      NearestCentroid(mean=lambda fd: fd.mean())):
+            neigh.fit(X, y)
+            np.testing.assert_allclose(neigh.centroids_.data_matrix, means)
+
+            d = pairwise_distance(lp_distance)(X2, neigh.centroids_)
+            np.testing.assert_array_equal(neigh.predict(X2),
+                                          neigh.classes_[np.argmin(d, axis=1)])
+
+        X_basis = X.to_basis(Fourier(n_basis=5))
+        neigh = NearestCentroid().fit(X_basis, y)
+        d = pairwise_distance(lp_distance)(X_basis, neigh.centroids_)
+        np.testing.assert_array_equal(neigh.predict(X_basis),
+                                      neigh.classes_[np.argmin(d, axis=1)])
+
+    def test_approximate_neighbors(self):
+        """The approximate neighbors are mostly the exact ones"""
+
+        X = make_multimodal_samples(n_samples=300, random_state=0)
+        X2 = make_multimodal_samples(n_samples=20, random_state=1)
+        d = pairwise_distance(lp_distance)(X2, X)
+        exact_neighbors = np.argsort(d, axis=1)[:, :3]
+
+        for projection in ('fpca', 'random'):
+            neigh = ApproximateNearestNeighbors(
+                n_neighbors=3, projection=projection, n_candidates=30,
+                random_state=0)
+            distances, neighbors = neigh.fit(X).kneighbors(X2)
+
+            recall = np.mean([len(np.intersect1d(i, j)) / 3
+                              for i, j in zip(neighbors, exact_neighbors)])
+            self.assertGreater(recall, .9)
+            self.assertLessEqual(neigh.n_distance_evaluations_, 20 * 30)
+            np.testing.assert_array_almost_equal(
+                distances, np.take_along_axis(d, neighbors, axis=1))
+
+        # Data in basis form
+        basis = Fourier(n_basis=11)
+        neigh = ApproximateNearestNeighbors(projection='random',
+                                            random_state=0)
+        neigh.fit(X.to_basis(basis))
+        _, neighbors = neigh.kneighbors(X2, n_neighbors=1)
+        self.assertGreater(np.mean(neighbors[:, 0] == exact_neighbors[:, 0]),
+                           .9)
+
+        # The query samples are not their own neighbors
+        _, neighbors = neigh.radius_neighbors(radius=.1)
+        for i, n in enumerate(neighbors):
+            self.assertNotIn(i, n)
+
+    def test_neighbors_graph(self):
+        """Tests the estimators fitted with a precomputed graph"""
+        graph = FunctionalNeighborsGraph(n_neighbors=7).fit(self.X)
+        test_graph = graph.transform(self.X2)
+
+        for n_neighbors in (1, 4, 7):
+            knn = KNeighborsClassifier(n_neighbors=n_neighbors)
+            knn_graph = clone(knn).fit(graph, self.y)
+            knn.fit(self.X, self.y)
+
+            np.testing.assert_array_almost_equal(
+                knn_graph.kneighbors()[0], knn.kneighbors()[0])
+            np.testing.assert_array_equal(knn_graph.predict(test_graph),
+                                          knn.predict(self.X2))
+
+            lof = LocalOutlierFactor(n_neighbors=n_neighbors)
+            np.testing.assert_array_equal(lof.fit_predict(graph),
+                                          lof.fit_predict(self.X))
+
+            knnr = KNeighborsRegressor(n_neighbors=n_neighbors)
+            np.testing.assert_array_almost_equal(
+                clone(knnr).fit(graph, self.X).predict(test_graph).data_matrix,
+                knnr.fit(self.X, self.X).predict(self.X2).data_matrix)
+
+        # More neighbors than stored in the graph are searched
+        knn = KNeighborsClassifier(n_neighbors=10).fit(graph, self.y)
+        np.testing.assert_array_equal(
+            knn.predict(self.X2),
+            KNeighborsClassifier(n_neighbors=10).fit(
+                self.X, self.y).predict(self.X2))
+
+        with np.testing.assert_raises(ValueError):
+            knn.predict(test_graph)
+
+        # Radius queries on a graph built with a larger radius
+        graph = FunctionalNeighborsGraph(radius=.3).fit(self.X)
+        neigh = RadiusNeighborsClassifier(radius=.2)
+        np.testing.assert_array_equal(
+            clone(neigh).fit(graph, self.y).predict(self.X2),
+            neigh.fit(self.X, self.y).predict(self.X2))
+
+        # The graph must use the metric of the estimator
+        knn = KNeighborsClassifier(metric=lp_distance)
+        knn.fit(FunctionalNeighborsGraph(metric='l2').fit(self.X), self.y)
+        knn = KNeighborsClassifier(metric_params={'p': 1})
+        with np.testing.assert_raises(ValueError):
+            knn.fit(graph, self.y)
+        with np.testing.assert_raises(ValueError):
+            knn.fit(FunctionalNeighborsGraph(
+                metric_params={'p': 3}).fit(self.X), self.y)
+
     def test_score_scalar_response(self):
 
         neigh = KNeighborsRegressor()
@@ -1,6 +1,10 @@
 from skfda import FDataGrid
-from skfda.exploratory.depth.multivariate import SimplicialDepth
+from skfda.datasets import make_gaussian_process
+from skfda.exploratory.depth import DepthResult
+from skfda.exploratory.depth.multivariate import (ProjectionDepth,
+                                                  SimplicialDepth)
 from skfda.exploratory.outliers import DirectionalOutlierDetector
+from skfda.exploratory.outliers import IQROutlierDetector
 from skfda.exploratory.outliers import directional_outlyingness_stats
 import unittest
 
@@ -54,6 +58,94 @@ class TestsDirectionalOutlyingness(unittest.TestCase):
         np.testing.assert_allclose(prediction,
                                    np.array([1, 1, 1, 1]))
 
+    def test_predict_new_samples(self):
+        reference = make_gaussian_process(
+            n_samples=50, n_features=20, noise=0.01, random_state=0)
+        out_detector = DirectionalOutlierDetector(random_state=0)
+
+        np.testing.assert_array_equal(
+            out_detector.fit(reference).predict(reference),
+            out_detector.fit_predict(reference))
+
+        new_fd = make_gaussian_process(
+            n_samples=3, n_features=20, noise=0.01, random_state=2)
+        new_fd.data_matrix[2] += 5
+        prediction = out_detector.predict(new_fd)
+        self.assertEqual(prediction[2], -1)
+
+        # The prediction of each sample does not depend on the batch
+        np.testing.assert_array_equal(
+            np.concatenate([out_detector.predict(new_fd[i])
+                            for i in range(new_fd.n_samples)]),
+            prediction)
+
+    def test_shared_depth(self):
+        reference = make_gaussian_process(
+            n_samples=50, n_features=20, noise=0.01, random_state=0)
+        depth = DepthResult(reference.data_matrix,
+                            depth_method=SimplicialDepth())
+
+        shared = DirectionalOutlierDetector(multivariate_depth=depth)
+        not_shared = DirectionalOutlierDetector(
+            multivariate_depth=SimplicialDepth())
+
+        np.testing.assert_array_equal(shared.fit_predict(reference),
+                                      not_shared.fit_predict(reference))
+        np.testing.assert_allclose(shared.points_, not_shared.points_)
+
+        # The randomized depth fitted to the data is reused in the
+        # predictions
+        data_matrix = np.random.RandomState(0).normal(size=(50, 20, 2))
+        fd = FDataGrid(data_matrix, np.linspace(0, 1, 20))
+        depth = DepthResult(fd.data_matrix, depth_method=ProjectionDepth())
+        out_detector = DirectionalOutlierDetector(
+            multivariate_depth=depth).fit(fd)
+
+        self.assertIs(out_detector.depth_, depth.fitted_depth_method)
+        np.testing.assert_array_equal(out_detector.predict(fd),
+                                      out_detector.fit_predict(fd))
+
+    def test_callable_depth(self):
+        reference = make_gaussian_process(
+            n_samples=50, n_features=20, noise=0.01, random_state=0)
+        new_fd = make_gaussian_process(
+            n_samples=3, n_features=20, noise=0.01, random_state=2)
+
+        def depth(X, distribution=None):
+            return ProjectionDepth()(X, distribution=distribution)
+
+        expected = DirectionalOutlierDetector(
+            multivariate_depth=ProjectionDepth()).fit(reference)
+
+        for multivariate_depth in (depth, DepthResult(reference.data_matrix,
+                                                      depth_method=depth)):
+            out_detector = DirectionalOutlierDetector(
+                multivariate_depth=multivariate_depth)
+
+            np.testing.assert_array_equal(
+                out_detector.fit_predict(reference),
+                expected.fit_predict(reference))
+            np.testing.assert_array_equal(out_detector.predict(new_fd),
+                                          expected.predict(new_fd))
+
+
+class TestsIQROutlierDetector(unittest.TestCase):
+
+    def test_predict_new_samples(self):
+        reference = make_gaussian_process(
+            n_samples=50, n_features=20, noise=0.01, random_state=0)
+        out_detector = IQROutlierDetector()
+
+        np.testing.assert_array_equal(
+            out_detector.fit(reference).predict(reference),
+            out_detector.fit_predict(reference))
+
+        new_fd = make_gaussian_process(
+            n_samples=3, n_features=20, noise=0.01, random_state=2)
+        new_fd.data_matrix[2] += 5
+        prediction = out_detector.predict(new_fd)
+        np.testing.assert_array_equal(prediction, [1, 1, -1])
+
 
 if __name__ == '__main__':
     print()
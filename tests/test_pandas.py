@@ -1,8 +1,11 @@
 import skfda
 import unittest
+from unittest import mock
 
 import pandas as pd
 
+import numpy as np
+
 
 class TestPandas(unittest.TestCase):
 
@@ -43,3 +46,52 @@ class TestPandas(unittest.TestCase):
     def test_take(self):
         self.assertTrue(self.fd.take(0).equals(self.fd[0]))
         self.assertTrue(self.fd.take(0, axis=0).equals(self.fd[0]))
+
+    def test_groupby_op(self):
+        fd = skfda.FDataGrid(
+            [[1, 2, 3], [2, 3, 5], [4, 4, 4], [0, 2, 0]])
+        ids = np.array([1, 0, 1, -1])
+
+        res = fd._groupby_op(how="mean", has_dropped_na=True, min_count=-1,
+                             ngroups=2, ids=ids)
+        np.testing.assert_array_equal(
+            res.data_matrix[..., 0], [[2, 3, 5], [2.5, 3, 3.5]])
+
+        res = fd._groupby_op(how="var", has_dropped_na=True, min_count=-1,
+                             ngroups=2, ids=ids, ddof=1)
+        np.testing.assert_array_equal(
+            res.data_matrix[..., 0], [[np.nan] * 3, [4.5, 2, 0.5]])
+
+    def test_groupby_op_fdatabasis(self):
+        res = self.fd_basis._groupby_op(
+            how="sum", has_dropped_na=False, min_count=-1,
+            ngroups=1, ids=np.array([0, 0]))
+        np.testing.assert_allclose(
+            res.coefficients, self.fd_basis.sum().coefficients)
+
+        res = self.fd_basis._groupby_op(
+            how="max", has_dropped_na=False, min_count=-1,
+            ngroups=1, ids=np.array([0, 0]))
+        grid = self.fd_basis.to_grid()
+        self.assertIsInstance(res, skfda.FDataGrid)
+        np.testing.assert_allclose(
+            res.data_matrix, np.max(grid.data_matrix, axis=0, keepdims=True))
+
+    @unittest.skipIf(
+        not hasattr(pd.api.extensions.ExtensionArray, '_groupby_op'),
+        "this version of pandas does not dispatch groupby reductions")
+    def test_groupby_series(self):
+        fd = skfda.FDataGrid(
+            [[1, 2, 3], [2, 3, 5], [4, 4, 4], [0, 2, 0]])
+        series = pd.Series(fd)
+
+        with mock.patch.object(skfda.FDataGrid, '_group_reduce',
+                               autospec=True,
+                               side_effect=skfda.FDataGrid._group_reduce
+                               ) as group_reduce:
+            res = series.groupby([1, 0, 1, 0]).mean()
+
+        group_reduce.assert_called_once()
+        np.testing.assert_array_equal(res.index, [0, 1])
+        np.testing.assert_array_equal(
+            res.array.data_matrix[..., 0], [[1, 2.5, 2.5], [2.5, 3, 3.5]])
@@ -110,6 +110,52 @@ class TestBasisSmoother(unittest.TestCase):
             np.array([[0.60, 0.47, 0.20, -0.07, -0.20]])
         )
 
+    def test_weights(self):
+        t = np.linspace(0, 1, 10)
+        x = np.sin(2 * np.pi * t) + np.cos(2 * np.pi * t)
+        basis = BSpline((0, 1), n_basis=5)
+        fd = FDataGrid(data_matrix=x, grid_points=t)
+        weights = np.diag(np.linspace(1, 2, 10))
+
+        results = [
+            smoothing.BasisSmoother(
+                basis=basis,
+                weights=weights,
+                method=method,
+                return_basis=True).fit_transform(fd).coefficients
+            for method in ('cholesky', 'qr', 'matrix')]
+
+        np.testing.assert_allclose(results[0], results[1])
+        np.testing.assert_allclose(results[0], results[2])
+
+    def test_factorization_cache(self):
+        t = np.linspace(0, 1, 10)
+        basis = BSpline((0, 1), n_basis=5)
+        fd = FDataGrid(data_matrix=np.random.rand(3, 10), grid_points=t)
+        fd2 = FDataGrid(data_matrix=np.random.rand(4, 10), grid_points=t)
+
+        smoother = smoothing.BasisSmoother(basis=basis, return_basis=True)
+        solver = smoother.fit(fd)._solver(smoother._method_function())
+
+        # Same basis, grid and parameters reuse the factorization
+        smoother2 = smoothing.BasisSmoother(basis=basis.copy(),
+                                            return_basis=True)
+        self.assertIs(
+            smoother2.fit(fd2)._solver(smoother2._method_function()),
+            solver)
+
+        np.testing.assert_allclose(
+            fd2.to_basis(basis).coefficients,
+            smoothing.BasisSmoother(
+                basis=basis,
+                method='qr',
+                return_basis=True).fit_transform(fd2).coefficients)
+
+        # A different grid does not use the cached factorization
+        smoother2.fit(fd2.copy(grid_points=t**2))
+        self.assertIsNot(
+            smoother2._solver(smoother2._method_function()), solver)
+
     def test_monomial_smoothing(self):
         # It does not have much sense to apply smoothing in this basic case
         # where the fit is very good but its just for testing purposes